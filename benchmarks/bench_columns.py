@@ -0,0 +1,52 @@
+"""Compare row-by-row generation with columnar batches on a wide table of simple types.
+
+Run from the project root:
+
+    python -m benchmarks.bench_columns --rows 20000 --columns 40
+"""
+import argparse
+import time
+
+from faker_data import FakerData, VECTORIZED_GENERATORS, numpy_available
+
+
+def rows_per_second(func, number_of_items: int) -> float:
+    start = time.perf_counter()
+    func()
+    return number_of_items / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=40)
+    parser.add_argument("--types", nargs="+", default=list(VECTORIZED_GENERATORS),
+                        help="data types to cycle through when building the columns")
+    args = parser.parse_args()
+
+    faker_data = FakerData(seed=0)
+    attributes = [
+        {"name": f"col_{i}", "type": args.types[i % len(args.types)]}
+        for i in range(args.columns)
+    ]
+    plan = faker_data.compile_plan(attributes)
+
+    results = {
+        "row plan": rows_per_second(lambda: plan.generate(args.rows), args.rows),
+        "columns (per-call Faker)": rows_per_second(
+            lambda: faker_data.generate_columns(attributes, args.rows, vectorized=False), args.rows),
+    }
+    if numpy_available():
+        results["columns (vectorized)"] = rows_per_second(
+            lambda: faker_data.generate_columns(attributes, args.rows), args.rows)
+    else:
+        print("numpy is not installed; skipping the vectorized run")
+
+    print(f"rows={args.rows} columns={len(attributes)}")
+    baseline = results["row plan"]
+    for name, rate in results.items():
+        print(f"{name:26} {rate:14,.0f} rows/sec {rate / baseline:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,50 @@
+"""Compare plain, gzip (single and block-parallel) and zstd CSV output: ratio and throughput.
+
+Run from the project root:
+
+    python -m benchmarks.bench_compression --rows 200000 --threads 4
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import compression
+from faker_data import FakerData
+from file_handler import FileHandler
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--threads", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--types", nargs="+", default=["name", "email", "date", "ipv4", "random_digit"])
+    args = parser.parse_args()
+
+    attributes = [{"name": f"col_{i}", "type": type_name} for i, type_name in enumerate(args.types)]
+    # Pre-generate once, so the runs only measure serialization and compression
+    records = FakerData(seed=0).compile_plan(attributes).generate(args.rows)
+
+    runs = [("plain", None, 1), ("gzip", "gzip", 1), ("gzip", "gzip", args.threads)]
+    if compression.ZSTD_AVAILABLE:
+        runs += [("zstd", "zstd", 1), ("zstd", "zstd", args.threads)]
+    else:
+        print("zstandard is not installed; skipping zstd")
+
+    print(f"rows={args.rows} columns={len(attributes)}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        plain_size = None
+        for label, name, threads in runs:
+            compression.DEFAULT_THREADS = threads
+            start = time.perf_counter()
+            path = FileHandler.write_stream("csv", os.path.join(temp_dir, f"{label}-{threads}"), attributes,
+                                            records, name)
+            seconds = time.perf_counter() - start
+            size = path.stat().st_size
+            plain_size = plain_size or size
+            print(f"{label:6} threads={threads:<3} {size / (1 << 20):9.2f} MiB  ratio {plain_size / size:5.2f}x  "
+                  f"{plain_size / (1 << 20) / seconds:8.1f} MiB/s  {args.rows / seconds:12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Compare per-cell linear type lookup against a compiled RecordPlan.
+
+Run from the project root:
+
+    python -m benchmarks.bench_dispatch --rows 20000 --columns 20
+"""
+import argparse
+import time
+from typing import Any, Dict, List
+
+from faker_data import FakerData
+
+
+# Cheap providers, where the per-cell lookup is a visible share of the cost
+DEFAULT_TYPES = [
+    "boolean", "random_digit", "zipcode", "hex_color", "latitude",
+    "longitude", "country", "currency_code", "job", "word",
+]
+
+
+def generate_linear_scan(faker_data: FakerData, attributes: List[Dict[str, str]], number_of_items: int) -> List[Dict[str, Any]]:
+    """Previous generation loop: scan a list of all type/func entries for every cell"""
+    formatted_functionality = [
+        {"func": faker_data.get_generator(func["type"]), "type": func["type"]}
+        for func in faker_data.formatted_functionality
+    ]
+    fake_data = []
+    for _ in range(number_of_items):
+        record = {}
+        for attr in attributes:
+            faker_func = next(f["func"] for f in formatted_functionality
+                              if f["type"] == attr["type"])
+            record[attr["name"]] = faker_func()
+        fake_data.append(record)
+    return fake_data
+
+
+def rows_per_second(func, number_of_items: int) -> float:
+    start = time.perf_counter()
+    func()
+    return number_of_items / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=20000)
+    parser.add_argument("--columns", type=int, default=20)
+    parser.add_argument("--types", nargs="+", default=DEFAULT_TYPES,
+                        help="data types to cycle through when building the columns")
+    args = parser.parse_args()
+
+    faker_data = FakerData()
+    attributes = [
+        {"name": f"col_{i}", "type": args.types[i % len(args.types)]}
+        for i in range(args.columns)
+    ]
+    plan = faker_data.compile_plan(attributes)
+
+    before = rows_per_second(lambda: generate_linear_scan(faker_data, attributes, args.rows), args.rows)
+    after = rows_per_second(lambda: plan.generate(args.rows), args.rows)
+
+    print(f"rows={args.rows} columns={len(attributes)}")
+    print(f"linear scan:   {before:12,.0f} rows/sec")
+    print(f"compiled plan: {after:12,.0f} rows/sec")
+    print(f"speedup:       {after / before:12.2f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,55 @@
+"""Measure cold import time of each module and the time to the first generated record.
+
+Every measurement runs in a fresh interpreter. Run from the project root:
+
+    python -m benchmarks.bench_import --repeat 5
+"""
+import argparse
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+SNIPPETS = {
+    "import faker_data": "import faker_data",
+    "import file_handler": "import file_handler",
+    "import faker_cli": "import faker_cli",
+    "import project (GUI)": "import project",
+    "import faker (reference)": "import faker",
+    "first record, 2 columns": (
+        "from faker_data import FakerData\n"
+        "FakerData().compile_plan([{'name': 'n', 'type': 'name'}, {'name': 'd', 'type': 'random_digit'}]).generate(1)"
+    ),
+    "first record, all types": (
+        "from faker_data import FakerData, DATA_TYPES\n"
+        "FakerData().compile_plan([{'name': t['type'], 'type': t['type']} for t in DATA_TYPES]).generate(1)"
+    ),
+}
+
+
+def measure(snippet: str) -> float:
+    """Seconds spent running a snippet in a fresh interpreter, excluding interpreter startup"""
+    code = (
+        "import time\n"
+        "start = time.perf_counter()\n"
+        f"{snippet}\n"
+        "print(time.perf_counter() - start)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, capture_output=True, text=True, check=True)
+    return float(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    for name, snippet in SNIPPETS.items():
+        timings = [measure(snippet) for _ in range(args.repeat)]
+        print(f"{name:28} {statistics.median(timings) * 1000:8.1f} ms (median of {args.repeat})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compare JSON output modes (indented, compact, JSON Lines) and encoder backends in MB/s.
+
+Records are generated once up front, so only encoding and writing are timed.
+Run from the project root:
+
+    python -m benchmarks.bench_json --rows 50000
+"""
+import argparse
+import tempfile
+import time
+from pathlib import Path
+
+from faker_data import FakerData
+from file_handler import FileHandler, orjson
+
+TYPES = ["name", "email", "date", "boolean", "latitude", "random_digit", "ipv4", "job"]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=50000)
+    args = parser.parse_args()
+
+    attributes = [{"name": t, "type": t} for t in TYPES]
+    records = FakerData(seed=0).compile_plan(attributes).generate(args.rows)
+
+    modes = {
+        "json indented": lambda name: FileHandler.write_json_stream(name, records),
+        "json compact (json)": lambda name: FileHandler.write_json_stream(name, records, compact=True, backend="json"),
+        "jsonl (json)": lambda name: FileHandler.write_jsonl_stream(name, records, backend="json"),
+    }
+    if orjson is not None:
+        modes["json compact (orjson)"] = lambda name: FileHandler.write_json_stream(name, records, compact=True, backend="orjson")
+        modes["jsonl (orjson)"] = lambda name: FileHandler.write_jsonl_stream(name, records, backend="orjson")
+    else:
+        print("orjson is not installed; skipping the orjson backend")
+
+    print(f"rows={args.rows} columns={len(attributes)}")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for mode, write in modes.items():
+            start = time.perf_counter()
+            output_path = write(str(Path(temp_dir) / "bench"))
+            elapsed = time.perf_counter() - start
+            size_mb = output_path.stat().st_size / 1e6
+            print(f"{mode:24} {size_mb:9.2f} MB {size_mb / elapsed:9.1f} MB/s {args.rows / elapsed:12,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
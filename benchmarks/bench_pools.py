@@ -0,0 +1,55 @@
+"""Compare per-row Faker calls with pooled sampling for expensive providers.
+
+Run from the project root:
+
+    python -m benchmarks.bench_pools --rows 100000 --pool 10000
+"""
+import argparse
+import tempfile
+import time
+
+from faker_data import FakerData
+
+
+def rows_per_second(func, number_of_items: int) -> float:
+    start = time.perf_counter()
+    func()
+    return number_of_items / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--pool", type=int, default=10000, help="values per pooled column")
+    parser.add_argument("--types", nargs="+", default=["text", "address", "image_url", "name", "company"])
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        faker_data = FakerData(seed=0, pool_cache_dir=cache_dir)
+        plain = [{"name": type_name, "type": type_name} for type_name in args.types]
+        pooled = [{**attr, "pool": args.pool} for attr in plain]
+        zipf = [{**attr, "distribution": "zipf"} for attr in pooled]
+
+        plain_plan = faker_data.compile_plan(plain)
+        start = time.perf_counter()
+        faker_data.compile_plan(pooled)
+        build_time = time.perf_counter() - start
+        start = time.perf_counter()
+        FakerData(seed=0, pool_cache_dir=cache_dir).compile_plan(pooled)
+        load_time = time.perf_counter() - start
+
+        results = {
+            "per-row Faker": rows_per_second(lambda: plain_plan.generate(args.rows), args.rows),
+            "pool (uniform)": rows_per_second(lambda: faker_data.compile_plan(pooled).generate(args.rows), args.rows),
+            "pool (zipf)": rows_per_second(lambda: faker_data.compile_plan(zipf).generate(args.rows), args.rows),
+        }
+
+    print(f"rows={args.rows} pool={args.pool} types={','.join(args.types)}")
+    print(f"pool build {build_time:.2f}s, cached load {load_time:.3f}s")
+    baseline = results["per-row Faker"]
+    for name, rate in results.items():
+        print(f"{name:16} {rate:14,.0f} rows/sec {rate / baseline:8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,51 @@
+"""Compare the memory per row of a list of dicts, a RecordTable and a column batch.
+
+Run from the project root:
+
+    python -m benchmarks.bench_records --rows 100000 --columns 5 20
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+
+from faker_data import FakerData, DATA_TYPES
+
+
+def traced_bytes(func):
+    """Result of func and the bytes it still holds once it returns"""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    size, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, size, seconds
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100000)
+    parser.add_argument("--columns", type=int, nargs="+", default=[5, 20])
+    args = parser.parse_args()
+
+    types = [data_type["type"] for data_type in DATA_TYPES]
+    for width in args.columns:
+        attributes = [{"name": f"col_{i}", "type": types[i % len(types)]} for i in range(width)]
+        # Values come from small pools, so the sizes measured are those of the containers
+        attributes = [{**attr, "pool": 100, "pool_seed": i} for i, attr in enumerate(attributes)]
+        plan = FakerData(seed=0).compile_plan(attributes)
+        print(f"{args.rows} rows x {width} columns")
+        for label, func in [
+            ("list of dicts", lambda: plan.generate(args.rows)),
+            ("RecordTable", lambda: plan.generate_table(args.rows)),
+            ("columns", lambda: plan.generate_table(args.rows).columns()),
+        ]:
+            result, size, seconds = traced_bytes(func)
+            print(f"  {label:14} {size / args.rows:8.1f} bytes/row  {args.rows / seconds:10,.0f} rows/s")
+            del result
+
+
+if __name__ == "__main__":
+    main()
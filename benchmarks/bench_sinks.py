@@ -0,0 +1,57 @@
+"""Compare loading generated rows into databases with writing a CSV file.
+
+Run from the project root:
+
+    python -m benchmarks.bench_sinks --rows 200000
+    python -m benchmarks.bench_sinks --rows 200000 --postgres postgresql://localhost/test
+"""
+import argparse
+import os
+import tempfile
+import time
+
+from faker_data import FakerData
+from file_handler import FileHandler
+from db_sinks import open_sink
+
+
+def rows_per_second(func, number_of_items: int) -> float:
+    start = time.perf_counter()
+    func()
+    return number_of_items / (time.perf_counter() - start)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--rows", type=int, default=200000)
+    parser.add_argument("--batch-size", type=int, default=50000)
+    parser.add_argument("--types", nargs="+", default=["random_digit", "boolean", "latitude", "hex_color", "date"])
+    parser.add_argument("--postgres", help="postgresql:// URL of a scratch database to include a COPY run")
+    args = parser.parse_args()
+
+    attributes = [{"name": f"col_{i}", "type": type_name} for i, type_name in enumerate(args.types)]
+    # Pre-generate once, so the runs only measure the sinks
+    records = FakerData(seed=0).compile_plan(attributes).generate(args.rows)
+
+    def load(url: str) -> None:
+        with open_sink(url, "bench", attributes, args.batch_size) as sink:
+            sink.write(records)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        results = {
+            "CSV file": rows_per_second(
+                lambda: FileHandler.write_csv_stream(os.path.join(temp_dir, "bench"), [a["name"] for a in attributes],
+                                                     records), args.rows),
+            "SQLite executemany": rows_per_second(
+                lambda: load(f"sqlite:///{os.path.join(temp_dir, 'bench.db')}"), args.rows),
+        }
+        if args.postgres:
+            results["PostgreSQL COPY"] = rows_per_second(lambda: load(args.postgres), args.rows)
+
+    print(f"rows={args.rows} columns={len(attributes)} batch={args.batch_size}")
+    for name, rate in results.items():
+        print(f"{name:20} {rate:14,.0f} rows/sec")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Benchmark suite: per-type calls/sec, end-to-end rows/sec and peak RSS, with baseline checks.
+
+Every end-to-end case runs in a fresh interpreter so its peak RSS is its own. Results are
+written as JSON; comparing them with a stored baseline flags throughput drops and memory
+growth beyond the tolerance and exits with status 1. Run from the project root:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --quick --baseline benchmarks/baseline.json --tolerance 0.25
+
+Numbers are only comparable on the same machine, so keep one baseline per machine.
+"""
+import argparse
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+ROOT = Path(__file__).resolve().parent.parent
+
+FULL_MATRIX = {
+    "rows": [10000, 100000],
+    "widths": [5, 20],
+    "formats": ["csv", "json", "jsonl", "parquet"],
+    "modes": ["stream", "parallel"],
+    "type_calls": 5000,
+}
+QUICK_MATRIX = {
+    "rows": [5000],
+    "widths": [5],
+    "formats": ["csv", "json"],
+    "modes": ["stream", "parallel"],
+    "type_calls": 500,
+}
+
+# Workers used by the parallel mode
+PARALLEL_WORKERS = 2
+
+
+def peak_rss_mb(who: str = "self") -> Optional[float]:
+    """Peak resident set size of this process ("self") or its finished children, in MiB"""
+    try:
+        import resource
+    except ImportError:  # not available on Windows
+        return None
+    usage = resource.getrusage(resource.RUSAGE_SELF if who == "self" else resource.RUSAGE_CHILDREN)
+    # ru_maxrss is in bytes on macOS and in KiB elsewhere
+    return usage.ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+
+
+def case_attributes(width: int) -> List[Dict[str, str]]:
+    """width columns cycling through every data type, in DATA_TYPES order"""
+    from faker_data import DATA_TYPES
+    return [
+        {"name": f"col_{i}", "type": DATA_TYPES[i % len(DATA_TYPES)]["type"]}
+        for i in range(width)
+    ]
+
+
+def run_case(case: Dict[str, Any]) -> Dict[str, Any]:
+    """Generate and write one case in this process; called in a child interpreter"""
+    from faker_data import FakerData
+    from file_handler import FileHandler
+
+    attributes = case_attributes(case["columns"])
+    faker_data = FakerData(seed=0)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        output = os.path.join(temp_dir, "bench")
+        start = time.perf_counter()
+        if case["mode"] == "parallel":
+            records = faker_data.iter_fake_data_parallel(attributes, case["rows"], seed=0,
+                                                         workers=PARALLEL_WORKERS,
+                                                         shard_size=max(case["rows"] // (4 * PARALLEL_WORKERS), 1))
+        else:
+            records = faker_data.compile_plan(attributes).iter_records(case["rows"])
+        path = FileHandler.write_stream(case["format"], output, attributes, records)
+        seconds = time.perf_counter() - start
+        size = path.stat().st_size
+    return {
+        **case,
+        "seconds": round(seconds, 4),
+        "rows_per_sec": round(case["rows"] / seconds, 1),
+        "bytes": size,
+        "peak_rss_mb": peak_rss_mb("self"),
+        "workers_peak_rss_mb": peak_rss_mb("children") if case["mode"] == "parallel" else None,
+    }
+
+
+def run_case_in_child(case: Dict[str, Any]) -> Dict[str, Any]:
+    result = subprocess.run(
+        [sys.executable, "-m", "benchmarks.suite", "--case", json.dumps(case)],
+        cwd=ROOT, capture_output=True, text=True
+    )
+    if result.returncode != 0:
+        raise RuntimeError(f"Benchmark case {case} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def type_rates(calls: int) -> Dict[str, float]:
+    """Calls/sec of the generator of every data type"""
+    from faker_data import FakerData, DATA_TYPES
+    faker_data = FakerData(seed=0)
+    rates = {}
+    for data_type in DATA_TYPES:
+        func = faker_data.get_generator(data_type["type"])
+        func()  # warm up caches of the provider
+        start = time.perf_counter()
+        for _ in range(calls):
+            func()
+        rates[data_type["type"]] = round(calls / (time.perf_counter() - start), 1)
+    return rates
+
+
+def metadata() -> Dict[str, Any]:
+    from faker import VERSION
+    return {
+        "python": platform.python_version(),
+        "faker": VERSION,
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+    }
+
+
+def run_suite(matrix: Dict[str, Any]) -> Dict[str, Any]:
+    from file_handler import format_available
+    results = {"meta": metadata(), "types": type_rates(matrix["type_calls"]), "runs": []}
+    for file_format in matrix["formats"]:
+        if not format_available(file_format):
+            print(f"skipping {file_format}: optional dependency missing", file=sys.stderr)
+            continue
+        for mode in matrix["modes"]:
+            for rows in matrix["rows"]:
+                for width in matrix["widths"]:
+                    case = {"format": file_format, "mode": mode, "rows": rows, "columns": width}
+                    run = run_case_in_child(case)
+                    print(f"{file_format:8} {mode:9} rows={rows:<8} columns={width:<3} "
+                          f"{run['rows_per_sec']:12,.0f} rows/sec  peak {run['peak_rss_mb'] or 0:8.1f} MiB",
+                          file=sys.stderr)
+                    results["runs"].append(run)
+    return results
+
+
+def run_key(run: Dict[str, Any]) -> tuple:
+    return run["format"], run["mode"], run["rows"], run["columns"]
+
+
+def compare(results: Dict[str, Any], baseline: Dict[str, Any], tolerance: float = 0.2) -> List[str]:
+    """Regressions of results against a baseline: throughput below, or peak RSS above, the tolerance"""
+    regressions = []
+    for type_name, rate in results.get("types", {}).items():
+        old_rate = baseline.get("types", {}).get(type_name)
+        if old_rate and rate < old_rate * (1 - tolerance):
+            regressions.append(f"type {type_name}: {rate:,.0f} calls/sec, baseline {old_rate:,.0f}")
+
+    baseline_runs = {run_key(run): run for run in baseline.get("runs", [])}
+    for run in results.get("runs", []):
+        old = baseline_runs.get(run_key(run))
+        if old is None:
+            continue
+        name = "{} {} rows={} columns={}".format(*run_key(run))
+        if run["rows_per_sec"] < old["rows_per_sec"] * (1 - tolerance):
+            regressions.append(f"{name}: {run['rows_per_sec']:,.0f} rows/sec, baseline {old['rows_per_sec']:,.0f}")
+        if run.get("peak_rss_mb") and old.get("peak_rss_mb") and \
+                run["peak_rss_mb"] > old["peak_rss_mb"] * (1 + tolerance):
+            regressions.append(f"{name}: peak RSS {run['peak_rss_mb']:.1f} MiB, baseline {old['peak_rss_mb']:.1f}")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--quick", action="store_true", help="small matrix for CI")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2, help="allowed relative slowdown or memory growth")
+    parser.add_argument("--case", help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.case:
+        print(json.dumps(run_case(json.loads(args.case))))
+        return 0
+
+    results = run_suite(QUICK_MATRIX if args.quick else FULL_MATRIX)
+    if args.output:
+        Path(args.output).write_text(json.dumps(results, indent=2), encoding='utf-8')
+    else:
+        print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        regressions = compare(results, json.loads(Path(args.baseline).read_text(encoding='utf-8')), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION {regression}", file=sys.stderr)
+        if regressions:
+            return 1
+        print(f"No regressions against {args.baseline}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,190 @@
+"""Compressed output streams: block-parallel gzip and multithreaded zstd.
+
+Both writers are binary file objects the text writers wrap in io.TextIOWrapper.
+
+- gzip: the stream is cut into blocks that are compressed as independent gzip members
+  on a thread pool (zlib releases the GIL) and written in order. Concatenated members
+  are a valid gzip file for gzip, zcat and Python's gzip module, and the output does not
+  depend on the number of threads.
+- zstd: zstandard's own worker threads, when the optional zstandard package is installed.
+
+Each writer logs its compression ratio and throughput when closed.
+"""
+import gzip
+import io
+import logging
+import os
+import time
+from collections import deque
+from importlib.util import find_spec
+from pathlib import Path
+from typing import Dict, Any, Optional, Tuple
+
+# Compression name -> file name suffix
+COMPRESSION_SUFFIXES = {"gzip": ".gz", "zstd": ".zst"}
+
+ZSTD_AVAILABLE = find_spec("zstandard") is not None
+
+# Uncompressed bytes per gzip member
+DEFAULT_BLOCK_SIZE = 1 << 20
+DEFAULT_GZIP_LEVEL = 6
+DEFAULT_ZSTD_LEVEL = 3
+# Compression threads when a writer is not given a count; None means one per CPU
+DEFAULT_THREADS = None
+
+def compression_available(compression: str) -> bool:
+    """Whether a compression is known and its optional dependency installed"""
+    return compression in COMPRESSION_SUFFIXES and (compression != "zstd" or ZSTD_AVAILABLE)
+
+def check_compression(compression: Optional[str]) -> None:
+    """Raise if a compression is unknown or its optional dependency is missing"""
+    if compression is None:
+        return
+    if compression not in COMPRESSION_SUFFIXES:
+        raise ValueError(f"Unsupported compression: {compression}")
+    if not compression_available(compression):
+        raise ImportError("zstandard is required for zstd compression")
+
+def split_compression_suffix(file_name: str) -> Tuple[str, Optional[str]]:
+    """Split "users.csv.gz" into ("users.csv", "gzip"); names without a compression suffix are unchanged"""
+    for compression, suffix in COMPRESSION_SUFFIXES.items():
+        if file_name.endswith(suffix):
+            return file_name[:-len(suffix)], compression
+    return file_name, None
+
+def compressed_path(output_path: Path, compression: Optional[str]) -> Path:
+    """Output path with the compression suffix appended, e.g. users.csv -> users.csv.gz"""
+    if compression is None:
+        return output_path
+    return output_path.with_name(output_path.name + COMPRESSION_SUFFIXES[compression])
+
+class CompressedWriter(io.BufferedIOBase):
+    """Binary writer compressing into a file, recording the bytes in and out"""
+    compression = None
+
+    def __init__(self, path: Path, threads: Optional[int] = None):
+        super().__init__()
+        self.path = Path(path)
+        self.threads = threads or DEFAULT_THREADS or os.cpu_count() or 1
+        self.bytes_in = 0
+        self.bytes_out = 0
+        self.seconds = 0.0
+        self._raw = open(self.path, 'wb')
+        self._opened = time.perf_counter()
+
+    @property
+    def name(self) -> str:
+        return str(self.path)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        size = len(data)
+        self.bytes_in += size
+        self._compress(data)
+        return size
+
+    def close(self) -> None:
+        if self.closed:
+            return
+        try:
+            self._finish()
+        finally:
+            self._raw.close()
+            super().close()
+        self.seconds = time.perf_counter() - self._opened
+        self.bytes_out = self.path.stat().st_size
+        stats = self.stats()
+        logging.info(
+            f"Compressed {self.path} with {self.compression}: {stats['bytes_in']} -> {stats['bytes_out']} bytes "
+            f"(ratio {stats['ratio'] or 0:.2f}x, {stats['mib_per_sec']:.1f} MiB/s on {self.threads} thread(s))"
+        )
+        from profiling import ACTIVE_PROFILE
+        profile = ACTIVE_PROFILE.get()
+        if profile is not None:
+            profile.record_compression(stats)
+
+    def stats(self) -> Dict[str, Any]:
+        """Compression ratio and input throughput, in uncompressed MiB per second"""
+        return {
+            "compression": self.compression,
+            "path": str(self.path),
+            "bytes_in": self.bytes_in,
+            "bytes_out": self.bytes_out,
+            "ratio": round(self.bytes_in / self.bytes_out, 3) if self.bytes_out else None,
+            "seconds": round(self.seconds, 6),
+            "mib_per_sec": round(self.bytes_in / (1 << 20) / self.seconds, 2) if self.seconds else 0.0,
+            "threads": self.threads,
+        }
+
+    def _compress(self, data) -> None:
+        raise NotImplementedError
+
+    def _finish(self) -> None:
+        raise NotImplementedError
+
+class ParallelGzipWriter(CompressedWriter):
+    """gzip writer compressing block_size blocks as separate members on a thread pool"""
+    compression = "gzip"
+
+    def __init__(self, path: Path, threads: Optional[int] = None, level: int = DEFAULT_GZIP_LEVEL,
+                 block_size: int = DEFAULT_BLOCK_SIZE):
+        super().__init__(path, threads)
+        self.level = level
+        self.block_size = block_size
+        self._buffer = bytearray()
+        self._pending = deque()
+        self._executor = None
+        if self.threads > 1:
+            from concurrent.futures import ThreadPoolExecutor
+            self._executor = ThreadPoolExecutor(max_workers=self.threads)
+
+    def _compress(self, data) -> None:
+        self._buffer += data
+        while len(self._buffer) >= self.block_size:
+            self._submit(bytes(self._buffer[:self.block_size]))
+            del self._buffer[:self.block_size]
+
+    def _submit(self, block: bytes) -> None:
+        if self._executor is None:
+            self._raw.write(gzip.compress(block, self.level, mtime=0))
+            return
+        self._pending.append(self._executor.submit(gzip.compress, block, self.level, mtime=0))
+        # Two blocks per thread in flight at most, written in submission order
+        while len(self._pending) > 2 * self.threads:
+            self._raw.write(self._pending.popleft().result())
+
+    def _finish(self) -> None:
+        try:
+            if self._buffer or self.bytes_in == 0:  # an empty member keeps empty files valid gzip
+                self._submit(bytes(self._buffer))
+                self._buffer.clear()
+            while self._pending:
+                self._raw.write(self._pending.popleft().result())
+        finally:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+
+class ZstdWriter(CompressedWriter):
+    """zstd writer using zstandard's multithreaded compressor"""
+    compression = "zstd"
+
+    def __init__(self, path: Path, threads: Optional[int] = None, level: int = DEFAULT_ZSTD_LEVEL):
+        super().__init__(path, threads)
+        import zstandard
+        compressor = zstandard.ZstdCompressor(level=level, threads=self.threads if self.threads > 1 else 0)
+        self._writer = compressor.stream_writer(self._raw, closefd=False)
+
+    def _compress(self, data) -> None:
+        self._writer.write(data)
+
+    def _finish(self) -> None:
+        self._writer.close()
+
+def open_compressed(path: Path, compression: str, threads: Optional[int] = None) -> CompressedWriter:
+    """Binary writer compressing into path"""
+    check_compression(compression)
+    if compression == "gzip":
+        return ParallelGzipWriter(path, threads)
+    return ZstdWriter(path, threads)
@@ -0,0 +1,258 @@
+"""Database sinks: stream generated records straight into a table instead of a file.
+
+A sink creates its table from the attributes' value kinds, then loads records in large
+batches: SQLiteSink with executemany, one transaction per batch, and PostgresCopySink
+with COPY FROM STDIN. New databases plug in by subclassing DatabaseSink and registering
+the class in SINKS under its URL scheme.
+"""
+import io
+import sqlite3
+from typing import List, Dict, Any, Callable, Iterable, Optional, Tuple
+from datetime import date, datetime, time
+from decimal import Decimal
+import logging
+
+from faker_data import value_kind
+from file_handler import iter_chunks
+
+# Rows per executemany call or COPY statement
+DEFAULT_BATCH_SIZE = 50000
+
+# SQL column type of each value kind; everything else is TEXT
+SQL_TYPES = {"int": "INTEGER", "float": "REAL", "bool": "BOOLEAN", "date": "DATE"}
+POSTGRES_TYPES = {"int": "BIGINT", "float": "DOUBLE PRECISION", "bool": "BOOLEAN", "date": "DATE"}
+
+def quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+def sql_type(attr: Dict[str, Any], types: Dict[str, str] = SQL_TYPES) -> str:
+    """SQL column type of an attribute"""
+    return types.get(value_kind(attr), "TEXT")
+
+def sql_value(value: Any) -> Any:
+    """Convert the values database drivers cannot bind (Decimal, date) to plain ones"""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    return value
+
+def sql_literal(value: Any) -> str:
+    """Render a generated value as a SQL literal"""
+    value = sql_value(value)
+    if value is None:
+        return "NULL"
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    if isinstance(value, (int, float)):
+        return str(value)
+    return "'" + str(value).replace("'", "''") + "'"
+
+def create_table_sql(table_name: str, attributes: List[Dict[str, str]], primary_key: Optional[str] = None,
+                     foreign_keys: Optional[List[Tuple[str, str, str]]] = None,
+                     types: Dict[str, str] = SQL_TYPES, if_not_exists: bool = False) -> str:
+    """CREATE TABLE statement for a list of attributes.
+
+    foreign_keys holds (column, referenced table, referenced column) triples.
+    """
+    lines = [
+        f"    {quote_identifier(attr['name'])} {sql_type(attr, types)}"
+        + (" PRIMARY KEY" if attr["name"] == primary_key else "")
+        for attr in attributes
+    ]
+    for column, target, target_column in foreign_keys or []:
+        lines.append(
+            f"    FOREIGN KEY ({quote_identifier(column)}) "
+            f"REFERENCES {quote_identifier(target)} ({quote_identifier(target_column)})"
+        )
+    exists = "IF NOT EXISTS " if if_not_exists else ""
+    return f"CREATE TABLE {exists}{quote_identifier(table_name)} (\n" + ",\n".join(lines) + "\n);"
+
+class DatabaseSink:
+    """Base class of database sinks.
+
+    Use as a context manager, or call open(), write() and close(). Subclasses implement
+    _open, _write_batch and _close. if_exists is "replace" (drop and recreate the table),
+    "append" (create it only if missing) or "fail".
+    """
+    types = SQL_TYPES
+
+    def __init__(self, table: str, attributes: List[Dict[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+                 if_exists: str = "replace"):
+        if not attributes:
+            raise ValueError("At least one data type must be selected")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be greater than 0")
+        if if_exists not in ("replace", "append", "fail"):
+            raise ValueError(f"if_exists must be replace, append or fail, not {if_exists}")
+        self.table = table
+        self.attributes = attributes
+        self.names = [attr["name"] for attr in attributes]
+        self.batch_size = batch_size
+        self.if_exists = if_exists
+        self.rows_written = 0
+
+    def __enter__(self) -> "DatabaseSink":
+        self.open()
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def create_table_sql(self) -> str:
+        return create_table_sql(self.table, self.attributes, types=self.types,
+                                if_not_exists=self.if_exists == "append")
+
+    def open(self) -> None:
+        self._open()
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> int:
+        """Load records batch by batch; returns the number of rows written"""
+        try:
+            for chunk in iter_chunks(rows, self.batch_size):
+                self._write_batch([tuple(sql_value(record[name]) for name in self.names) for record in chunk])
+                self.rows_written += len(chunk)
+            logging.info(f"Loaded {self.rows_written} rows into {self.table}")
+            return self.rows_written
+        except Exception as e:
+            logging.error(f"Error loading rows into {self.table}: {str(e)}")
+            raise
+
+    def close(self) -> None:
+        self._close()
+
+    def _open(self) -> None:
+        raise NotImplementedError
+
+    def _write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        raise NotImplementedError
+
+    def _close(self) -> None:
+        raise NotImplementedError
+
+class SQLiteSink(DatabaseSink):
+    """Load records into a SQLite table with executemany, committing once per batch"""
+    def __init__(self, database: str, table: str, attributes: List[Dict[str, str]],
+                 batch_size: int = DEFAULT_BATCH_SIZE, if_exists: str = "replace"):
+        super().__init__(table, attributes, batch_size, if_exists)
+        self.database = database
+        self.connection = None
+        self._insert = (
+            f"INSERT INTO {quote_identifier(table)} ({', '.join(quote_identifier(name) for name in self.names)}) "
+            f"VALUES ({', '.join('?' for _ in self.names)})"
+        )
+
+    def _open(self) -> None:
+        # Transactions are managed here: one explicit BEGIN/COMMIT per batch
+        self.connection = sqlite3.connect(self.database, isolation_level=None)
+        if self.if_exists == "replace":
+            self.connection.execute(f"DROP TABLE IF EXISTS {quote_identifier(self.table)}")
+        self.connection.execute(self.create_table_sql())
+
+    def _write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        self.connection.execute("BEGIN")
+        try:
+            self.connection.executemany(self._insert, rows)
+        except Exception:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+# NULL marker of the COPY CSV payloads; an unquoted empty field would also read as NULL, so empty
+# strings could not be told apart from None
+COPY_NULL = "\\N"
+
+def copy_csv_field(value: Any) -> str:
+    """One field of a COPY CSV row: None as the NULL marker, text quoted when CSV needs it or it equals the marker"""
+    if value is None:
+        return COPY_NULL
+    text = str(value)
+    if text == COPY_NULL or any(char in text for char in ',"\r\n'):
+        return '"' + text.replace('"', '""') + '"'
+    return text
+
+class PostgresCopySink(DatabaseSink):
+    """Load records into a PostgreSQL table with COPY FROM STDIN in CSV format.
+
+    connect is a function returning a DB-API connection: psycopg2 (cursor.copy_expert)
+    and psycopg 3 (cursor.copy) are both supported, and tests can pass a stub.
+    Each batch is encoded to CSV in memory, sent with one COPY and committed.
+    """
+    types = POSTGRES_TYPES
+
+    def __init__(self, connect: Callable[[], Any], table: str, attributes: List[Dict[str, str]],
+                 batch_size: int = DEFAULT_BATCH_SIZE, if_exists: str = "replace"):
+        super().__init__(table, attributes, batch_size, if_exists)
+        self.connect = connect
+        self.connection = None
+        self._copy = (
+            f"COPY {quote_identifier(table)} ({', '.join(quote_identifier(name) for name in self.names)}) "
+            f"FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+        )
+
+    def _open(self) -> None:
+        self.connection = self.connect()
+        with self.connection.cursor() as cursor:
+            if self.if_exists == "replace":
+                cursor.execute(f"DROP TABLE IF EXISTS {quote_identifier(self.table)}")
+            cursor.execute(self.create_table_sql())
+        self.connection.commit()
+
+    def _write_batch(self, rows: List[Tuple[Any, ...]]) -> None:
+        buffer = io.StringIO()
+        buffer.writelines(",".join(copy_csv_field(value) for value in row) + "\n" for row in rows)
+        try:
+            with self.connection.cursor() as cursor:
+                if hasattr(cursor, "copy_expert"):
+                    buffer.seek(0)
+                    cursor.copy_expert(self._copy, buffer)
+                else:
+                    with cursor.copy(self._copy) as copy:
+                        copy.write(buffer.getvalue())
+        except Exception:
+            self.connection.rollback()
+            raise
+        self.connection.commit()
+
+    def _close(self) -> None:
+        if self.connection is not None:
+            self.connection.close()
+            self.connection = None
+
+def _sqlite_path(url: str) -> str:
+    """Database path of a sqlite:// URL: sqlite:///relative.db or sqlite:////absolute.db"""
+    path = url[len("sqlite://"):]
+    return (path[1:] if path.startswith("/") else path) or ":memory:"
+
+def _postgres_connect(url: str) -> Callable[[], Any]:
+    """Connection factory for a postgresql:// URL, using psycopg 3 or psycopg2"""
+    try:
+        import psycopg
+        return lambda: psycopg.connect(url)
+    except ImportError:
+        pass
+    try:
+        import psycopg2
+        return lambda: psycopg2.connect(url)
+    except ImportError:
+        raise ImportError("psycopg or psycopg2 is required for PostgreSQL sinks")
+
+# Sink factories by URL scheme: (url, table, attributes, batch_size, if_exists) -> DatabaseSink
+SINKS = {
+    "sqlite": lambda url, *args: SQLiteSink(_sqlite_path(url), *args),
+    "postgresql": lambda url, *args: PostgresCopySink(_postgres_connect(url), *args),
+    "postgres": lambda url, *args: PostgresCopySink(_postgres_connect(url), *args),
+}
+
+def open_sink(url: str, table: str, attributes: List[Dict[str, str]], batch_size: int = DEFAULT_BATCH_SIZE,
+              if_exists: str = "replace") -> DatabaseSink:
+    """Sink for a database URL, e.g. sqlite:///data.db or postgresql://user@host/db"""
+    scheme = url.split("://", 1)[0] if "://" in url else None
+    if scheme not in SINKS:
+        raise ValueError(f"Unsupported database URL: {url}")
+    return SINKS[scheme](url, table, attributes, batch_size, if_exists)
@@ -0,0 +1,190 @@
+"""Headless command line for batch generation, without PyQt.
+
+Example:
+
+    python -m faker_cli schema.json --rows 1000000 --format csv --seed 42 --workers 4 --output users
+
+A schema with a "tables" list describes related tables (see relational.py); they are written
+as one file per table into the output directory, or as one SQL dump with --format sql.
+
+With --database the records are loaded straight into a database table (see db_sinks.py):
+
+    python -m faker_cli schema.json --rows 1000000 --database sqlite:///test.db --table users
+
+With --part-rows or --part-size the output rolls over to users-00001.csv, users-00002.csv, ...
+and a users.manifest.json listing the parts (see rollover.py):
+
+    python -m faker_cli schema.json --rows 100000000 --part-size 1G --output users
+
+With --locale the values come from another locale, or a weighted mix of locales, e.g.
+--locale de_DE:40,fr_FR:30,en_US:30; a column's own "locale" option takes precedence.
+
+With --resume the run is a checkpointed job (see jobs.py): one part per shard, and after a
+crash the same command continues from users.checkpoint.json instead of starting over.
+"""
+import argparse
+import logging
+import random
+import sys
+import time
+from contextlib import nullcontext
+from typing import List, Dict, Any, Optional
+
+from faker_data import FakerData, DEFAULT_SHARD_SIZE
+from file_handler import FileHandler, FILE_FORMATS
+from relational import RelationalGenerator
+from db_sinks import open_sink, DEFAULT_BATCH_SIZE
+from profiling import GenerationProfile, cprofile_to
+from compression import COMPRESSION_SUFFIXES, split_compression_suffix
+from rollover import RollingWriter, parse_size
+from jobs import GenerationJob
+from schema import Schema, read_schema
+
+
+def is_relational(schema: Any) -> bool:
+    return isinstance(schema, dict) and isinstance(schema.get("tables"), list)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="faker_cli", description="Generate fake data files without the GUI.")
+    parser.add_argument("schema", help="JSON or YAML file mapping attribute names to data types")
+    parser.add_argument("-n", "--rows", type=int, help="number of records to generate (set per table in relational schemas)")
+    parser.add_argument("-f", "--format", choices=list(FILE_FORMATS) + ["sql"], default="csv",
+                        help="output format; sql is only for relational schemas")
+    parser.add_argument("-o", "--output",
+                        help="output file name, the extension follows the format (a directory for relational schemas)")
+    parser.add_argument("-c", "--compress", choices=list(COMPRESSION_SUFFIXES),
+                        help="compress text output; an output name ending in .gz or .zst also selects it")
+    parser.add_argument("--database", help="load into a database instead of a file, e.g. sqlite:///data.db or "
+                                           "postgresql://user@host/db")
+    parser.add_argument("--table", help="table to load with --database (relational schemas use their table names)")
+    parser.add_argument("--batch-size", type=int, default=DEFAULT_BATCH_SIZE, help="rows per database batch")
+    parser.add_argument("-l", "--locale", help="Faker locale, or weighted locales such as de_DE:40,fr_FR:30,en_US:30")
+    parser.add_argument("-s", "--seed", type=int, help="base seed; the same seed always produces the same file")
+    parser.add_argument("-w", "--workers", type=int, default=1, help="worker processes")
+    parser.add_argument("--shard-size", type=int, default=DEFAULT_SHARD_SIZE, help="records per worker task")
+    parser.add_argument("--parts", action="store_true", help="write one part file per shard instead of one file")
+    parser.add_argument("--resume", action="store_true",
+                        help="write one part per shard, checkpointing after each; rerun to resume an interrupted job")
+    parser.add_argument("--part-rows", type=int, help="roll over to a new numbered part file after this many rows")
+    parser.add_argument("--part-size", type=parse_size,
+                        help="roll over to a new part file at about this much uncompressed output, e.g. 256M")
+    parser.add_argument("--profile", metavar="JSON", help="time columns, serialization and writes; save the summary here")
+    parser.add_argument("--cprofile", metavar="FILE", help="run under cProfile and dump the stats here")
+    parser.add_argument("-q", "--quiet", action="store_true", help="only log warnings and errors")
+    return parser
+
+
+def run_relational(schema: Dict[str, Any], args: argparse.Namespace, seed: int) -> int:
+    """Generate the tables of a relational schema, one file per table or one SQL dump"""
+    if args.rows is not None or args.parts or args.resume or args.workers != 1:
+        raise ValueError("Relational schemas set rows per table and are generated in one process")
+    if args.part_rows is not None or args.part_size is not None:
+        raise ValueError("Relational schemas are written as one file per table; parts are not supported")
+    logging.info(f"Generating {len(schema['tables'])} tables with seed {seed}")
+    generator = RelationalGenerator(schema, seed, locale=args.locale)
+    start = time.perf_counter()
+    if args.database:
+        outputs = generator.write_database(args.database, args.batch_size)
+    elif args.format == "sql":
+        outputs = [generator.write_sql(args.output)]
+    else:
+        outputs = generator.write_files(args.output, args.format)
+    elapsed = time.perf_counter() - start
+
+    for output_path in outputs:
+        print(output_path)
+    total = sum(generator.row_counts.values())
+    logging.info(f"Wrote {total} rows in {len(outputs)} file(s) in {elapsed:.2f}s")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    logging.basicConfig(
+        level=logging.WARNING if args.quiet else logging.INFO,
+        format='%(asctime)s - %(levelname)s - %(message)s',
+        stream=sys.stderr
+    )
+
+    try:
+        if not args.output and not args.database:
+            raise ValueError("Either --output or --database is required")
+        schema = read_schema(args.schema)
+        seed = args.seed if args.seed is not None else random.randrange(2 ** 32)
+        if is_relational(schema):
+            return run_relational(schema, args, seed)
+
+        if args.rows is None or args.rows <= 0:
+            raise ValueError("Number of records must be greater than 0")
+        if args.workers <= 0:
+            raise ValueError("Number of workers must be greater than 0")
+        column_schema = Schema.from_dict(schema)
+        column_schema.locale = args.locale or column_schema.locale
+        # Shards are generated in other processes, so the locale travels with the columns
+        attributes = column_schema.validate().attributes
+        rolling = args.part_rows is not None or args.part_size is not None
+        if rolling and (args.parts or args.resume):
+            raise ValueError("--parts and --resume write one file per shard; "
+                             "they cannot be combined with --part-rows or --part-size")
+        if args.database:
+            if not args.table or args.parts or args.resume or rolling:
+                raise ValueError("--database needs --table and writes a single table, not part files")
+        else:
+            FileHandler.check_format(args.format)
+            args.output, suffix_compression = split_compression_suffix(args.output)
+            args.compress = args.compress or suffix_compression
+            FileHandler.check_compression(args.format, args.compress)
+        writer = RollingWriter(args.format, args.output, attributes, args.part_rows, args.part_size,
+                               args.compress) if rolling else None
+        job = None
+        if args.resume:
+            # Without --seed, an interrupted job continues with the seed it started with
+            job = GenerationJob.open(args.output, attributes, args.rows, args.format, args.seed,
+                                     args.shard_size, args.compress)
+            seed = job.seed
+
+        # Always generate by shards, so the output depends on the seed and not the worker count
+        logging.info(f"Generating {args.rows} records with seed {seed} on {args.workers} worker(s)")
+
+        faker_data = FakerData()
+        # Column timings are only collected for shards generated in this process (--workers 1)
+        profile = GenerationProfile() if args.profile else None
+        start = time.perf_counter()
+        with cprofile_to(args.cprofile) if args.cprofile else nullcontext(), \
+                profile.activate() if profile is not None else nullcontext():
+            if job is not None:
+                outputs = job.run(args.workers) + [job.manifest_path]
+            elif args.parts:
+                outputs = faker_data.write_parallel_parts(args.output, attributes, args.rows, args.format,
+                                                          seed, args.workers, args.shard_size, args.compress)
+            else:
+                records = faker_data.iter_fake_data_parallel(attributes, args.rows, seed, args.workers,
+                                                             args.shard_size)
+                if profile is not None:
+                    records = profile.track_rows(records)
+                if args.database:
+                    with open_sink(args.database, args.table, attributes, args.batch_size) as sink:
+                        sink.write(records)
+                    outputs = [f"{args.database} {args.table}"]
+                elif writer is not None:
+                    outputs = writer.write(records) + [writer.manifest_path]
+                else:
+                    outputs = [FileHandler.write_stream(args.format, args.output, attributes, records,
+                                                        args.compress)]
+        elapsed = time.perf_counter() - start
+        if profile is not None:
+            profile.log_summary()
+            profile.export_json(args.profile)
+
+        for output_path in outputs:
+            print(output_path)
+        logging.info(f"Wrote {args.rows} records in {elapsed:.2f}s ({args.rows / elapsed:,.0f} rows/sec)")
+        return 0
+    except Exception as e:
+        logging.error(f"faker_cli failed: {str(e)}")
+        return 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,1187 @@
+"""Fake data generation core: record plans, FakerData and sharded parallel generation.
+
+Nothing here imports Qt, and Faker and numpy are only imported once generation needs them,
+so scripts and the command line start quickly on headless machines.
+"""
+import json
+import os
+import random
+import re
+import unicodedata
+import time as clock
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional, Tuple, Union
+from itertools import islice, accumulate
+from functools import partial
+from string import Formatter
+from collections import deque
+from collections.abc import Mapping, Sequence
+from datetime import date, datetime, time
+from decimal import Decimal
+from pathlib import Path
+from importlib.util import find_spec
+from array import array
+from hashlib import blake2b
+import logging
+
+# Number of records generated by one worker task in parallel mode
+DEFAULT_SHARD_SIZE = 100000
+
+# Draws allowed for one value of a unique column before giving up
+DEFAULT_MAX_RETRIES = 1000
+
+DEFAULT_LOCALE = "en_US"
+
+# Values pre-generated for a pooled column given as "pool": True
+DEFAULT_POOL_SIZE = 10000
+
+# Where value pools are cached between runs
+DEFAULT_POOL_CACHE_DIR = Path(os.environ.get("FAKER_POOL_CACHE_DIR", Path.home() / ".cache" / "faker_gui" / "pools"))
+
+POOL_DISTRIBUTIONS = ("uniform", "zipf")
+
+# Values drawn at once by a value pool
+POOL_SAMPLE_BUFFER = 4096
+
+# Column type whose values are built from other columns of the same row, see TemplateColumn
+TEMPLATE_TYPE = "template"
+
+def numpy_available() -> bool:
+    """Whether the optional numpy dependency is installed, without importing it"""
+    return find_spec("numpy") is not None
+
+class UniquenessError(ValueError):
+    """Raised when a unique column cannot produce enough distinct values"""
+
+def fingerprint(value: Any) -> int:
+    """Stable 64-bit fingerprint of a value, used instead of storing the value itself"""
+    return int.from_bytes(blake2b(str(value).encode('utf-8'), digest_size=8).digest(), 'little')
+
+class FingerprintSet:
+    """Set of 64-bit fingerprints in a flat open-addressing table: 8 bytes per slot, no per-item objects"""
+    def __init__(self, capacity: int = 1024):
+        capacity = 1 << max(capacity - 1, 1).bit_length()
+        self._slots = array('Q', bytes(8 * capacity))
+        self._mask = capacity - 1
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    @property
+    def nbytes(self) -> int:
+        return len(self._slots) * self._slots.itemsize
+
+    def add(self, fingerprint: int) -> bool:
+        """Add a fingerprint; False if it was already present"""
+        if 3 * (self._size + 1) > 2 * len(self._slots):  # keep the load factor under 2/3
+            self._grow()
+        fingerprint = fingerprint or 1  # 0 marks an empty slot
+        slots, mask = self._slots, self._mask
+        index = fingerprint & mask
+        while True:
+            current = slots[index]
+            if current == 0:
+                slots[index] = fingerprint
+                self._size += 1
+                return True
+            if current == fingerprint:
+                return False
+            index = (index + 1) & mask
+
+    def _grow(self):
+        old_slots = self._slots
+        self._slots = array('Q', bytes(16 * len(old_slots)))
+        self._mask = len(self._slots) - 1
+        self._size = 0
+        for fingerprint in old_slots:
+            if fingerprint:
+                self.add(fingerprint)
+
+class UniqueColumn:
+    """Column generator that never repeats a value.
+
+    Seen values are kept as fingerprints in a FingerprintSet, so memory stays around
+    8-24 bytes per row whatever the value size. Two different values sharing a fingerprint
+    only cost an extra draw; a duplicate is never emitted.
+    """
+    def __init__(self, name: str, type_name: str, func: Callable[[], Any], max_retries: int = DEFAULT_MAX_RETRIES,
+                 value_space: Optional[int] = None):
+        self.name = name
+        self.type_name = type_name
+        self.func = func
+        self.max_retries = max_retries
+        # Most distinct values the column can take, when known (see value_space)
+        self.value_space = value_space
+        self.seen = FingerprintSet()
+        self.retries = 0
+
+    def __call__(self) -> Any:
+        func = self.func
+        if isinstance(func, LocaleMix):
+            # Replacements come from the row's locale, so the mix stays in step with its sibling columns
+            func = func.next_generator()
+        return self.accept(func(), func)
+
+    def accept(self, value: Any, redraw: Optional[Callable[[], Any]] = None) -> Any:
+        """Return value if it is new, otherwise draw replacements (from redraw, default func) until one is"""
+        redraw = redraw or self.func
+        attempts = 0
+        while not self.seen.add(fingerprint(value)):
+            attempts += 1
+            self.retries += 1
+            if attempts > self.max_retries:
+                raise UniquenessError(
+                    f"Column '{self.name}' ({self.type_name}) found no new value in {self.max_retries} draws "
+                    f"after {len(self.seen)} unique values"
+                )
+            value = redraw()
+        return value
+
+    def check_capacity(self, number_of_items: int) -> None:
+        """Fail before generating when the type cannot have enough distinct values"""
+        value_space = self.value_space
+        if value_space is not None and len(self.seen) + number_of_items > value_space:
+            raise UniquenessError(
+                f"Column '{self.name}' ({self.type_name}) has at most {value_space} distinct values, "
+                f"{len(self.seen) + number_of_items} unique values were requested"
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            "column": self.name,
+            "type": self.type_name,
+            "values": len(self.seen),
+            "retries": self.retries,
+            "seen_set_bytes": self.seen.nbytes,
+        }
+
+class ValuePool:
+    """Column generator that samples from a fixed list of pre-generated values.
+
+    Draws are made POOL_SAMPLE_BUFFER at a time with random.choices. With the "zipf"
+    distribution the value at rank r (starting at 1) is drawn with weight 1 / r ** zipf_exponent.
+    """
+    def __init__(self, values: List[Any], distribution: str = "uniform", zipf_exponent: float = 1.0,
+                 seed: Any = None):
+        if not values:
+            raise ValueError("A value pool needs at least one value")
+        if distribution not in POOL_DISTRIBUTIONS:
+            raise ValueError(f"Unknown pool distribution: {distribution}")
+        self.values = values
+        self.distribution = distribution
+        self._cum_weights = None
+        if distribution == "zipf":
+            self._cum_weights = list(accumulate(1 / rank ** zipf_exponent for rank in range(1, len(values) + 1)))
+        self._random = random.Random(seed)
+        self._buffer = []
+        self._position = 0
+
+    def __call__(self) -> Any:
+        if self._position == len(self._buffer):
+            self._buffer = self._random.choices(self.values, cum_weights=self._cum_weights, k=POOL_SAMPLE_BUFFER)
+            self._position = 0
+        value = self._buffer[self._position]
+        self._position += 1
+        return value
+
+def build_pool(func: Callable[[], Any], size: int, max_draws: Optional[int] = None) -> List[Any]:
+    """Draw up to size distinct values from a generator, in first-drawn order"""
+    if max_draws is None:
+        max_draws = 10 * size + DEFAULT_MAX_RETRIES
+    values = {}
+    for _ in range(max_draws):
+        if len(values) == size:
+            break
+        values[func()] = None
+    return list(values)
+
+class LocaleMix:
+    """Column generator drawing each value from one of several locales, by weight.
+
+    The generators are already-bound methods of cached per-locale Faker instances, and
+    the choice of generator is drawn POOL_SAMPLE_BUFFER rows at a time with random.choices,
+    so a row costs a list lookup and one direct call, with no Faker proxy in between.
+    Columns with the same weights and seed draw the same locale for every row, so the
+    name and the address of a row come from one locale.
+    """
+    def __init__(self, generators: List[Callable[[], Any]], weights: List[float], seed: Any = None):
+        if len(generators) != len(weights) or not generators:
+            raise ValueError("A locale mix needs one weight per generator")
+        self.generators = generators
+        self._cum_weights = list(accumulate(weights))
+        self._random = random.Random(seed)
+        self._buffer = []
+        self._position = 0
+
+    def __call__(self) -> Any:
+        return self.next_generator()()
+
+    def next_generator(self) -> Callable[[], Any]:
+        """Generator of the next row's locale"""
+        if self._position == len(self._buffer):
+            self._buffer = self._random.choices(self.generators, cum_weights=self._cum_weights, k=POOL_SAMPLE_BUFFER)
+            self._position = 0
+        func = self._buffer[self._position]
+        self._position += 1
+        return func
+
+def locale_weights(locale: Any) -> Dict[str, float]:
+    """Normalize a locale option to a locale -> weight mapping.
+
+    Accepts "de_DE", "de_DE:40,fr_FR:30,en_US:30", a list of locales (equal weights) or a
+    {"de_DE": 0.4, "fr_FR": 0.3} mapping. Weights are relative and need not sum to 1.
+    """
+    if isinstance(locale, str):
+        weights = {}
+        for item in locale.split(","):
+            name, _, weight = item.strip().partition(":")
+            weights[name.strip()] = float(weight) if weight else 1.0
+    elif isinstance(locale, (list, tuple)):
+        weights = {str(name): 1.0 for name in locale}
+    elif isinstance(locale, dict):
+        weights = {str(name): float(weight) for name, weight in locale.items()}
+    else:
+        raise ValueError(f"Invalid locale option: {locale!r}")
+    if not weights or any(weight <= 0 for weight in weights.values()):
+        raise ValueError("Locale weights must be greater than 0")
+    from faker.config import AVAILABLE_LOCALES
+    unknown = [name for name in weights if name not in AVAILABLE_LOCALES]
+    if unknown:
+        raise ValueError(f"Unknown locale(s): {', '.join(unknown)}")
+    return weights
+
+def with_locale(attributes: List[Dict[str, Any]], locale: Any) -> List[Dict[str, Any]]:
+    """Give every column without its own "locale" the dataset's locale option.
+
+    Worker processes only see the attributes, so a dataset-wide locale travels in them.
+    """
+    if locale is None:
+        return attributes
+    weights = locale_weights(locale)
+    return [attr if "locale" in attr else {**attr, "locale": weights} for attr in attributes]
+
+def locale_seed(seed: Any, locale: str) -> Any:
+    """Seed of the Faker instance of one locale, derived from the job's seed"""
+    return f"{seed}:{locale}" if seed is not None else None
+
+class CapturedColumn:
+    """Column generator wrapper keeping the row's value for template columns to read"""
+    __slots__ = ("func", "value")
+
+    def __init__(self, func: Callable[[], Any]):
+        self.func = func
+        self.value = None
+
+    def __call__(self) -> Any:
+        self.value = value = self.func()
+        return value
+
+def _slug(value: str) -> str:
+    ascii_value = unicodedata.normalize("NFKD", value).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]+", ".", ascii_value.lower()).strip(".")
+
+def _word(value: str, index: int) -> str:
+    words = value.split()
+    return words[index] if words else value
+
+# Filters of template fields, chained with "|" in the format spec, e.g. "{full_name:first|slug}"
+TEMPLATE_FILTERS = {
+    "lower": str.lower,
+    "upper": str.upper,
+    "title": str.title,
+    "first": lambda value: _word(value, 0),
+    "last": lambda value: _word(value, -1),
+    "slug": _slug,
+}
+
+def template_fields(template: Any, name: str = "") -> List[Tuple[str, str, Optional[str]]]:
+    """(column, format spec, conversion) of every field of a template, in order"""
+    if not isinstance(template, str) or not template:
+        raise ValueError(f"Template column '{name}' needs a non-empty \"template\" string")
+    try:
+        parsed = list(Formatter().parse(template))
+    except ValueError as e:
+        raise ValueError(f"Invalid template of column '{name}': {str(e)}")
+    fields = [(field, spec or "", conversion) for _, field, spec, conversion in parsed if field is not None]
+    bad = [field for field, _, _ in fields if not field or any(char in field for char in ".[{")]
+    if bad or not fields:
+        raise ValueError(f"Template of column '{name}' must name other columns in braces, e.g. \"{{full_name}}\"")
+    return fields
+
+class TemplateColumn:
+    """Column built from values already generated for the same row, e.g. "{first_name:slug}@example.com".
+
+    The template is compiled once into a positional format string; a row costs one
+    str.format call and the field filters, instead of another Faker call.
+    """
+    def __init__(self, name: str, template: str, sources: Dict[str, CapturedColumn]):
+        self.name = name
+        self.template = template
+        pieces = []
+        self._fields = []
+        for literal, field, spec, conversion in Formatter().parse(template):
+            pieces.append(literal.replace("{", "{{").replace("}", "}}"))
+            if field is None:
+                continue
+            filters = spec.split("|") if spec else []
+            if filters and all(filter_name in TEMPLATE_FILTERS for filter_name in filters):
+                chain = [TEMPLATE_FILTERS[filter_name] for filter_name in filters]
+                spec = ""
+            else:
+                chain = None
+            pieces.append("{" + str(len(self._fields)) + ("!" + conversion if conversion else "") +
+                          (":" + spec if spec else "") + "}")
+            self._fields.append((sources[field], chain))
+        self._format = "".join(pieces).format
+
+    def __call__(self) -> str:
+        return self._format(*[source.value if chain is None else self._filter(source.value, chain)
+                              for source, chain in self._fields])
+
+    @staticmethod
+    def _filter(value: Any, chain: List[Callable[[str], str]]) -> str:
+        value = "" if value is None else str(value)
+        for func in chain:
+            value = func(value)
+        return value
+
+class NullableColumn:
+    """Column generator returning None for a share of the rows.
+
+    The wrapped generator is called for every row, so templates reading the column and
+    the random sequence of the other columns do not depend on which rows are null.
+    """
+    __slots__ = ("func", "ratio", "_random")
+
+    def __init__(self, func: Callable[[], Any], ratio: float, seed: Any = None):
+        self.func = func
+        self.ratio = ratio
+        self._random = random.Random(seed).random
+
+    def __call__(self) -> Any:
+        value = self.func()
+        return None if self._random() < self.ratio else value
+
+def _param_value(key: str, value: Any) -> Any:
+    """Faker argument from a JSON parameter: ISO dates become dates for date arguments"""
+    if isinstance(value, str) and (key.endswith("_date") or key.endswith("_datetime")):
+        try:
+            return date.fromisoformat(value)
+        except ValueError:
+            return value  # relative dates such as "-30y" or "today" are parsed by Faker
+    return value
+
+def pool_cache_path(cache_dir: Path, type_name: str, locale: str, seed: Any, size: int,
+                    params: Optional[str] = None) -> Path:
+    """Cache file of one value pool; the Faker version is part of the key since values change across releases"""
+    from faker import VERSION
+    params_tag = f"-p{blake2b(params.encode('utf-8'), digest_size=6).hexdigest()}" if params else ""
+    return Path(cache_dir) / f"{type_name}-{locale}-{seed}-{size}{params_tag}-faker{VERSION}.json"
+
+# Pool values JSON has no type for, cached as {"$date": "2020-01-01"} and read back as the same type.
+# Pools are JSON rather than pickles, so a writable cache directory cannot run code in the generator.
+POOL_VALUE_TAGS = {
+    "$decimal": Decimal,
+    "$datetime": datetime.fromisoformat,
+    "$date": date.fromisoformat,
+    "$time": time.fromisoformat,
+}
+
+def _pool_value_to_json(value: Any) -> Dict[str, str]:
+    if isinstance(value, Decimal):
+        return {"$decimal": str(value)}
+    if isinstance(value, datetime):  # before date, since a datetime is a date
+        return {"$datetime": value.isoformat()}
+    if isinstance(value, date):
+        return {"$date": value.isoformat()}
+    if isinstance(value, time):
+        return {"$time": value.isoformat()}
+    raise TypeError(f"Values of type {type(value).__name__} cannot be cached")
+
+def _pool_value_from_json(data: Dict[str, Any]) -> Any:
+    if len(data) == 1:
+        tag, text = next(iter(data.items()))
+        if tag in POOL_VALUE_TAGS:
+            return POOL_VALUE_TAGS[tag](text)
+    return data
+
+def write_pool_file(path: Path, values: List[Any]) -> None:
+    """Write a value pool through a temporary file, so concurrent readers never see it half written"""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    temp_path.write_text(json.dumps(values, default=_pool_value_to_json, ensure_ascii=False), encoding='utf-8')
+    os.replace(temp_path, path)
+
+def read_pool_file(path: Path) -> List[Any]:
+    values = json.loads(path.read_text(encoding='utf-8'), object_hook=_pool_value_from_json)
+    if not isinstance(values, list):
+        raise ValueError("not a list of values")
+    return values
+
+class Record(Mapping):
+    """Read-only dict-like view of one row of a RecordTable (record["email"], get, keys, items, ==)"""
+    __slots__ = ("_values", "_index")
+
+    def __init__(self, values: Tuple[Any, ...], index: Dict[str, int]):
+        self._values = values
+        self._index = index
+
+    def __getitem__(self, name: str) -> Any:
+        return self._values[self._index[name]]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._index)
+
+    def __len__(self) -> int:
+        return len(self._values)
+
+    def __repr__(self) -> str:
+        return f"Record({dict(self)!r})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        return dict(zip(self._index, self._values))
+
+class RecordTable(Sequence):
+    """Records stored as plain tuples sharing one tuple of column names.
+
+    A row costs one tuple instead of a dict with its own key table, less than half the
+    memory for typical widths (see benchmarks/bench_records.py). Indexing and iteration
+    return Record views, created on access and not kept, so code written against lists of
+    dicts keeps working; rows gives the tuples and columns() a column batch.
+    """
+    def __init__(self, names: List[str], rows: List[Tuple[Any, ...]]):
+        self.names = tuple(names)
+        self.rows = rows
+        self._index = {name: position for position, name in enumerate(self.names)}
+
+    def __len__(self) -> int:
+        return len(self.rows)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return RecordTable(self.names, self.rows[index])
+        return Record(self.rows[index], self._index)
+
+    def __iter__(self) -> Iterator[Record]:
+        index = self._index
+        for values in self.rows:
+            yield Record(values, index)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, RecordTable):
+            return self.names == other.names and self.rows == other.rows
+        if isinstance(other, list):
+            return len(self) == len(other) and all(record == item for record, item in zip(self, other))
+        return NotImplemented
+
+    def __repr__(self) -> str:
+        return f"RecordTable({len(self.rows)} rows, columns={list(self.names)})"
+
+    def column(self, name: str) -> List[Any]:
+        position = self._index[name]
+        return [values[position] for values in self.rows]
+
+    def columns(self) -> Dict[str, List[Any]]:
+        """Column-oriented copy, in the form generate_columns returns"""
+        return {name: list(values) for name, values in zip(self.names, zip(*self.rows))} if self.rows \
+            else {name: [] for name in self.names}
+
+    def to_dicts(self) -> List[Dict[str, Any]]:
+        names = self.names
+        return [dict(zip(names, values)) for values in self.rows]
+
+class RecordPlan:
+    """Compiled generation plan for one schema: column names bound to their generators"""
+    def __init__(self, names: List[str], generators: List[Callable[[], Any]], types: Optional[List[str]] = None):
+        self.names = names
+        self.generators = generators
+        self.types = types
+        self._columns = list(zip(names, generators))
+
+    @property
+    def attributes(self) -> List[Dict[str, str]]:
+        """Name/type pairs the plan was compiled from"""
+        return [{"name": name, "type": type_name} for name, type_name in zip(self.names, self.types or [])]
+
+    @property
+    def unique_columns(self) -> List[UniqueColumn]:
+        # Instrumented plans wrap their generators; the wrapped column is what counts
+        generators = (getattr(func, "wrapped", func) for func in self.generators)
+        return [func for func in generators if isinstance(func, UniqueColumn)]
+
+    def check_capacity(self, number_of_items: int) -> None:
+        """Raise UniquenessError if a unique column cannot supply number_of_items more values"""
+        for column in self.unique_columns:
+            column.check_capacity(number_of_items)
+
+    def unique_stats(self) -> List[Dict[str, Any]]:
+        """Distinct values, retries and seen-set size of each unique column"""
+        return [column.stats() for column in self.unique_columns]
+
+    def log_unique_stats(self) -> None:
+        for stats in self.unique_stats():
+            logging.info(
+                f"Unique column {stats['column']}: {stats['values']} values, {stats['retries']} retries, "
+                f"{stats['seen_set_bytes']} bytes of fingerprints"
+            )
+
+    def generate_record(self) -> Dict[str, Any]:
+        """Generate a single record"""
+        return {name: func() for name, func in self._columns}
+
+    def generate(self, number_of_items: int) -> List[Dict[str, Any]]:
+        """Generate a list of records"""
+        self.check_capacity(number_of_items)
+        columns = self._columns
+        records = [{name: func() for name, func in columns} for _ in range(number_of_items)]
+        self.log_unique_stats()
+        return records
+
+    def generate_table(self, number_of_items: int) -> RecordTable:
+        """Generate records as a RecordTable of tuples, for large batches kept in memory"""
+        self.check_capacity(number_of_items)
+        generators = self.generators
+        table = RecordTable(self.names, [tuple([func() for func in generators]) for _ in range(number_of_items)])
+        self.log_unique_stats()
+        return table
+
+    def iter_records(self, number_of_items: int) -> Iterator[Dict[str, Any]]:
+        """Lazily generate records one at a time"""
+        # Checked here rather than in the generator, so impossible requests fail immediately
+        self.check_capacity(number_of_items)
+        return self._iter_records(number_of_items)
+
+    def _iter_records(self, number_of_items: int) -> Iterator[Dict[str, Any]]:
+        columns = self._columns
+        for _ in range(number_of_items):
+            yield {name: func() for name, func in columns}
+        self.log_unique_stats()
+
+# Value kind of each data type, for typed outputs; every type not listed is a string
+VALUE_KINDS = {
+    "boolean": "bool",
+    "random_digit": "int",
+    "latitude": "float",
+    "longitude": "float",
+    "date": "date",
+    "date_of_birth": "date",
+    "random_int": "int",
+    "pyfloat": "float",
+    "date_between": "date",
+    "key": "int",
+}
+
+def value_kind(attr: Dict[str, Any]) -> str:
+    """Value kind of a column; a "pattern" param makes date and time types return formatted strings"""
+    if (attr.get("params") or {}).get("pattern") is not None:
+        return "str"
+    return VALUE_KINDS.get(attr["type"], "str")
+
+# Type of the generated integer key columns of relational tables
+KEY_TYPE = "key"
+
+# Distinct values of the data types whose values do not depend on the locale
+ANY_LOCALE_VALUE_SPACES = {
+    "boolean": 2,
+    "random_digit": 10,
+    "random_letter": 52,
+    "time": 86400,
+}
+
+# Upper bound on distinct values of the data types with small value spaces, by locale, used to
+# reject impossible unique columns before generating anything. Other locales are not checked
+# beyond ANY_LOCALE_VALUE_SPACES; their columns fail through retries instead.
+VALUE_SPACES = {
+    "en_US": {
+        "file_extension": 32,
+        "mime_type": 68,
+        "color_name": 140,
+        "currency_code": 164,
+        "language_code": 182,
+        "country": 243,
+        "job": 639,
+        "word": 971,
+        "zipcode": 99450,  # postcode() is randint(501, 99950)
+    },
+}
+
+def value_space(type_name: str, locales: Iterable[str]) -> Optional[int]:
+    """Most distinct values a data type can have in one locale or a mix of them; None when unknown"""
+    if type_name in ANY_LOCALE_VALUE_SPACES:
+        return ANY_LOCALE_VALUE_SPACES[type_name]
+    spaces = [VALUE_SPACES.get(locale, {}).get(type_name) for locale in locales]
+    return sum(spaces) if spaces and None not in spaces else None
+
+# Vectorized column generators: (numpy Generator, count) -> column.
+# Each one reproduces the distribution of the Faker provider of the same name.
+def _vector_random_digit(rng, count: int):
+    return rng.integers(0, 10, count)
+
+def _vector_boolean(rng, count: int):
+    return rng.integers(1, 101, count) <= 50
+
+def _vector_latitude(rng, count: int):
+    return rng.integers(-180000000, 180000001, count) / 2000000
+
+def _vector_longitude(rng, count: int):
+    return rng.integers(-180000000, 180000001, count) / 1000000
+
+def _vector_hex_color(rng, count: int) -> List[str]:
+    # Hex-encode all values at once, then slice out the low three bytes of each
+    encoded = rng.integers(1, 16777216, count).astype('>u4').tobytes().hex()
+    return ['#' + encoded[i + 2:i + 8] for i in range(0, 8 * count, 8)]
+
+def _vector_mac_address(rng, count: int) -> List[str]:
+    octets = rng.integers(0, 256, (count, 6), dtype='uint8')
+    octets[:, 0] = rng.integers(0, 127, count) * 2  # unicast: even first octet
+    encoded = octets.tobytes().hex()
+    return [
+        f"{encoded[i:i + 2]}:{encoded[i + 2:i + 4]}:{encoded[i + 4:i + 6]}:"
+        f"{encoded[i + 6:i + 8]}:{encoded[i + 8:i + 10]}:{encoded[i + 10:i + 12]}"
+        for i in range(0, 12 * count, 12)
+    ]
+
+_OCTETS = [str(octet) for octet in range(256)]
+
+def _vector_ipv4(rng, count: int) -> List[str]:
+    # Uniform over every address outside Faker's excluded networks, which is what
+    # Faker's size-weighted choice of subnet amounts to
+    import numpy as np
+    from faker.providers.internet import _IPv4Constants
+    excluded = [
+        (int(network.network_address), int(network.netmask))
+        for network in _IPv4Constants._excluded_networks
+    ]
+    addresses = rng.integers(0, 2 ** 32, count, dtype=np.uint64)
+    while True:
+        rejected = np.zeros(count, dtype=bool)
+        for network_address, netmask in excluded:
+            rejected |= (addresses & netmask) == network_address
+        if not rejected.any():
+            break
+        addresses[rejected] = rng.integers(0, 2 ** 32, int(rejected.sum()), dtype=np.uint64)
+    octets = addresses.astype('>u4').view(np.uint8).reshape(count, 4).T.tolist()
+    return [
+        f"{_OCTETS[a]}.{_OCTETS[b]}.{_OCTETS[c]}.{_OCTETS[d]}"
+        for a, b, c, d in zip(*octets)
+    ]
+
+def _vector_date(rng, count: int) -> List[str]:
+    # Faker's date(): a uniform timestamp between the epoch and now, formatted %Y-%m-%d
+    seconds = rng.integers(0, int(clock.time()) + 1, count)
+    return (seconds // 86400).astype('datetime64[D]').astype(str).tolist()
+
+VECTORIZED_GENERATORS = {
+    "random_digit": _vector_random_digit,
+    "boolean": _vector_boolean,
+    "latitude": _vector_latitude,
+    "longitude": _vector_longitude,
+    "hex_color": _vector_hex_color,
+    "mac_address": _vector_mac_address,
+    "ipv4": _vector_ipv4,
+    "date": _vector_date,
+}
+
+def records_from_columns(columns: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Turn a column batch from generate_columns back into records of plain Python values"""
+    names = list(columns)
+    values = [column.tolist() if hasattr(column, "tolist") else column for column in columns.values()]
+    for row in zip(*values):
+        yield dict(zip(names, row))
+
+# Data types offered to users. "type" is the Faker method that generates values and
+# "providers" the en_US Faker provider modules it needs: the one defining the method first,
+# then the ones it formats values from (e.g. email builds user names from person names).
+# Other locales load every provider, see FakerData.get_generator.
+DATA_TYPES = [
+    {"type": "name", "description": "Full name", "providers": ["person"]},
+    {"type": "last_name", "description": "Last name only", "providers": ["person"]},
+    {"type": "email", "description": "Email address", "providers": ["internet", "person"]},
+    {"type": "phone_number", "description": "Phone number", "providers": ["phone_number"]},
+    {"type": "address", "description": "Full address", "providers": ["address", "person"]},
+    {"type": "text", "description": "Random text", "providers": ["lorem"]},
+    {"type": "date", "description": "Random date", "providers": ["date_time"]},
+    {"type": "time", "description": "Random time", "providers": ["date_time"]},
+    {"type": "url", "description": "Website URL", "providers": ["internet", "company", "person"]},
+    {"type": "job", "description": "Job title", "providers": ["job"]},
+    {"type": "company", "description": "Company name", "providers": ["company", "person"]},
+    {"type": "country", "description": "Country name", "providers": ["address"]},
+    {"type": "currency_code", "description": "Currency code", "providers": ["currency"]},
+    {"type": "file_name", "description": "Random file name", "providers": ["file", "lorem"]},
+    {"type": "image_url", "description": "Image URL", "providers": ["internet"]},
+    {"type": "ipv4", "description": "IPv4 address", "providers": ["internet"]},
+    {"type": "user_name", "description": "Username", "providers": ["internet", "person"]},
+    {"type": "color_name", "description": "Color name", "providers": ["color"]},
+    {"type": "ssn", "description": "Social Security Number", "providers": ["ssn"]},
+    {"type": "boolean", "description": "True/False", "providers": ["misc"]},
+    {"type": "credit_card_number", "description": "Credit card number", "providers": ["credit_card"]},
+    {"type": "date_of_birth", "description": "Date of birth", "providers": ["date_time"]},
+    {"type": "file_extension", "description": "File extension", "providers": ["file"]},
+    {"type": "hex_color", "description": "Hex color code", "providers": ["color"]},
+    {"type": "isbn10", "description": "ISBN-10", "providers": ["isbn"]},
+    {"type": "isbn13", "description": "ISBN-13", "providers": ["isbn"]},
+    {"type": "language_code", "description": "Language code", "providers": ["user_agent"]},
+    {"type": "mac_address", "description": "MAC address", "providers": ["internet"]},
+    {"type": "mime_type", "description": "MIME type", "providers": ["file"]},
+    {"type": "password", "description": "Random password", "providers": ["misc"]},
+    {"type": "random_digit", "description": "Random digit (0-9)", "providers": ["misc"]},
+    {"type": "random_letter", "description": "Random letter (a-z)", "providers": ["misc"]},
+    {"type": "street_address", "description": "Street address", "providers": ["address", "person"]},
+    {"type": "word", "description": "Random word", "providers": ["lorem"]},
+    {"type": "zipcode", "description": "Zip code", "providers": ["address"]},
+    {"type": "latitude", "description": "Latitude coordinate", "providers": ["geo"]},
+    {"type": "longitude", "description": "Longitude coordinate", "providers": ["geo"]},
+    {"type": "random_int", "description": "Random integer (params: min, max, step)", "providers": ["misc"]},
+    {"type": "pyfloat", "description": "Random float (params: min_value, max_value, right_digits)",
+     "providers": ["python"]},
+    {"type": "date_between", "description": "Date in a range (params: start_date, end_date)",
+     "providers": ["date_time"]},
+]
+
+class FakerData:
+    """Class to handle Faker data generation and functionality"""
+    def __init__(self, seed: Optional[int] = None, pool_cache_dir: Optional[Path] = None, locale: Any = None,
+                 cache_pools: bool = True):
+        self.seed = seed
+        # Default locale option of the columns; a mapping mixes locales by weight
+        self.locales = locale_weights(locale) if locale is not None else None
+        self.locale = next(iter(self.locales)) if self.locales else DEFAULT_LOCALE
+        # Locale -> cached FakerData of that locale, see for_locale
+        self._locale_data = {}
+        self.pool_cache_dir = Path(pool_cache_dir) if pool_cache_dir is not None else DEFAULT_POOL_CACHE_DIR
+        # False keeps pools in memory only, e.g. for throwaway previews
+        self.cache_pools = cache_pools
+        # (type, locale, seed, size) -> pooled values, shared by every plan of this instance
+        self._pools = {}
+        self._fake = None
+        self._loaded_providers = set()
+        self._numpy_rng = None
+        self.formatted_functionality = [
+            {"type": data_type["type"], "description": data_type["description"]} for data_type in DATA_TYPES
+        ]
+        self.providers_by_type = {data_type["type"]: data_type["providers"] for data_type in DATA_TYPES}
+        # Type -> bound generator, filled as plans first use each type
+        self.functions_by_type = {}
+
+    @property
+    def fake(self):
+        """Faker generator, created on first use and holding only the providers loaded so far"""
+        if self._fake is None:
+            from faker import Generator
+            self._fake = Generator(locale=self.locale, use_weighting=True)
+            if self.seed is not None:
+                self._fake.seed_instance(self.seed)
+        return self._fake
+
+    def reseed(self, seed: int) -> None:
+        """Restart the random sequence from a new seed"""
+        self.seed = seed
+        self.fake.seed_instance(seed)
+        for locale, locale_data in self._locale_data.items():
+            locale_data.reseed(locale_seed(seed, locale))
+
+    def for_locale(self, locale: str) -> "FakerData":
+        """FakerData of another locale, created once and kept with its loaded providers"""
+        if locale == self.locale:
+            return self
+        locale_data = self._locale_data.get(locale)
+        if locale_data is None:
+            locale_data = FakerData(locale_seed(self.seed, locale), self.pool_cache_dir, locale)
+            locale_data._pools = self._pools  # pools are keyed by locale, so one cache serves all
+            self._locale_data[locale] = locale_data
+        locale_data.pool_cache_dir = self.pool_cache_dir
+        locale_data.cache_pools = self.cache_pools
+        return locale_data
+
+    def get_generator(self, type_name: str) -> Callable[[], Any]:
+        """Bound Faker method for a data type, loading the providers it needs on first use"""
+        func = self.functions_by_type.get(type_name)
+        if func is None:
+            if type_name not in self.providers_by_type:
+                raise ValueError(f"Invalid data type(s): {type_name}")
+            missing = [name for name in self.providers_by_type[type_name] if name not in self._loaded_providers]
+            if missing:
+                from faker import Factory
+                # Load the defining provider last so its methods take precedence, as in Faker()
+                modules = [f"faker.providers.{name}" for name in reversed(missing)]
+                if self.locale != DEFAULT_LOCALE:
+                    # The provider lists are what en_US formats its values from; other locales use
+                    # others (ru_RU user names need date_time, it_IT ssn needs person), so load them all
+                    from faker.config import PROVIDERS
+                    modules = PROVIDERS
+                    missing = [module.rsplit(".", 1)[1] for module in PROVIDERS]
+                Factory.create(self.locale, providers=modules, generator=self.fake)
+                self._loaded_providers.update(missing)
+            try:
+                func = self.functions_by_type[type_name] = getattr(self.fake, type_name)
+            except AttributeError:
+                raise ValueError(f"Data type {type_name} is not available for locale {self.locale}")
+        return func
+
+    def column_function(self, type_name: str, params: Optional[Dict[str, Any]] = None) -> Callable[[], Any]:
+        """Generator of a data type with its keyword parameters bound, e.g. random_int with {"min": 1, "max": 6}"""
+        func = self.get_generator(type_name)
+        if not params:
+            return func
+        if not isinstance(params, dict):
+            raise ValueError(f"Params of {type_name} must be a mapping of argument names to values")
+        params = {key: _param_value(key, value) for key, value in params.items()}
+        import inspect
+        try:
+            inspect.signature(func).bind(**params)
+        except TypeError as e:
+            raise ValueError(f"Invalid params for {type_name}: {str(e)}")
+        return partial(func, **params)
+
+    def get_pool(self, type_name: str, size: int, seed: Optional[int] = None,
+                 params: Optional[Dict[str, Any]] = None) -> List[Any]:
+        """Distinct values of a data type, generated once per (type, locale, seed, size, params).
+
+        Pools with a seed are cached on disk under pool_cache_dir (as JSON, unless cache_pools
+        is False), so later runs and worker processes load them instead of calling Faker. Types with a small value space get
+        fewer values than asked for.
+        """
+        key = (type_name, self.locale, seed, size, json.dumps(params, sort_keys=True) if params else None)
+        values = self._pools.get(key)
+        if values is not None:
+            return values
+
+        cache_path = pool_cache_path(self.pool_cache_dir, *key) if seed is not None and self.cache_pools else None
+        if cache_path is not None and cache_path.exists():
+            try:
+                values = read_pool_file(cache_path)
+            except Exception as e:
+                logging.warning(f"Ignoring unreadable value pool {cache_path}: {str(e)}")
+
+        if values is None:
+            pool_data = FakerData(seed=seed, locale=self.locale)
+            # Parameters can widen a value space (e.g. a time pattern with a date), so it is only used without them
+            space = value_space(type_name, [self.locale]) if not params else None
+            values = build_pool(pool_data.column_function(type_name, params), min(size, space or size))
+            if len(values) < size:
+                logging.warning(f"Value pool for {type_name} has {len(values)} distinct values, {size} were requested")
+            if cache_path is not None:
+                try:
+                    write_pool_file(cache_path, values)
+                except (OSError, TypeError) as e:
+                    logging.warning(f"Could not cache value pool {cache_path}: {str(e)}")
+
+        self._pools[key] = values
+        return values
+
+    def compile_plan(self, attributes: List[Dict[str, Any]]) -> RecordPlan:
+        """Compile attribute name/type pairs into a reusable record plan.
+
+        An attribute with "unique": True never repeats a value within the plan
+        (optionally with its own "max_retries").
+
+        An attribute with "pool" (a size, or True for DEFAULT_POOL_SIZE) samples from
+        pre-generated values instead of calling Faker for every row. "distribution" is
+        "uniform" (default) or "zipf" with an optional "zipf_exponent". The pool values
+        come from "pool_seed", defaulting to this instance's seed; row draws follow the seed.
+
+        An attribute with "locale" (see locale_weights) uses that locale, or a weighted mix
+        of locales, instead of this instance's locale option.
+
+        "params" are keyword arguments of the Faker method, e.g. {"max_nb_chars": 80} for
+        text or {"min": 1, "max": 6} for random_int; "null_ratio" is the share of rows left
+        empty (None). A column of type "template" is built from earlier columns of the same
+        row, e.g. {"type": "template", "template": "{full_name:first|slug}@example.com"}; see
+        TEMPLATE_FILTERS. Templates see the generated value even in rows where null_ratio
+        empties the source column.
+        """
+        if not attributes:
+            raise ValueError("At least one data type must be selected")
+
+        invalid_types = [attr["type"] for attr in attributes
+                         if attr["type"] not in self.providers_by_type and attr["type"] != TEMPLATE_TYPE]
+        if invalid_types:
+            raise ValueError(f"Invalid data type(s): {', '.join(dict.fromkeys(invalid_types))}")
+
+        # Columns read by templates keep their value for the rest of the row
+        names = [attr["name"] for attr in attributes]
+        referenced = set()
+        for position, attr in enumerate(attributes):
+            if attr["type"] != TEMPLATE_TYPE:
+                continue
+            fields = [field for field, _, _ in template_fields(attr.get("template"), attr["name"])]
+            later = [field for field in fields if field not in names[:position]]
+            if later:
+                raise ValueError(f"Template of column '{attr['name']}' uses {', '.join(dict.fromkeys(later))}; "
+                                 f"it can only use columns before it")
+            unique = [field for field in fields if attributes[names.index(field)].get("unique")]
+            if unique:
+                # Unique values repeated across shards are replaced after the row is built
+                raise ValueError(f"Template of column '{attr['name']}' cannot use unique column(s) "
+                                 f"{', '.join(dict.fromkeys(unique))}")
+            referenced.update(fields)
+
+        generators = []
+        captured = {}
+        # Unseeded plans still need one locale draw per row, shared by the columns of each weight set
+        mix_base = self.seed if self.seed is not None else random.randrange(2 ** 64)
+        for attr in attributes:
+            if attr.get("pool") and attr.get("unique"):
+                raise ValueError(f"Column '{attr['name']}' cannot be both pooled and unique")
+            null_ratio = float(attr.get("null_ratio") or 0)
+            if not 0 <= null_ratio <= 1:
+                raise ValueError(f"Null ratio of column '{attr['name']}' must be between 0 and 1")
+            if null_ratio and attr.get("unique"):
+                raise ValueError(f"Column '{attr['name']}' cannot be both unique and nullable")
+            if attr["type"] == TEMPLATE_TYPE:
+                if attr.get("pool") or attr.get("unique") or attr.get("params"):
+                    raise ValueError(f"Template column '{attr['name']}' only takes a template and a null ratio")
+                func = TemplateColumn(attr["name"], attr["template"], captured)
+            else:
+                locale = attr.get("locale", self.locales)
+                weights = locale_weights(locale) if locale is not None else {self.locale: 1.0}
+                if len(weights) == 1:
+                    func = self.for_locale(next(iter(weights)))._column_generator(attr)
+                else:
+                    # Seeded by the weights, not the column, so columns sharing weights pick the same locale per row
+                    func = LocaleMix([self.for_locale(name)._column_generator(attr) for name in weights],
+                                     list(weights.values()), f"{mix_base}:{sorted(weights.items())}")
+                if attr.get("unique"):
+                    space = value_space(attr["type"], weights) if not attr.get("params") else None
+                    func = UniqueColumn(attr["name"], attr["type"], func,
+                                        attr.get("max_retries", DEFAULT_MAX_RETRIES), space)
+            if attr["name"] in referenced:
+                func = captured[attr["name"]] = CapturedColumn(func)
+            if null_ratio:
+                null_seed = f"{self.seed}:{attr['name']}:nulls" if self.seed is not None else None
+                func = NullableColumn(func, null_ratio, null_seed)
+            generators.append(func)
+
+        return RecordPlan(
+            [attr["name"] for attr in attributes],
+            generators,
+            [attr["type"] for attr in attributes]
+        )
+
+    def _column_generator(self, attr: Dict[str, Any]) -> Callable[[], Any]:
+        """Generator of one column in this instance's locale: a value pool or the bound Faker method"""
+        size = None
+        if attr.get("pool"):
+            size = DEFAULT_POOL_SIZE if attr["pool"] is True else int(attr["pool"])
+            if size <= 0:
+                raise ValueError(f"Pool size of column '{attr['name']}' must be greater than 0")
+        try:
+            if size is None:
+                return self.column_function(attr["type"], attr.get("params"))
+            values = self.get_pool(attr["type"], size, attr.get("pool_seed", self.seed), attr.get("params"))
+        except ValueError as e:
+            raise ValueError(f"Column '{attr['name']}': {str(e)}")
+        sample_seed = f"{self.seed}:{attr['name']}" if self.seed is not None else None
+        return ValuePool(values, attr.get("distribution", "uniform"), attr.get("zipf_exponent", 1.0), sample_seed)
+
+    def generate_columns(self, attributes: List[Dict[str, str]], number_of_items: int,
+                         vectorized: bool = True) -> Dict[str, Any]:
+        """Generate a batch of records as columns instead of rows.
+
+        Types listed in VECTORIZED_GENERATORS are produced in bulk with NumPy when it is
+        installed (numeric types as arrays, text types as lists); every other column falls
+        back to one Faker call per value.
+        """
+        plan = self.compile_plan(attributes)
+        vectorized = vectorized and numpy_available()
+        if vectorized and self._numpy_rng is None:
+            import numpy as np
+            self._numpy_rng = np.random.default_rng(self.seed)
+
+        columns = {}
+        fallback = []
+        for attr, func in zip(attributes, plan.generators):
+            vector_func = VECTORIZED_GENERATORS.get(attr["type"])
+            # Unique, pooled, mixed-locale, parameterized, nullable and template sources keep their own generators
+            if vectorized and vector_func is not None and not isinstance(
+                    func, (UniqueColumn, ValuePool, LocaleMix, partial, NullableColumn, CapturedColumn)):
+                columns[attr["name"]] = vector_func(self._numpy_rng, number_of_items)
+            else:
+                columns[attr["name"]] = None  # keeps the column order
+                fallback.append((attr["name"], func))
+        if any(attr["type"] == TEMPLATE_TYPE for attr in attributes):
+            # Templates read the other columns of their row, so these are generated row by row
+            rows = [[func() for _, func in fallback] for _ in range(number_of_items)]
+            for position, (name, _) in enumerate(fallback):
+                columns[name] = [row[position] for row in rows]
+        else:
+            for name, func in fallback:
+                columns[name] = [func() for _ in range(number_of_items)]
+        return columns
+
+    def generate_fake_data(self, selected_choices: List[str], number_of_items: int,
+                           compact: bool = False) -> Union[List[Dict[str, Any]], RecordTable]:
+            """Generate fake data based on selected choices; compact=True returns a RecordTable instead of dicts"""
+            plan = self.compile_plan([{"name": type_name, "type": type_name} for type_name in selected_choices])
+                
+            try:
+                if compact:
+                    return plan.generate_table(number_of_items)
+                return plan.generate(number_of_items)
+            except Exception as e:
+                logging.error(f"Error generating fake data: {str(e)}")
+                raise
+
+    def iter_fake_data(self, selected_choices: List[str], number_of_items: int) -> Iterator[Dict[str, Any]]:
+        """Lazily generate fake data based on selected choices, keeping memory constant"""
+        # Compile eagerly so invalid choices fail here rather than on the first next()
+        plan = self.compile_plan([{"name": type_name, "type": type_name} for type_name in selected_choices])
+        return plan.iter_records(number_of_items)
+
+    def generate_shard(self, attributes: List[Dict[str, Any]], shard_index: int, count: int,
+                       base_seed: int) -> List[Tuple[Any, ...]]:
+        """Rows of one shard as value tuples; reseeds this instance with shard_seed(base_seed, shard_index).
+
+        Attributes with pools should be pool_seeded with base_seed, as the parallel paths do.
+        """
+        self.reseed(shard_seed(base_seed, shard_index))
+        plan = self.compile_plan(attributes)
+        from profiling import ACTIVE_PROFILE
+        profile = ACTIVE_PROFILE.get()  # only set when shards run in the profiling process
+        if profile is not None:
+            plan = profile.instrument(plan)
+        generators = plan.generators
+        return [tuple(func() for func in generators) for _ in range(count)]
+
+    def iter_fake_data_parallel(self, attributes: List[Dict[str, str]], number_of_items: int, seed: int = 0,
+                                workers: Optional[int] = None,
+                                shard_size: int = DEFAULT_SHARD_SIZE) -> Iterator[Dict[str, Any]]:
+        """Generate records across worker processes, yielded in shard order.
+
+        Each shard gets its own Faker instance seeded with shard_seed(seed, index), so
+        the output only depends on seed and shard_size, never on timing or worker count.
+        Date and time providers pick values up to "now", so they only repeat within a day.
+
+        Unique columns are deduplicated within each shard and again while merging; values
+        repeated across shards are replaced from a separately seeded generator.
+        """
+        # Worker processes only see the attributes, so this instance's locale option travels in them
+        attributes = pool_seeded(with_locale(attributes, self.locales), seed)
+        # Merge-side plan: its unique columns see every value and redraw cross-shard repeats
+        merge_plan = FakerData(shard_seed(seed, UNIQUE_REFILL_SHARD), self.pool_cache_dir).compile_plan(attributes)
+        merge_plan.check_capacity(number_of_items)
+        shards = split_shards(number_of_items, shard_size)
+        tasks = [
+            (_generate_shard, (attributes, index, count, seed, self.pool_cache_dir))
+            for index, count in shards
+        ]
+        rows = (values for shard_rows in _run_in_order(tasks, workers) for values in shard_rows)
+        if merge_plan.unique_columns:
+            rows = _dedupe_rows(rows, merge_plan)
+        return (dict(zip(merge_plan.names, values)) for values in rows)
+
+    def write_parallel_parts(self, file_name: str, attributes: List[Dict[str, str]], number_of_items: int,
+                             file_format: str = "csv", seed: int = 0, workers: Optional[int] = None,
+                             shard_size: int = DEFAULT_SHARD_SIZE, compression: Optional[str] = None) -> List[Path]:
+        """Generate records across worker processes, each shard written to its own part file"""
+        from file_handler import FileHandler  # the writers import this module
+        FileHandler.check_format(file_format)
+        FileHandler.check_compression(file_format, compression)
+        if any(attr.get("unique") for attr in attributes):
+            raise ValueError("Unique columns need a single merged output; part files are generated independently")
+        attributes = pool_seeded(with_locale(attributes, self.locales), seed)
+        self.compile_plan(attributes)  # validate, and build any value pools once before the workers load them
+        shards = split_shards(number_of_items, shard_size)
+        tasks = [
+            (_write_shard_part,
+             (attributes, index, count, seed, file_name, file_format, self.pool_cache_dir, compression))
+            for index, count in shards
+        ]
+        from profiling import ACTIVE_PROFILE
+        profile = ACTIVE_PROFILE.get()
+        parts = []
+        for (_, count), path in zip(shards, _run_in_order(tasks, workers)):
+            if profile is not None:
+                profile.add_rows(count)
+            parts.append(path)
+        return parts
+
+# Shard index whose seed drives the replacement of values repeated across shards
+UNIQUE_REFILL_SHARD = -1
+
+def _dedupe_rows(rows: Iterator[Tuple[Any, ...]], merge_plan: RecordPlan) -> Iterator[Tuple[Any, ...]]:
+    """Pass merged shard rows through the merge plan's unique columns"""
+    unique = [(index, func) for index, func in enumerate(merge_plan.generators) if isinstance(func, UniqueColumn)]
+    for values in rows:
+        values = list(values)
+        for index, column in unique:
+            values[index] = column.accept(values[index])
+        yield tuple(values)
+    merge_plan.log_unique_stats()
+
+def pool_seeded(attributes: List[Dict[str, Any]], base_seed: int) -> List[Dict[str, Any]]:
+    """Pin pooled columns to the job's base seed, so every shard samples from the same pool"""
+    return [
+        {**attr, "pool_seed": base_seed} if attr.get("pool") and "pool_seed" not in attr else attr
+        for attr in attributes
+    ]
+
+def shard_seed(base_seed: int, shard_index: int) -> int:
+    """Seed for one shard, derived from the job's base seed.
+
+    Hashed rather than added, so adjacent base seeds do not share shards (seed 43 would
+    otherwise repeat seed 42 one shard later).
+    """
+    digest = blake2b(f"{base_seed}:{shard_index}".encode('utf-8'), digest_size=8).digest()
+    return int.from_bytes(digest, "big")
+
+def split_shards(number_of_items: int, shard_size: int = DEFAULT_SHARD_SIZE) -> List[Tuple[int, int]]:
+    """Split a record count into (shard_index, count) pairs"""
+    if shard_size <= 0:
+        raise ValueError("Shard size must be greater than 0")
+    return [
+        (index, min(shard_size, number_of_items - start))
+        for index, start in enumerate(range(0, number_of_items, shard_size))
+    ]
+
+def shard_part_name(file_name: str, shard_index: int) -> str:
+    """File name (without extension) of the part written for one shard"""
+    return f"{file_name}-{shard_index + 1:05d}"
+
+# One FakerData per worker process, reseeded for every shard it generates
+_shard_faker_data: Optional[FakerData] = None
+
+def _generate_shard(attributes: List[Dict[str, str]], shard_index: int, count: int, base_seed: int,
+                    pool_cache_dir: Optional[Path] = None) -> List[Tuple[Any, ...]]:
+    """Generate one shard as value tuples, which are cheaper to send between processes than dicts"""
+    global _shard_faker_data
+    if _shard_faker_data is None:
+        _shard_faker_data = FakerData(pool_cache_dir=pool_cache_dir)
+    elif pool_cache_dir is not None:
+        _shard_faker_data.pool_cache_dir = Path(pool_cache_dir)
+    return _shard_faker_data.generate_shard(attributes, shard_index, count, base_seed)
+
+def _write_shard_part(attributes: List[Dict[str, str]], shard_index: int, count: int, base_seed: int,
+                      file_name: str, file_format: str, pool_cache_dir: Optional[Path] = None,
+                      compression: Optional[str] = None) -> Path:
+    """Generate one shard and write it to its own part file"""
+    from file_handler import FileHandler  # the writers import this module
+    names = [attr["name"] for attr in attributes]
+    rows = _generate_shard(attributes, shard_index, count, base_seed, pool_cache_dir)
+    records = (dict(zip(names, values)) for values in rows)
+    return FileHandler.write_stream(file_format, shard_part_name(file_name, shard_index), attributes, records,
+                                    compression)
+
+def _run_in_order(tasks: List[Tuple[Callable, tuple]], workers: Optional[int] = None) -> Iterator[Any]:
+    """Run (func, args) tasks in a process pool and yield their results in submission order.
+
+    At most two tasks per worker are in flight, so finished shards never pile up in memory
+    while the consumer is still writing earlier ones.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        for func, args in tasks:
+            yield func(*args)
+        return
+
+    from concurrent.futures import ProcessPoolExecutor
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        task_iter = iter(tasks)
+        pending = deque(executor.submit(func, *args) for func, args in islice(task_iter, workers * 2))
+        while pending:
+            result = pending.popleft().result()
+            next_task = next(task_iter, None)
+            if next_task is not None:
+                func, args = next_task
+                pending.append(executor.submit(func, *args))
+            yield result
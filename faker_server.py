@@ -0,0 +1,266 @@
+"""Asyncio HTTP server streaming generated records on demand, for load tests.
+
+POST a schema to /generate and the records come back as NDJSON or CSV with chunked
+transfer encoding while they are generated:
+
+    python -m faker_server --port 8080 --workers 4 --max-concurrent 8
+    curl -X POST localhost:8080/generate?format=csv \\
+         -d '{"columns": {"full_name": "name", "mail": "email"}, "rows": 100000, "seed": 42}'
+
+The body holds "columns" (the command line schema forms), "rows", and optionally "format"
+(jsonl or csv), "seed" and "locale" (a locale, or weights such as {"de_DE": 40, "fr_FR": 60});
+query parameters can set rows, format, seed and locale too. Chunks of chunk_size records
+are generated as seeded shards on a shared process pool, so a seed always gives the same
+response, identical to the command line with --shard-size chunk_size. Each response keeps
+at most PREFETCH_CHUNKS chunks in flight and waits for the socket to drain before asking
+for more, so a slow client slows its own generation instead of filling memory. Requests beyond max_concurrent get 503 with Retry-After. GET /health
+reports the active requests.
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import random
+import sys
+from collections import deque
+from pathlib import Path
+from typing import List, Dict, Any, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from faker_data import FakerData, pool_seeded, split_shards, with_locale, _generate_shard
+from file_handler import text_encoder
+from relational import column_attributes
+
+# Streamed formats and their content types
+CONTENT_TYPES = {"jsonl": "application/x-ndjson", "csv": "text/csv; charset=utf-8"}
+# Records per generated chunk, and per chunk of the HTTP response
+DEFAULT_SERVER_CHUNK = 1000
+# Chunks of one response being generated ahead of the client
+PREFETCH_CHUNKS = 2
+DEFAULT_MAX_CONCURRENT = 4
+DEFAULT_MAX_ROWS = 10000000
+# Largest accepted request line and headers, and request body
+MAX_HEADER_BYTES = 16 * 1024
+MAX_BODY_BYTES = 1 << 20
+
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 503: "Service Unavailable"}
+
+class RequestError(Exception):
+    """Client error answered with an HTTP status and a JSON error message"""
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+def _encode_chunk(attributes: List[Dict[str, Any]], index: int, count: int, seed: int, file_format: str,
+                  pool_cache_dir: Optional[Path] = None) -> bytes:
+    """Generate one chunk in a worker process and encode it; bytes are cheap to send back"""
+    names = [attr["name"] for attr in attributes]
+    records = [dict(zip(names, values)) for values in _generate_shard(attributes, index, count, seed, pool_cache_dir)]
+    return text_encoder(file_format, names).encode(records).encode('utf-8')
+
+def parse_request(body: bytes, query: Dict[str, List[str]], max_rows: int) -> Tuple[List[Dict[str, Any]], int, str, int]:
+    """Columns (with the request's locale), rows, format and seed of a /generate request"""
+    try:
+        spec = json.loads(body or b"{}")
+    except ValueError:
+        raise RequestError(400, "Body must be a JSON object")
+    if not isinstance(spec, dict):
+        raise RequestError(400, "Body must be a JSON object")
+    options = {**spec, **{name: values[-1] for name, values in query.items()}}
+    try:
+        attributes = with_locale(column_attributes(spec.get("columns")), options.get("locale"))
+        rows = int(options.get("rows", 0))
+        seed = int(options["seed"]) if options.get("seed") is not None else random.randrange(2 ** 32)
+    except (ValueError, TypeError) as e:
+        raise RequestError(400, str(e))
+    file_format = options.get("format", "jsonl")
+    if not attributes:
+        raise RequestError(400, "At least one column is required")
+    if not 0 < rows <= max_rows:
+        raise RequestError(400, f"rows must be between 1 and {max_rows}")
+    if file_format not in CONTENT_TYPES:
+        raise RequestError(400, f"format must be one of {', '.join(CONTENT_TYPES)}")
+    if any(attr.get("unique") for attr in attributes):
+        raise RequestError(400, "Unique columns need a merged output and cannot be streamed in chunks")
+    return attributes, rows, file_format, seed
+
+class FakerServer:
+    """HTTP/1.1 server streaming generated records; one request per connection"""
+    def __init__(self, host: str = "127.0.0.1", port: int = 8080, max_concurrent: int = DEFAULT_MAX_CONCURRENT,
+                 workers: Optional[int] = None, chunk_size: int = DEFAULT_SERVER_CHUNK,
+                 max_rows: int = DEFAULT_MAX_ROWS, pool_cache_dir: Optional[Path] = None):
+        if max_concurrent <= 0:
+            raise ValueError("Concurrent request limit must be greater than 0")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+        self.host = host
+        self.port = port
+        self.max_concurrent = max_concurrent
+        self.workers = workers
+        self.chunk_size = chunk_size
+        self.max_rows = max_rows
+        self.pool_cache_dir = pool_cache_dir
+        self.active = 0
+        self.served = 0
+        self._slots = None
+        self._executor = None
+        self._server = None
+
+    async def start(self) -> Tuple[str, int]:
+        """Start listening; returns the bound address (port 0 picks a free port)"""
+        from concurrent.futures import ProcessPoolExecutor
+        import multiprocessing
+        self._slots = asyncio.Semaphore(self.max_concurrent)
+        self.workers = self.workers or os.cpu_count() or 1
+        # Workers start lazily, while connections are open; forked ones would inherit the client
+        # sockets and keep them open after the server closes them, so they are spawned instead
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+        self._server = await asyncio.start_server(self.handle, self.host, self.port, limit=MAX_HEADER_BYTES)
+        self.host, self.port = self._server.sockets[0].getsockname()[:2]
+        logging.info(f"Serving fake data on http://{self.host}:{self.port} "
+                     f"({self.max_concurrent} concurrent requests, {self.workers} workers)")
+        return self.host, self.port
+
+    async def serve_forever(self) -> None:
+        async with self._server:
+            await self._server.serve_forever()
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+        if self._executor is not None:
+            self._executor.shutdown(wait=True, cancel_futures=True)
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Answer one request, then close the connection"""
+        try:
+            method, target, headers = await self._read_head(reader)
+            url = urlsplit(target)
+            if url.path == "/health":
+                await self._send_json(writer, 200, {"status": "ok", "active": self.active, "served": self.served,
+                                                    "max_concurrent": self.max_concurrent})
+            elif url.path != "/generate":
+                raise RequestError(404, f"No such endpoint: {url.path}")
+            elif method != "POST":
+                raise RequestError(405, "Use POST with a JSON schema")
+            else:
+                length = int(headers.get("content-length", 0))
+                if length > MAX_BODY_BYTES:
+                    raise RequestError(413, "Schema is too large")
+                body = await reader.readexactly(length)
+                request = parse_request(body, parse_qs(url.query), self.max_rows)
+                if self._slots.locked():
+                    await self._send_json(writer, 503, {"error": "Too many concurrent requests"},
+                                          {"Retry-After": "1"})
+                else:
+                    async with self._slots:
+                        await self._stream(writer, *request)
+        except RequestError as e:
+            await self._send_json(writer, e.status, {"error": str(e)})
+        except (asyncio.IncompleteReadError, asyncio.LimitOverrunError, ValueError) as e:
+            await self._send_json(writer, 400, {"error": f"Malformed request: {str(e)}"})
+        except ConnectionError:
+            logging.info("Client went away; request stopped")
+        except Exception as e:
+            logging.error(f"Error serving request: {str(e)}")
+        finally:
+            writer.close()
+
+    async def _read_head(self, reader: asyncio.StreamReader) -> Tuple[str, str, Dict[str, str]]:
+        head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1')
+        request_line, *header_lines = head.rstrip("\r\n").split("\r\n")
+        method, target, _ = request_line.split(" ", 2)
+        headers = {}
+        for line in header_lines:
+            name, _, value = line.partition(":")
+            headers[name.strip().lower()] = value.strip()
+        return method, target, headers
+
+    async def _send_json(self, writer: asyncio.StreamWriter, status: int, payload: Dict[str, Any],
+                         headers: Optional[Dict[str, str]] = None) -> None:
+        body = json.dumps(payload).encode('utf-8')
+        writer.write(self._head(status, {"Content-Type": "application/json", "Content-Length": str(len(body)),
+                                         **(headers or {})}) + body)
+        await writer.drain()
+
+    def _head(self, status: int, headers: Dict[str, str]) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS[status]}", "Connection: close"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        return ("\r\n".join(lines) + "\r\n\r\n").encode('latin-1')
+
+    async def _stream(self, writer: asyncio.StreamWriter, attributes: List[Dict[str, Any]], rows: int,
+                      file_format: str, seed: int) -> None:
+        """Send the records as HTTP chunks, generating at most PREFETCH_CHUNKS ahead of the socket"""
+        loop = asyncio.get_running_loop()
+        attributes = pool_seeded(attributes, seed)
+        # Validate the columns, and build any value pools once, off the event loop
+        try:
+            await loop.run_in_executor(None, FakerData(pool_cache_dir=self.pool_cache_dir).compile_plan, attributes)
+        except ValueError as e:
+            raise RequestError(400, str(e))
+
+        self.active += 1
+        pending = deque()
+        try:
+            writer.write(self._head(200, {"Content-Type": CONTENT_TYPES[file_format], "Transfer-Encoding": "chunked",
+                                          "X-Faker-Seed": str(seed)}))
+            header = text_encoder(file_format, [attr["name"] for attr in attributes]).start().encode('utf-8')
+            if header:
+                writer.write(b"%X\r\n%s\r\n" % (len(header), header))
+            chunks = iter(split_shards(rows, self.chunk_size))
+            for index, count in chunks:
+                pending.append(loop.run_in_executor(self._executor, _encode_chunk, attributes, index, count, seed,
+                                                    file_format, self.pool_cache_dir))
+                if len(pending) < PREFETCH_CHUNKS:
+                    continue
+                await self._send_chunk(writer, await pending.popleft())
+            while pending:
+                await self._send_chunk(writer, await pending.popleft())
+            writer.write(b"0\r\n\r\n")
+            await writer.drain()
+            self.served += 1
+            logging.info(f"Streamed {rows} {file_format} records with seed {seed}")
+        finally:
+            for future in pending:
+                future.cancel()
+            self.active -= 1
+
+    async def _send_chunk(self, writer: asyncio.StreamWriter, data: bytes) -> None:
+        writer.write(b"%X\r\n%s\r\n" % (len(data), data))
+        # Backpressure: wait until the client has taken the data before generating further ahead
+        await writer.drain()
+
+async def serve(server: FakerServer) -> None:
+    await server.start()
+    try:
+        await server.serve_forever()
+    finally:
+        await server.close()
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="faker_server", description="Stream fake data over HTTP.")
+    parser.add_argument("--host", default="127.0.0.1", help="address to listen on")
+    parser.add_argument("--port", type=int, default=8080)
+    parser.add_argument("--max-concurrent", type=int, default=DEFAULT_MAX_CONCURRENT,
+                        help="requests streamed at once; more get 503")
+    parser.add_argument("-w", "--workers", type=int, help="generation processes (default: one per CPU)")
+    parser.add_argument("--chunk-size", type=int, default=DEFAULT_SERVER_CHUNK, help="records per generated chunk")
+    parser.add_argument("--max-rows", type=int, default=DEFAULT_MAX_ROWS, help="largest request")
+    args = parser.parse_args(argv)
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s', stream=sys.stderr)
+
+    try:
+        asyncio.run(serve(FakerServer(args.host, args.port, args.max_concurrent, args.workers, args.chunk_size,
+                                      args.max_rows)))
+    except KeyboardInterrupt:
+        pass
+    except Exception as e:
+        logging.error(f"faker_server failed: {str(e)}")
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
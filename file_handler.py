@@ -0,0 +1,374 @@
+"""Output writers for generated records: CSV, JSON, JSON Lines, Parquet and Arrow IPC."""
+import csv
+import io
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+from itertools import islice
+from collections.abc import Mapping
+from decimal import Decimal
+from datetime import date, datetime, time
+from importlib.util import find_spec
+import logging
+import sys
+
+from faker_data import RecordTable, value_kind
+from profiling import ACTIVE_PROFILE
+from compression import check_compression, compressed_path, open_compressed, split_compression_suffix
+
+try:
+    import orjson
+except ImportError:  # Faster JSON encoding is optional
+    orjson = None
+
+# pyarrow is optional and slow to import, so it is only imported by the Arrow writers
+PYARROW_AVAILABLE = find_spec("pyarrow") is not None
+
+# Number of records buffered between the generator and the file writers
+DEFAULT_CHUNK_SIZE = 10000
+# Rows per Parquet row group (and per Arrow IPC record batch)
+DEFAULT_ROW_GROUP_SIZE = 100000
+
+def iter_chunks(rows: Iterable[Any], chunk_size: int = DEFAULT_CHUNK_SIZE) -> Iterator[List[Any]]:
+    """Split an iterable of records into lists of at most chunk_size items"""
+    if chunk_size <= 0:
+        raise ValueError("Chunk size must be greater than 0")
+    rows = iter(rows)
+    while True:
+        chunk = list(islice(rows, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def json_default(value: Any) -> Any:
+    """Encode the non-JSON values some Faker providers return (Decimal, date), and compact records"""
+    if isinstance(value, RecordTable):
+        return value.to_dicts()
+    if isinstance(value, Mapping):
+        return dict(value)
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (date, datetime, time)):
+        return value.isoformat()
+    # Values can only be numpy scalars if something already imported numpy
+    np = sys.modules.get("numpy")
+    if np is not None and isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+def json_encoder(compact: bool = True, backend: Optional[str] = None) -> Callable[[Any], str]:
+    """Return a function encoding one record as JSON text.
+
+    backend is "json" (standard library) or "orjson"; by default orjson is used for
+    compact output when it is installed. Indented output always uses the standard library.
+    """
+    if backend is None:
+        backend = "orjson" if compact and orjson is not None else "json"
+    if backend == "orjson":
+        if orjson is None:
+            raise ImportError("orjson is not installed")
+        if not compact:
+            raise ValueError("The orjson backend only supports compact output")
+        return lambda record: orjson.dumps(record, default=json_default, option=orjson.OPT_SERIALIZE_NUMPY).decode('utf-8')
+    if backend != "json":
+        raise ValueError(f"Unknown JSON backend: {backend}")
+    if compact:
+        return json.JSONEncoder(ensure_ascii=False, separators=(',', ':'), default=json_default).encode
+    return json.JSONEncoder(indent=4, ensure_ascii=False, default=json_default).encode
+
+def open_output(output_path: Path, mode: str = 'w', compression: Optional[str] = None, **kwargs):
+    """Open an output file for a streaming writer, compressed if asked, and timed when a profile is active"""
+    if compression is None:
+        f = open(output_path, mode, **kwargs)
+    elif 'b' in mode:
+        f = open_compressed(output_path, compression)
+    else:
+        f = io.TextIOWrapper(open_compressed(output_path, compression), **kwargs)
+    profile = ACTIVE_PROFILE.get()
+    return f if profile is None else profile.wrap_file(f)
+
+class CsvEncoder:
+    """Incremental CSV text: the header, then the rows of each chunk"""
+    def __init__(self, header: List[str]):
+        self._buffer = io.StringIO()
+        self._writer = csv.DictWriter(self._buffer, fieldnames=header)
+
+    def _take(self) -> str:
+        text = self._buffer.getvalue()
+        self._buffer.seek(0)
+        self._buffer.truncate()
+        return text
+
+    def start(self) -> str:
+        self._writer.writeheader()
+        return self._take()
+
+    def encode(self, chunk: List[Dict[str, Any]]) -> str:
+        self._writer.writerows(chunk)
+        return self._take()
+
+    def finish(self) -> str:
+        return ""
+
+class JsonEncoder:
+    """Incremental JSON array text, laid out like json.dump (or compact)"""
+    def __init__(self, compact: bool = False, backend: Optional[str] = None):
+        self.compact = compact
+        self._encode = json_encoder(compact, backend)
+        # Indented records sit one level deep in the array, as json.dump lays out list items
+        self._separator, self._opening, self._closing = (",", "[", "]") if compact else (",\n    ", "[\n    ", "\n]")
+        self._empty = True
+
+    def start(self) -> str:
+        return ""
+
+    def encode(self, chunk: List[Dict[str, Any]]) -> str:
+        if self.compact:
+            encoded = self._separator.join(self._encode(record) for record in chunk)
+        else:
+            encoded = self._separator.join(self._encode(record).replace("\n", "\n    ") for record in chunk)
+        prefix = self._opening if self._empty else self._separator
+        self._empty = False
+        return prefix + encoded
+
+    def finish(self) -> str:
+        return "[]" if self._empty else self._closing
+
+class JsonLinesEncoder:
+    """Incremental JSON Lines text: one compact record per line"""
+    def __init__(self, backend: Optional[str] = None):
+        self._encode = json_encoder(True, backend)
+
+    def start(self) -> str:
+        return ""
+
+    def encode(self, chunk: List[Dict[str, Any]]) -> str:
+        return "".join(self._encode(record) + "\n" for record in chunk)
+
+    def finish(self) -> str:
+        return ""
+
+def text_encoder(file_format: str, header: List[str]):
+    """Encoder of a text format, turning chunks of records into the file's text"""
+    if file_format == "csv":
+        return CsvEncoder(header)
+    if file_format == "json":
+        return JsonEncoder()
+    if file_format == "jsonl":
+        return JsonLinesEncoder()
+    raise ValueError(f"{file_format} is not a text format")
+
+def write_encoded(f, encoder, rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE) -> None:
+    """Write records through an encoder, one write per chunk"""
+    pending = encoder.start()
+    for chunk in iter_chunks(rows, chunk_size):
+        f.write(pending + encoder.encode(chunk))
+        pending = ""
+    pending += encoder.finish()
+    if pending:  # e.g. the header of an empty CSV file
+        f.write(pending)
+
+class FileHandler:
+    """Class to handle file operations"""
+    @staticmethod
+    def write_csv(file_name: str, header: List[str], data: List[Dict[str, Any]]) -> None:
+        """Write data to CSV file"""
+        try:
+            output_path = Path(file_name).with_suffix('.csv')
+            with open(output_path, 'w', newline='', encoding='utf-8') as f:
+                writer = csv.DictWriter(f, fieldnames=header)
+                writer.writeheader()
+                writer.writerows(data)
+            logging.info(f"Successfully wrote CSV file: {output_path}")
+        except Exception as e:
+            logging.error(f"Error writing CSV file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_json(file_name: str, data: List[Dict[str, Any]]) -> None:
+        """Write data to JSON file"""
+        try:
+            output_path = Path(file_name).with_suffix('.json')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f, indent=4, ensure_ascii=False, default=json_default)
+            logging.info(f"Successfully wrote JSON file: {output_path}")
+        except Exception as e:
+            logging.error(f"Error writing JSON file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_csv_stream(file_name: str, header: List[str], rows: Iterable[Dict[str, Any]],
+                         chunk_size: int = DEFAULT_CHUNK_SIZE, compression: Optional[str] = None) -> Path:
+        """Write records to a CSV file chunk by chunk, without holding them all in memory"""
+        try:
+            output_path = compressed_path(Path(file_name).with_suffix('.csv'), compression)
+            with open_output(output_path, 'w', compression, newline='', encoding='utf-8') as f:
+                write_encoded(f, CsvEncoder(header), rows, chunk_size)
+            logging.info(f"Successfully wrote CSV file: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing CSV file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_json_stream(file_name: str, rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                          compact: bool = False, backend: Optional[str] = None,
+                          compression: Optional[str] = None) -> Path:
+        """Write records to a JSON array file chunk by chunk.
+
+        The default layout matches write_json; compact=True drops the indentation and
+        whitespace, like json.dumps(data, separators=(',', ':')).
+        """
+        try:
+            output_path = compressed_path(Path(file_name).with_suffix('.json'), compression)
+            with open_output(output_path, 'w', compression, encoding='utf-8') as f:
+                write_encoded(f, JsonEncoder(compact, backend), rows, chunk_size)
+            logging.info(f"Successfully wrote JSON file: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing JSON file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_jsonl_stream(file_name: str, rows: Iterable[Dict[str, Any]], chunk_size: int = DEFAULT_CHUNK_SIZE,
+                           backend: Optional[str] = None, compression: Optional[str] = None) -> Path:
+        """Write records to a JSON Lines file: one compact record per line, readable incrementally"""
+        try:
+            output_path = compressed_path(Path(file_name).with_suffix('.jsonl'), compression)
+            with open_output(output_path, 'w', compression, encoding='utf-8') as f:
+                write_encoded(f, JsonLinesEncoder(backend), rows, chunk_size)
+            logging.info(f"Successfully wrote JSON Lines file: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing JSON Lines file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_parquet_stream(file_name: str, attributes: List[Dict[str, str]], rows: Iterable[Dict[str, Any]],
+                             row_group_size: int = DEFAULT_ROW_GROUP_SIZE, compression: str = "snappy") -> Path:
+        """Write records to a Parquet file, one row group per row_group_size records"""
+        FileHandler.check_format("parquet")
+        try:
+            output_path = Path(file_name).with_suffix('.parquet')
+            schema = arrow_schema(attributes)
+            import pyarrow.parquet as pq
+            profile = ACTIVE_PROFILE.get()
+            with pq.ParquetWriter(output_path, schema, compression=compression) as writer:
+                write_table = writer.write_table if profile is None else profile.timed_flush(writer.write_table)
+                for chunk in iter_chunks(rows, row_group_size):
+                    write_table(arrow_table(attributes, schema, chunk), row_group_size=row_group_size)
+            if profile is not None:
+                profile.record_output(output_path)
+            logging.info(f"Successfully wrote Parquet file: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing Parquet file: {str(e)}")
+            raise
+
+    @staticmethod
+    def write_feather_stream(file_name: str, attributes: List[Dict[str, str]], rows: Iterable[Dict[str, Any]],
+                             batch_size: int = DEFAULT_ROW_GROUP_SIZE, compression: Optional[str] = "lz4") -> Path:
+        """Write records to an Arrow IPC (Feather v2) file, one record batch per batch_size records"""
+        FileHandler.check_format("feather")
+        try:
+            output_path = Path(file_name).with_suffix('.feather')
+            schema = arrow_schema(attributes)
+            import pyarrow as pa
+            options = pa.ipc.IpcWriteOptions(compression=compression)
+            profile = ACTIVE_PROFILE.get()
+            with pa.OSFile(str(output_path), 'wb') as sink, pa.ipc.new_file(sink, schema, options=options) as writer:
+                write_table = writer.write_table if profile is None else profile.timed_flush(writer.write_table)
+                for chunk in iter_chunks(rows, batch_size):
+                    write_table(arrow_table(attributes, schema, chunk))
+            if profile is not None:
+                profile.record_output(output_path)
+            logging.info(f"Successfully wrote Feather file: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing Feather file: {str(e)}")
+            raise
+
+    @staticmethod
+    def check_format(file_format: str) -> None:
+        """Raise if a file format is unknown or its optional dependency is missing"""
+        if file_format not in FILE_FORMATS:
+            raise ValueError(f"Unsupported file format: {file_format}")
+        if file_format in ARROW_FORMATS and not PYARROW_AVAILABLE:
+            raise ImportError(f"pyarrow is required for {FILE_FORMATS[file_format]} output")
+
+    @staticmethod
+    def check_compression(file_format: str, compression: Optional[str]) -> None:
+        """Raise if a compression is unavailable or does not apply to a file format"""
+        check_compression(compression)
+        if compression is not None and file_format in ARROW_FORMATS:
+            raise ValueError(f"{FILE_FORMATS[file_format]} files are compressed internally; "
+                             f"{compression} only applies to text formats")
+
+    @staticmethod
+    def output_path(file_format: str, file_name: str, compression: Optional[str] = None) -> Path:
+        """Path write_stream writes to for a format, file name and compression"""
+        file_name, suffix_compression = split_compression_suffix(file_name)
+        return compressed_path(Path(file_name).with_suffix(f".{file_format}"), compression or suffix_compression)
+
+    @staticmethod
+    def write_stream(file_format: str, file_name: str, attributes: List[Dict[str, str]],
+                     rows: Iterable[Dict[str, Any]], compression: Optional[str] = None) -> Path:
+        """Stream records to a file in any supported format.
+
+        compression is "gzip" or "zstd" for the text formats; a file name ending in .gz or
+        .zst selects it too.
+        """
+        FileHandler.check_format(file_format)
+        file_name, suffix_compression = split_compression_suffix(file_name)
+        compression = compression or suffix_compression
+        FileHandler.check_compression(file_format, compression)
+        if file_format == "csv":
+            return FileHandler.write_csv_stream(file_name, [attr["name"] for attr in attributes], rows,
+                                                compression=compression)
+        if file_format == "json":
+            return FileHandler.write_json_stream(file_name, rows, compression=compression)
+        if file_format == "jsonl":
+            return FileHandler.write_jsonl_stream(file_name, rows, compression=compression)
+        if file_format == "parquet":
+            return FileHandler.write_parquet_stream(file_name, attributes, rows)
+        return FileHandler.write_feather_stream(file_name, attributes, rows)
+
+# Output formats by file extension, with the label shown in the GUI
+FILE_FORMATS = {"csv": "CSV", "json": "JSON", "jsonl": "JSON Lines", "parquet": "Parquet", "feather": "Feather"}
+ARROW_FORMATS = {"parquet", "feather"}
+
+def format_available(file_format: str) -> bool:
+    """Whether the optional dependencies for a file format are installed"""
+    return file_format in FILE_FORMATS and (file_format not in ARROW_FORMATS or PYARROW_AVAILABLE)
+
+def _to_date(value: Any) -> Optional[date]:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value))
+
+def _to_float(value: Any) -> Optional[float]:
+    return None if value is None else float(value)
+
+# Value conversions Arrow needs before building typed columns (Faker returns date strings and Decimals)
+_ARROW_CONVERTERS = {"float": _to_float, "date": _to_date}
+
+def _arrow_type(kind: str):
+    import pyarrow as pa
+    return {"bool": pa.bool_(), "int": pa.int64(), "float": pa.float64(), "date": pa.date32()}.get(kind, pa.string())
+
+def arrow_schema(attributes: List[Dict[str, str]]):
+    """Typed Arrow schema for a list of attributes"""
+    import pyarrow as pa
+    return pa.schema([(attr["name"], _arrow_type(value_kind(attr))) for attr in attributes])
+
+def arrow_table(attributes: List[Dict[str, str]], schema, records: List[Dict[str, Any]]):
+    """Build an Arrow table from a chunk of records, converting values to the column types"""
+    import pyarrow as pa
+    arrays = []
+    for attr, field in zip(attributes, schema):
+        values = [record[attr["name"]] for record in records]
+        convert = _ARROW_CONVERTERS.get(value_kind(attr))
+        if convert is not None:
+            values = [convert(value) for value in values]
+        arrays.append(pa.array(values, type=field.type))
+    return pa.Table.from_arrays(arrays, schema=schema)
@@ -0,0 +1,199 @@
+"""Resumable generation jobs, checkpointed after every shard.
+
+A job writes one part file per shard (users-00001.csv, ...). Each shard is generated from
+its own seed, shard_seed(seed, index), so a part only depends on the job's settings and can
+be generated again, or skipped, independently of the others. After each part is renamed
+into place, the checkpoint (users.checkpoint.json) is rewritten. It holds the job's
+settings, the rows done, and each completed shard with its seed, row count, size and
+checksum. A restarted job reads the checkpoint and only generates the shards that are
+missing, so the parts are identical to those of an uninterrupted run. When every shard is
+done, the job writes users.manifest.json (see rollover.py) and removes the checkpoint.
+
+    job = GenerationJob.open("users", attributes, 10000000, seed=42)
+    parts = job.run(workers=4)
+
+Date and time providers pick values up to "now", so only resume those jobs on the same day.
+"""
+import json
+import logging
+import random
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Optional
+
+from faker_data import (FakerData, DEFAULT_SHARD_SIZE, pool_seeded, shard_part_name, shard_seed, split_shards,
+                        _run_in_order, _write_shard_part)
+from file_handler import FileHandler
+from rollover import part_entry, file_sha256, write_json_atomic, write_manifest, manifest_path
+from profiling import ACTIVE_PROFILE
+from compression import split_compression_suffix
+
+CHECKPOINT_SUFFIX = ".checkpoint.json"
+# Version 2: shard seeds are hashed from the base seed (see shard_seed), so older parts do not match
+CHECKPOINT_VERSION = 2
+
+def checkpoint_path(file_name: str) -> Path:
+    """Checkpoint of the job writing a file name, e.g. users -> users.checkpoint.json"""
+    return Path(file_name + CHECKPOINT_SUFFIX)
+
+class JobStopped(Exception):
+    """Raised by GenerationJob.run when should_stop asks it to stop; the checkpoint is kept"""
+
+class GenerationJob:
+    """A generation run written as shard parts, which can be stopped and resumed"""
+    def __init__(self, file_name: str, attributes: List[Dict[str, Any]], number_of_items: int,
+                 file_format: str = "csv", seed: Optional[int] = None, shard_size: int = DEFAULT_SHARD_SIZE,
+                 compression: Optional[str] = None, pool_cache_dir: Optional[Path] = None):
+        file_name, suffix_compression = split_compression_suffix(file_name)
+        compression = compression or suffix_compression
+        FileHandler.check_format(file_format)
+        FileHandler.check_compression(file_format, compression)
+        if number_of_items <= 0:
+            raise ValueError("Number of records must be greater than 0")
+        if any(attr.get("unique") for attr in attributes):
+            raise ValueError("Unique columns need a single merged output; job parts are generated independently")
+        if Path(file_name).suffix == f".{file_format}":
+            file_name = str(Path(file_name).with_suffix(''))
+        self.file_name = file_name
+        self.attributes = attributes
+        self.number_of_items = number_of_items
+        self.file_format = file_format
+        self.seed = seed if seed is not None else random.randrange(2 ** 32)
+        self.shard_size = shard_size
+        self.compression = compression
+        self.pool_cache_dir = pool_cache_dir
+        self.shards = split_shards(number_of_items, shard_size)
+        self.checkpoint_path = checkpoint_path(file_name)
+        self.manifest_path = manifest_path(file_name)
+        # Shard index -> checkpoint entry of its finished part
+        self.completed = {}
+
+    @property
+    def settings(self) -> Dict[str, Any]:
+        """Everything the output depends on; a checkpoint only resumes a job with the same settings"""
+        return {
+            "file_name": self.file_name,
+            "attributes": self.attributes,
+            "rows": self.number_of_items,
+            "format": self.file_format,
+            "seed": self.seed,
+            "shard_size": self.shard_size,
+            "compression": self.compression,
+        }
+
+    @property
+    def rows_done(self) -> int:
+        return sum(entry["rows"] for entry in self.completed.values())
+
+    @classmethod
+    def resume(cls, file_name: str, pool_cache_dir: Optional[Path] = None) -> "GenerationJob":
+        """Job from the checkpoint left by an interrupted run"""
+        with open(checkpoint_path(split_compression_suffix(file_name)[0]), 'r', encoding='utf-8') as f:
+            checkpoint = json.load(f)
+        if checkpoint.get("version") != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version: {checkpoint.get('version')}")
+        settings = checkpoint["job"]
+        job = cls(settings["file_name"], settings["attributes"], settings["rows"], settings["format"],
+                  settings["seed"], settings["shard_size"], settings["compression"], pool_cache_dir)
+        job.completed = {entry["index"]: entry for entry in checkpoint["shards"] if job._part_intact(entry)}
+        logging.info(f"Resuming job {job.file_name}: {len(job.completed)} of {len(job.shards)} shards done, "
+                     f"{job.rows_done} rows")
+        return job
+
+    @classmethod
+    def open(cls, file_name: str, attributes: List[Dict[str, Any]], number_of_items: int, file_format: str = "csv",
+             seed: Optional[int] = None, shard_size: int = DEFAULT_SHARD_SIZE, compression: Optional[str] = None,
+             pool_cache_dir: Optional[Path] = None) -> "GenerationJob":
+        """Resume the checkpointed job for file_name if there is one, otherwise start a new job.
+
+        A seed of None accepts the checkpoint's seed; a checkpoint with other settings raises ValueError.
+        """
+        job = cls(file_name, attributes, number_of_items, file_format, seed, shard_size, compression, pool_cache_dir)
+        if not job.checkpoint_path.exists():
+            return job
+        resumed = cls.resume(job.file_name, pool_cache_dir)
+        expected = {**job.settings, "seed": resumed.seed if seed is None else seed}
+        if json.loads(json.dumps(expected)) != resumed.settings:
+            raise ValueError(f"{job.checkpoint_path} belongs to a job with different settings; "
+                             f"remove it to start over")
+        return resumed
+
+    def _part_path(self, index: int) -> Path:
+        return FileHandler.output_path(self.file_format, shard_part_name(self.file_name, index), self.compression)
+
+    def _part_intact(self, entry: Dict[str, Any]) -> bool:
+        """Whether a checkpointed part is still on disk as it was written (same size and SHA-256);
+        damaged parts are generated again"""
+        path = self._part_path(entry["index"])
+        # The size is checked first, so most damaged parts are found without reading them
+        intact = path.exists() and path.stat().st_size == entry["bytes"] and file_sha256(path) == entry["sha256"]
+        if not intact:
+            logging.warning(f"Part {path} is missing or changed since the checkpoint; it will be generated again")
+        return intact
+
+    def _write_checkpoint(self) -> None:
+        write_json_atomic(self.checkpoint_path, {
+            "version": CHECKPOINT_VERSION,
+            "job": self.settings,
+            "rows_done": self.rows_done,
+            "shards": [self.completed[index] for index in sorted(self.completed)],
+        })
+
+    def run(self, workers: Optional[int] = 1, progress: Optional[Callable[[int, int], None]] = None,
+            should_stop: Optional[Callable[[], bool]] = None) -> List[Path]:
+        """Generate the missing shards, checkpointing after each; returns every part path in order.
+
+        progress(rows_done, total_rows) is called after each shard. When should_stop() returns
+        True between shards the job raises JobStopped, keeping its checkpoint for a later resume.
+        """
+        attributes = pool_seeded(self.attributes, self.seed)
+        FakerData(pool_cache_dir=self.pool_cache_dir).compile_plan(attributes)  # validate, and build pools once
+        remaining = [(index, count) for index, count in self.shards if index not in self.completed]
+        # Workers write hidden parts; they are renamed into place here, just before the checkpoint records them
+        hidden_name = str(Path(self.file_name).with_name("." + Path(self.file_name).name))
+        tasks = [
+            (_write_shard_part, (attributes, index, count, self.seed, hidden_name, self.file_format,
+                                 self.pool_cache_dir, self.compression))
+            for index, count in remaining
+        ]
+        profile = ACTIVE_PROFILE.get()
+        try:
+            results = _run_in_order(tasks, workers)
+            try:
+                for (index, count), temp_path in zip(remaining, results):
+                    path = self._part_path(index)
+                    temp_path.replace(path)
+                    self.completed[index] = {"index": index, "seed": shard_seed(self.seed, index),
+                                             **part_entry(path, count)}
+                    self._write_checkpoint()
+                    if profile is not None:
+                        profile.add_rows(count)
+                    if progress is not None:
+                        progress(self.rows_done, self.number_of_items)
+                    if should_stop is not None and should_stop() and len(self.completed) < len(self.shards):
+                        raise JobStopped(f"Job stopped after {self.rows_done} of {self.number_of_items} rows; "
+                                         f"resume from {self.checkpoint_path}")
+            finally:
+                results.close()
+        except Exception as e:
+            # Shards still in flight when the job stopped leave hidden parts behind
+            for index, _ in remaining:
+                if index not in self.completed:
+                    hidden_part = FileHandler.output_path(self.file_format, shard_part_name(hidden_name, index),
+                                                          self.compression)
+                    hidden_part.unlink(missing_ok=True)
+            if isinstance(e, JobStopped):
+                logging.info(str(e))
+            else:
+                logging.error(f"Error in generation job {self.file_name}: {str(e)}")
+            raise
+
+        parts = [self._part_path(index) for index, _ in self.shards]
+        entries = [{key: value for key, value in self.completed[index].items() if key != "index"}
+                   for index, _ in self.shards]
+        write_manifest(self.manifest_path, self.file_format, self.compression,
+                       [attr["name"] for attr in self.attributes], entries,
+                       seed=self.seed, shard_size=self.shard_size)
+        self.checkpoint_path.unlink(missing_ok=True)
+        logging.info(f"Job {self.file_name} finished: {self.number_of_items} rows in {len(parts)} part(s), "
+                     f"manifest {self.manifest_path}")
+        return parts
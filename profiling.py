@@ -0,0 +1,202 @@
+"""Optional instrumentation of a generation run: time per column, per stage and per write.
+
+A GenerationProfile splits a run into generation (time spent producing records, broken
+down by column), writing (time inside the output file's write calls, or Arrow's
+write_table) and serialization (the rest of the writer's time). Usage:
+
+    profile = GenerationProfile()
+    plan = profile.instrument(faker_data.compile_plan(attributes))
+    with profile.activate():
+        FileHandler.write_stream("csv", "users", attributes, profile.track_rows(plan.iter_records(n)))
+    profile.log_summary()
+    profile.export_json("profile.json")
+
+Writers find the active profile through ACTIVE_PROFILE, a context variable, so a profile
+activated on a worker thread only sees that thread's writes.
+"""
+import cProfile
+import json
+import logging
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterable, Iterator, Optional
+
+ACTIVE_PROFILE: ContextVar[Optional["GenerationProfile"]] = ContextVar("active_profile", default=None)
+
+class TimedColumn:
+    """Column generator wrapper adding its call time to a profile"""
+    __slots__ = ("wrapped", "stats")
+
+    def __init__(self, wrapped: Callable[[], Any], stats: Dict[str, Any]):
+        self.wrapped = wrapped
+        self.stats = stats
+
+    def __call__(self) -> Any:
+        start = time.perf_counter()
+        value = self.wrapped()
+        self.stats["seconds"] += time.perf_counter() - start
+        self.stats["calls"] += 1
+        return value
+
+class TimedFile:
+    """Output file wrapper timing every write call; the file size is recorded on close"""
+    def __init__(self, file, profile: "GenerationProfile"):
+        self._file = file
+        self._profile = profile
+
+    def write(self, data) -> int:
+        start = time.perf_counter()
+        written = self._file.write(data)
+        self._profile.record_flush(time.perf_counter() - start)
+        return written
+
+    def close(self) -> None:
+        self._file.close()
+        self._profile.record_output(self._file.name)
+
+    def __enter__(self) -> "TimedFile":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        self.close()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._file, name)
+
+class GenerationProfile:
+    """Timings of one generation run"""
+    def __init__(self):
+        # Column name -> {"name", "type", "seconds", "calls"}
+        self.columns = {}
+        self.rows = 0
+        self.generation_seconds = 0.0
+        self.write_seconds = 0.0
+        self.flushes = 0
+        self.bytes_written = 0
+        # Stats of each compressed output, see compression.CompressedWriter.stats
+        self.compression = []
+        self._start = None
+        self._end = None
+
+    def instrument(self, plan):
+        """Copy of a record plan whose column generators are timed"""
+        from faker_data import RecordPlan
+        generators = []
+        for name, type_name, func in zip(plan.names, plan.types or [None] * len(plan.names), plan.generators):
+            stats = self.columns.setdefault(name, {"name": name, "type": type_name, "seconds": 0.0, "calls": 0})
+            generators.append(TimedColumn(func, stats))
+        return RecordPlan(plan.names, generators, plan.types)
+
+    def track_rows(self, rows: Iterable[Any]) -> Iterator[Any]:
+        """Pass records through, timing how long each one takes to produce"""
+        rows = iter(rows)
+        while True:
+            start = time.perf_counter()
+            try:
+                record = next(rows)
+            except StopIteration:
+                self.generation_seconds += time.perf_counter() - start
+                return
+            self.generation_seconds += time.perf_counter() - start
+            self.rows += 1
+            yield record
+
+    def add_rows(self, count: int) -> None:
+        """Count rows produced without track_rows, e.g. shard parts generated and written by workers"""
+        self.rows += count
+
+    @contextmanager
+    def activate(self):
+        """Make this the profile the writers report to; the block's duration is the run's wall time"""
+        token = ACTIVE_PROFILE.set(self)
+        self._start = time.perf_counter()
+        try:
+            yield self
+        finally:
+            self._end = time.perf_counter()
+            ACTIVE_PROFILE.reset(token)
+
+    def wrap_file(self, file) -> TimedFile:
+        return TimedFile(file, self)
+
+    def timed_flush(self, write: Callable[..., Any]) -> Callable[..., Any]:
+        """Wrap a writer's flush function (e.g. Arrow's write_table) so its calls count as writes"""
+        def timed(*args, **kwargs):
+            start = time.perf_counter()
+            result = write(*args, **kwargs)
+            self.record_flush(time.perf_counter() - start)
+            return result
+        return timed
+
+    def record_flush(self, seconds: float) -> None:
+        self.write_seconds += seconds
+        self.flushes += 1
+
+    def record_compression(self, stats: Dict[str, Any]) -> None:
+        self.compression.append(stats)
+
+    def record_output(self, path: str) -> None:
+        self.bytes_written += Path(path).stat().st_size
+
+    @property
+    def wall_seconds(self) -> float:
+        if self._start is None:
+            return 0.0
+        return (self._end or time.perf_counter()) - self._start
+
+    def slowest_columns(self, count: Optional[int] = None) -> List[Dict[str, Any]]:
+        """Columns by total generation time, slowest first, with their share of all column time"""
+        total = sum(stats["seconds"] for stats in self.columns.values()) or 1.0
+        ranked = sorted(self.columns.values(), key=lambda stats: stats["seconds"], reverse=True)
+        return [
+            {**stats, "seconds": round(stats["seconds"], 6), "share": round(stats["seconds"] / total, 4)}
+            for stats in ranked[:count]
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        wall = self.wall_seconds
+        return {
+            "rows": self.rows,
+            "wall_seconds": round(wall, 6),
+            "rows_per_sec": round(self.rows / wall, 1) if wall else None,
+            "stages": {
+                "generation_seconds": round(self.generation_seconds, 6),
+                "serialization_seconds": round(max(wall - self.generation_seconds - self.write_seconds, 0.0), 6),
+                "write_seconds": round(self.write_seconds, 6),
+            },
+            "writes": {"flushes": self.flushes, "bytes": self.bytes_written},
+            "compression": self.compression,
+            "columns": self.slowest_columns(),
+        }
+
+    def log_summary(self, count: int = 5) -> None:
+        summary = self.summary()
+        stages = summary["stages"]
+        logging.info(
+            f"Profile: {summary['rows']} rows in {summary['wall_seconds']:.2f}s "
+            f"({summary['rows_per_sec'] or 0:,.0f} rows/sec); generation {stages['generation_seconds']:.2f}s, "
+            f"serialization {stages['serialization_seconds']:.2f}s, writes {stages['write_seconds']:.2f}s "
+            f"in {summary['writes']['flushes']} flushes, {summary['writes']['bytes']} bytes"
+        )
+        for stats in self.slowest_columns(count):
+            logging.info(f"Profile: column {stats['name']} ({stats['type']}) {stats['seconds']:.3f}s, "
+                         f"{stats['share']:.0%} of column time")
+
+    def export_json(self, path: str) -> Path:
+        output_path = Path(path)
+        output_path.write_text(json.dumps(self.summary(), indent=2), encoding='utf-8')
+        return output_path
+
+@contextmanager
+def cprofile_to(path: str):
+    """Run the block under cProfile and dump the stats to path (readable with pstats or snakeviz)"""
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profiler
+    finally:
+        profiler.disable()
+        profiler.dump_stats(path)
+        logging.info(f"Wrote cProfile stats: {path}")
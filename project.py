@@ -1,25 +1,56 @@
 from PyQt5.QtWidgets import (QApplication, QCheckBox, QMainWindow, 
     QLineEdit, QHBoxLayout, QWidget, QPushButton, QVBoxLayout, QLabel, 
-    QRadioButton, QMessageBox, QScrollArea, QFrame,QComboBox,QListWidget)
+    QRadioButton, QMessageBox, QScrollArea, QFrame,QComboBox,QListWidget,QProgressBar,QFileDialog,QTableView)
 from PyQt5 import QtWidgets
-from PyQt5.QtCore import Qt, QRegExp
+from PyQt5.QtCore import Qt, QRegExp, QObject, QThread, QTimer, QAbstractTableModel, QModelIndex, pyqtSignal
 from PyQt5.QtGui import  QRegExpValidator, QIcon
-from faker import Faker
-import sys
-import csv
 import json
-from pathlib import Path
-from typing import List, Dict, Any
+import sys
+import time as clock
+from collections import OrderedDict
+from contextlib import nullcontext
+from typing import List, Dict, Any, Iterator, Optional, Tuple
 import logging
 
+from faker_data import FakerData, RecordPlan, DEFAULT_LOCALE, TEMPLATE_TYPE, pool_seeded
+from file_handler import FileHandler, FILE_FORMATS, format_available
+from profiling import GenerationProfile
+from compression import COMPRESSION_SUFFIXES, compression_available
+from jobs import GenerationJob, JobStopped
+from schema import Schema
+
+# Locales offered by the locale selector; it also accepts any Faker locale or weights typed in
+LOCALE_CHOICES = [DEFAULT_LOCALE, "en_GB", "de_DE", "fr_FR", "es_ES", "it_IT", "nl_NL", "pt_BR", "ja_JP", "zh_CN",
+                  "en_US:50,de_DE:25,fr_FR:25"]
+
+# Virtual rows of the preview table, generated in seeded blocks as they are scrolled into view
+PREVIEW_ROWS = 1000000
+PREVIEW_BLOCK_SIZE = 32
+# Blocks the preview keeps; others are generated again when scrolled back to
+PREVIEW_CACHE_BLOCKS = 64
+PREVIEW_SEED = 0
+# Largest value pool of a preview column: pools are built on the GUI thread, so full-size ones would stall editing
+PREVIEW_POOL_SIZE = 100
+# Quiet time after the last attribute edit before the preview is rebuilt
+PREVIEW_DELAY_MS = 300
+
 # Set up logging
 logging.basicConfig(
     level=logging.INFO,
     format='%(asctime)s - %(levelname)s - %(message)s',
     filename='faker_gui.log'
 )
+
+# Column keys set by a row's own fields (name input, type combo, Unique checkbox), never by its options
+ROW_FIELDS = ("name", "type", "unique")
+OPTIONS_TOOLTIP = ('JSON column options, e.g. {"params": {"min": 1, "max": 6}, "null_ratio": 0.1} '
+                   'or {"template": "{full_name:first|slug}@example.com"}')
+
 class AttributeInputGroup(QFrame):
     """Custom widget for attribute name input and data type selection"""
+    # Emitted whenever a row is added, removed or edited
+    changed = pyqtSignal()
+
     def __init__(self, faker_functions: List[Dict[str, Any]], parent=None):
         super().__init__(parent)
         self.faker_functions = faker_functions
@@ -50,19 +81,20 @@ class AttributeInputGroup(QFrame):
         
         # Add button
         add_button = QPushButton("+ Add Attribute")
-        add_button.clicked.connect(self.add_attribute_row)
+        add_button.clicked.connect(lambda: self.add_attribute_row())
         self.scroll_layout.addWidget(add_button)
         
         scroll.setWidget(scroll_widget)
         layout.addWidget(scroll)
 
-    def add_attribute_row(self):
-        """Add a new row with attribute name input and data type dropdown"""
+    def add_attribute_row(self, column: Optional[Dict[str, Any]] = None):
+        """Add a new row with attribute name input and data type dropdown, filled from a column if given"""
         row_widget = QWidget()
         row_layout = QHBoxLayout(row_widget)
         
         # Attribute name input
         name_input = QLineEdit()
+        name_input.setObjectName("name_input")
         name_input.setPlaceholderText("Attribute name")
         name_input.setFixedWidth(150)
         
@@ -71,7 +103,18 @@ class AttributeInputGroup(QFrame):
         type_combo.setFixedWidth(150)
         for func in self.faker_functions:
             type_combo.addItem(f"{func['type']} - {func['description']}", func['type'])
+        type_combo.addItem(f"{TEMPLATE_TYPE} - Built from earlier columns", TEMPLATE_TYPE)
         
+        # Unique values checkbox
+        unique_check = QCheckBox("Unique")
+        unique_check.setToolTip("Never repeat a value in this column")
+
+        # Other column options as JSON: params, null_ratio, template, pool, locale, ...
+        options_input = QLineEdit()
+        options_input.setObjectName("options_input")
+        options_input.setPlaceholderText('Options, e.g. {"null_ratio": 0.1}')
+        options_input.setToolTip(OPTIONS_TOOLTIP)
+
         # Remove button
         remove_button = QPushButton("×")
         remove_button.setFixedSize(20, 30)
@@ -81,145 +124,275 @@ class AttributeInputGroup(QFrame):
         
         row_layout.addWidget(name_input)
         row_layout.addWidget(type_combo)
+        row_layout.addWidget(unique_check)
+        row_layout.addWidget(options_input)
         row_layout.addWidget(remove_button)
         row_layout.addStretch()
+
+        name_input.textChanged.connect(lambda _: self.changed.emit())
+        type_combo.currentIndexChanged.connect(lambda _: self.changed.emit())
+        unique_check.toggled.connect(lambda _: self.changed.emit())
+        options_input.textChanged.connect(lambda _: self.changed.emit())
+
+        if column is not None:
+            options = {key: value for key, value in column.items() if key not in ROW_FIELDS}
+            name_input.setText(column["name"])
+            type_combo.setCurrentIndex(max(type_combo.findData(column["type"]), 0))
+            unique_check.setChecked(bool(column.get("unique")))
+            options_input.setText(json.dumps(options) if options else "")
         
         # Insert the new row before the Add button
         self.scroll_layout.insertWidget(len(self.attribute_rows), row_widget)
         self.attribute_rows.append(row_widget)
+        self.changed.emit()
+
+    def set_columns(self, columns: List[Dict[str, Any]]):
+        """Replace every row with the given columns"""
+        for row_widget in self.attribute_rows:
+            row_widget.deleteLater()
+        self.attribute_rows = []
+        for column in columns or [None]:
+            self.add_attribute_row(column)
 
     def remove_attribute_row(self, row_widget):
         """Remove an attribute row"""
         if len(self.attribute_rows) > 1:  # Keep at least one row
             self.attribute_rows.remove(row_widget)
             row_widget.deleteLater()
+            self.changed.emit()
 
-    def get_selected_attributes(self) -> List[Dict[str, str]]:
-        """Get the list of attribute names and their corresponding faker types"""
+    def get_selected_attributes(self) -> List[Dict[str, Any]]:
+        """Get the list of attribute names, their corresponding faker types, unique flags and options"""
         attributes = []
         for row in self.attribute_rows:
-            name_input = row.findChild(QLineEdit)
+            name_input = row.findChild(QLineEdit, "name_input")
             type_combo = row.findChild(QComboBox)
+            unique_check = row.findChild(QCheckBox)
+            options_input = row.findChild(QLineEdit, "options_input")
             if name_input and type_combo and name_input.text().strip():
+                name = name_input.text().strip()
                 attributes.append({
-                    'name': name_input.text().strip(),
-                    'type': type_combo.currentData()
+                    'name': name,
+                    'type': type_combo.currentData(),
+                    'unique': bool(unique_check and unique_check.isChecked()),
+                    **self.row_options(name, options_input)
                 })
         return attributes
-    
-class FakerData:
-    """Class to handle Faker data generation and functionality"""
-    def __init__(self):
-        self.fake = Faker()
-        self.formatted_functionality = [
-            {"func": self.fake.name, "type": "name", "description": "Full name"},
-            {"func": self.fake.last_name, "type": "last_name", "description": "Last name only"},
-            {"func": self.fake.email, "type": "email", "description": "Email address"},
-            {"func": self.fake.phone_number, "type": "phone_number", "description": "Phone number"},
-            {"func": self.fake.address, "type": "address", "description": "Full address"},
-            {"func": self.fake.text, "type": "text", "description": "Random text"},
-            {"func": self.fake.date, "type": "date", "description": "Random date"},
-            {"func": self.fake.time, "type": "time", "description": "Random time"},
-            {"func": self.fake.url, "type": "url", "description": "Website URL"},
-            {"func": self.fake.job, "type": "job", "description": "Job title"},
-            {"func": self.fake.company, "type": "company", "description": "Company name"},
-            {"func": self.fake.country, "type": "country", "description": "Country name"},
-            {"func": self.fake.currency_code, "type": "currency_code", "description": "Currency code"},
-            {"func": self.fake.file_name, "type": "file_name", "description": "Random file name"},
-            {"func": self.fake.image_url, "type": "image_url", "description": "Image URL"},
-            {"func": self.fake.ipv4, "type": "ipv4", "description": "IPv4 address"},
-            {"func": self.fake.user_name, "type": "user_name", "description": "Username"},
-            {"func": self.fake.color_name, "type": "color_name", "description": "Color name"},
-            {"func": self.fake.ssn, "type": "ssn", "description": "Social Security Number"},
-            {"func": self.fake.boolean, "type": "boolean", "description": "True/False"},
-            {"func": self.fake.credit_card_number, "type": "credit_card_number", "description": "Credit card number"},
-            {"func": self.fake.date_of_birth, "type": "date_of_birth", "description": "Date of birth"},
-            {"func": self.fake.file_extension, "type": "file_extension", "description": "File extension"},
-            {"func": self.fake.hex_color, "type": "hex_color", "description": "Hex color code"},
-            {"func": self.fake.isbn10, "type": "isbn10", "description": "ISBN-10"},
-            {"func": self.fake.isbn13, "type": "isbn13", "description": "ISBN-13"},
-            {"func": self.fake.language_code, "type": "language_code", "description": "Language code"},
-            {"func": self.fake.mac_address, "type": "mac_address", "description": "MAC address"},
-            {"func": self.fake.mime_type, "type": "mime_type", "description": "MIME type"},
-            {"func": self.fake.password, "type": "password", "description": "Random password"},
-            {"func": self.fake.random_digit, "type": "random_digit", "description": "Random digit (0-9)"},
-            {"func": self.fake.random_letter, "type": "random_letter", "description": "Random letter (a-z)"},
-            {"func": self.fake.street_address, "type": "street_address", "description": "Street address"},
-            {"func": self.fake.word, "type": "word", "description": "Random word"},
-            {"func": self.fake.zipcode, "type": "zipcode", "description": "Zip code"},
-            {"func": self.fake.latitude, "type": "latitude", "description": "Latitude coordinate"},
-            {"func": self.fake.longitude, "type": "longitude", "description": "Longitude coordinate"},
-        ]
-        
 
-    def generate_fake_data(self, selected_choices: List[str], number_of_items: int) -> List[Dict[str, Any]]:
-            """Generate fake data based on selected choices"""
-            if not selected_choices:
-                raise ValueError("At least one data type must be selected")
-                
-            available_types = {func["type"] for func in self.formatted_functionality}
-            invalid_types = set(selected_choices) - available_types
-            if invalid_types:
-                raise ValueError(f"Invalid data type(s): {', '.join(invalid_types)}")
-                
-            try:
-                fake_data = []
-                for _ in range(number_of_items):
-                    data = {}
-                    for type_name in selected_choices:
-                        func = next(f["func"] for f in self.formatted_functionality 
-                                if f["type"] == type_name)
-                        data[type_name] = func()
-                    fake_data.append(data)
-                return fake_data
-            except Exception as e:
-                logging.error(f"Error generating fake data: {str(e)}")
-                raise
-
-class FileHandler:
-    """Class to handle file operations"""
     @staticmethod
-    def write_csv(file_name: str, header: List[str], data: List[Dict[str, Any]]) -> None:
-        """Write data to CSV file"""
+    def row_options(name: str, options_input: Optional[QLineEdit]) -> Dict[str, Any]:
+        """Parse a row's JSON options; a problem is raised as ValueError and shown on the field"""
+        text = options_input.text().strip() if options_input else ""
         try:
-            output_path = Path(file_name).with_suffix('.csv')
-            with open(output_path, 'w', newline='', encoding='utf-8') as f:
-                writer = csv.DictWriter(f, fieldnames=header)
-                writer.writeheader()
-                writer.writerows(data)
-            logging.info(f"Successfully wrote CSV file: {output_path}")
-        except Exception as e:
-            logging.error(f"Error writing CSV file: {str(e)}")
+            try:
+                options = json.loads(text) if text else {}
+            except ValueError:
+                raise ValueError(f"Options of attribute '{name}' are not valid JSON")
+            if not isinstance(options, dict):
+                raise ValueError(f"Options of attribute '{name}' must be a JSON object")
+            overridden = [key for key in ROW_FIELDS if key in options]
+            if overridden:
+                raise ValueError(f"Options of attribute '{name}' cannot set {', '.join(overridden)}; "
+                                 f"use the row's own fields")
+        except ValueError as e:
+            if options_input:
+                options_input.setStyleSheet("border: 1px solid #d9534f;")
+                options_input.setToolTip(str(e))
             raise
+        if options_input:
+            options_input.setStyleSheet("")
+            options_input.setToolTip(OPTIONS_TOOLTIP)
+        return options
+    
 
-    @staticmethod
-    def write_json(file_name: str, data: List[Dict[str, Any]]) -> None:
-        """Write data to JSON file"""
+class GenerationCancelled(BaseException):
+    """Raised from the record stream when the user cancels a running generation.
+
+    A BaseException, like KeyboardInterrupt, so the writers' error handling lets it pass
+    without logging the cancellation as a write error.
+    """
+
+class GenerationWorker(QObject):
+    """Streams records into the output file on a background QThread"""
+    progress = pyqtSignal(int)
+    rate = pyqtSignal(float)
+    finished = pyqtSignal(str)
+    failed = pyqtSignal(str)
+    cancelled = pyqtSignal()
+
+    def __init__(self, plan: RecordPlan, number_of_items: int, file_name: str, file_format: str,
+                 profile: Optional[GenerationProfile] = None, compression: Optional[str] = None):
+        super().__init__()
+        self.compression = compression
+        self.profile = profile
+        self.plan = profile.instrument(plan) if profile is not None else plan
+        self.number_of_items = number_of_items
+        self.file_name = file_name
+        self.file_format = file_format
+        self._cancel_requested = False
+
+    def cancel(self):
+        """Ask the worker to stop; it finishes the current record and removes the partial file"""
+        self._cancel_requested = True
+
+    def tracked_records(self) -> Iterator[Dict[str, Any]]:
+        """Yield records while reporting progress and checking for cancellation"""
+        # Roughly 100 progress updates per run, so the signal queue never floods the UI
+        report_every = max(1, min(1000, self.number_of_items // 100))
+        start = clock.perf_counter()
+        for count, record in enumerate(self.plan.iter_records(self.number_of_items), 1):
+            if self._cancel_requested:
+                raise GenerationCancelled()
+            yield record
+            if count % report_every == 0 or count == self.number_of_items:
+                self.progress.emit(count)
+                self.rate.emit(count / max(clock.perf_counter() - start, 1e-9))
+
+    def run(self):
+        """Generate and write the file; always ends with exactly one of finished/failed/cancelled"""
+        output_path = FileHandler.output_path(self.file_format, self.file_name, self.compression)
         try:
-            output_path = Path(file_name).with_suffix('.json')
-            with open(output_path, 'w', encoding='utf-8') as f:
-                json.dump(data, f, indent=4, ensure_ascii=False)
-            logging.info(f"Successfully wrote JSON file: {output_path}")
+            records = self.tracked_records()
+            with self.profile.activate() if self.profile is not None else nullcontext():
+                if self.profile is not None:
+                    records = self.profile.track_rows(records)
+                output_path = FileHandler.write_stream(self.file_format, self.file_name, self.plan.attributes, records,
+                                                       self.compression)
+            if self.profile is not None:
+                self.profile.log_summary()
+            self.finished.emit(str(output_path))
+        except GenerationCancelled:
+            output_path.unlink(missing_ok=True)
+            logging.info(f"Generation cancelled, removed partial file: {output_path}")
+            self.cancelled.emit()
         except Exception as e:
-            logging.error(f"Error writing JSON file: {str(e)}")
-            raise
+            output_path.unlink(missing_ok=True)
+            logging.error(f"Error in generation worker: {str(e)}; removed partial file: {output_path}")
+            self.failed.emit(str(e))
+
+class JobWorker(GenerationWorker):
+    """Runs a checkpointed GenerationJob; cancelling keeps the checkpoint, so the next run resumes"""
+    def __init__(self, job: GenerationJob, plan: RecordPlan, profile: Optional[GenerationProfile] = None):
+        super().__init__(plan, job.number_of_items, job.file_name, job.file_format, profile, job.compression)
+        self.job = job
+
+    def run(self):
+        resumed_rows = self.job.rows_done
+        start = clock.perf_counter()
+
+        def report(rows_done: int, total: int):
+            self.progress.emit(rows_done)
+            self.rate.emit((rows_done - resumed_rows) / max(clock.perf_counter() - start, 1e-9))
+
+        try:
+            with self.profile.activate() if self.profile is not None else nullcontext():
+                self.job.run(progress=report, should_stop=lambda: self._cancel_requested)
+            if self.profile is not None:
+                self.profile.log_summary()
+            self.finished.emit(str(self.job.manifest_path))
+        except JobStopped:
+            self.cancelled.emit()
+        except Exception as e:
+            logging.error(f"Error in job worker: {str(e)}")
+            self.failed.emit(str(e))
+
+class PreviewModel(QAbstractTableModel):
+    """Read-only table of generated rows that are never all held in memory.
+
+    Row r is row r % block_size of block r // block_size, and every block is generated as
+    a shard seeded with shard_seed(seed, block), so each value only depends on the
+    attributes, the seed and the row index. Only the visible blocks are generated, at
+    most cache_blocks are kept, and a block scrolled back into view comes out the same.
+    Rows match parallel generation with the same seed and a shard size of block_size,
+    except that pooled columns sample from at most PREVIEW_POOL_SIZE values; unique
+    columns are only unique within a block.
+    """
+    def __init__(self, rows: int = PREVIEW_ROWS, block_size: int = PREVIEW_BLOCK_SIZE,
+                 cache_blocks: int = PREVIEW_CACHE_BLOCKS, seed: int = PREVIEW_SEED, parent=None):
+        super().__init__(parent)
+        # Its own instance: generation workers may be using others on their threads. Its pools are
+        # rebuilt after edits and only matter while the window is open, so they are never cached on disk
+        self.faker_data = FakerData(cache_pools=False)
+        self.virtual_rows = rows
+        self.block_size = block_size
+        self.cache_blocks = cache_blocks
+        self.seed = seed
+        self.attributes = []
+        self.names = []
+        self.blocks_generated = 0
+        self._blocks = OrderedDict()
+
+    def set_attributes(self, attributes: List[Dict[str, Any]]):
+        """Show rows of new attributes; raises ValueError, keeping the old rows, if they cannot be compiled"""
+        attributes = pool_seeded([
+            {**attr, "pool": PREVIEW_POOL_SIZE}
+            if attr.get("pool") and (attr["pool"] is True or int(attr["pool"]) > PREVIEW_POOL_SIZE) else attr
+            for attr in attributes
+        ], self.seed)
+        if attributes:
+            self.faker_data.compile_plan(attributes)
+        self.beginResetModel()
+        self.attributes = attributes
+        self.names = [attr["name"] for attr in attributes]
+        self._blocks.clear()
+        self.endResetModel()
+
+    def rowCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() or not self.attributes else self.virtual_rows
+
+    def columnCount(self, parent: QModelIndex = QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self.names)
+
+    def data(self, index: QModelIndex, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole or not index.isValid():
+            return None
+        block, offset = divmod(index.row(), self.block_size)
+        try:
+            value = self.block(block)[offset][index.column()]
+        except Exception as e:
+            logging.error(f"Error generating preview rows: {str(e)}")
+            return None
+        return "" if value is None else str(value)
+
+    def headerData(self, section: int, orientation: Qt.Orientation, role: int = Qt.DisplayRole) -> Any:
+        if role != Qt.DisplayRole:
+            return None
+        if orientation == Qt.Horizontal:
+            return self.names[section] if section < len(self.names) else None
+        return str(section + 1)
+
+    def block(self, index: int) -> List[Tuple[Any, ...]]:
+        """Rows of one block, generated on first use and kept while recently used"""
+        rows = self._blocks.get(index)
+        if rows is not None:
+            self._blocks.move_to_end(index)
+            return rows
+        rows = self.faker_data.generate_shard(self.attributes, index, self.block_size, self.seed)
+        self.blocks_generated += 1
+        self._blocks[index] = rows
+        if len(self._blocks) > self.cache_blocks:
+            self._blocks.popitem(last=False)
+        return rows
 
-    
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
         self.faker_data = FakerData()
         self.file_handler = FileHandler()
+        self.worker_thread = None
+        self.worker = None
         self.setup_ui()
         self.setup_styles()
 
     def setup_ui(self):
         self.setWindowTitle("Faker GUI")
-        self.setGeometry(100, 100, 1000, 700)
+        self.setGeometry(100, 100, 1000, 900)
         self.center_on_screen()
 
         main_widget = QWidget()
-        main_layout = QHBoxLayout(main_widget)
+        outer_layout = QVBoxLayout(main_widget)
+        main_layout = QHBoxLayout()
+        outer_layout.addLayout(main_layout, 3)
 
         # Left side - Attribute input group
         self.attribute_group = AttributeInputGroup(self.faker_data.formatted_functionality)
@@ -244,18 +417,97 @@ class MainWindow(QMainWindow):
 
         # File format selection
         format_layout = QHBoxLayout()
-        self.csv_radio = QRadioButton("CSV")
-        self.json_radio = QRadioButton("JSON")
-        format_layout.addWidget(self.csv_radio)
-        format_layout.addWidget(self.json_radio)
+        self.format_radios = {}
+        for file_format, label in FILE_FORMATS.items():
+            radio = QRadioButton(label)
+            if not format_available(file_format):
+                radio.setEnabled(False)
+                radio.setToolTip("Install pyarrow to enable this format")
+            format_layout.addWidget(radio)
+            self.format_radios[file_format] = radio
         control_layout.addLayout(format_layout)
 
+        # Locale of the values, or a weighted mix such as de_DE:40,fr_FR:30,en_US:30
+        self.locale_combo = QComboBox()
+        self.locale_combo.setEditable(True)
+        self.locale_combo.addItems(LOCALE_CHOICES)
+        self.locale_combo.setToolTip("Faker locale, or locales with weights: de_DE:40,fr_FR:30,en_US:30")
+        control_layout.addWidget(self.locale_combo)
+
+        # Compression of text outputs
+        self.compression_combo = QComboBox()
+        self.compression_combo.addItem("No compression", None)
+        for compression, suffix in COMPRESSION_SUFFIXES.items():
+            if compression_available(compression):
+                self.compression_combo.addItem(f"{compression} ({suffix})", compression)
+        control_layout.addWidget(self.compression_combo)
+
+        # Checkpointed runs, resumed by generating the same file again
+        self.resumable_check = QCheckBox("Resumable job (one part per shard)")
+        self.resumable_check.setToolTip("Checkpoint after every part; after a crash or cancel, "
+                                        "generate the same file again to continue")
+        control_layout.addWidget(self.resumable_check)
+
+        # Schema files with the attributes, their options and the locale
+        schema_layout = QHBoxLayout()
+        save_schema_button = QPushButton("Save Schema...")
+        save_schema_button.clicked.connect(lambda: self.save_schema())
+        load_schema_button = QPushButton("Load Schema...")
+        load_schema_button.clicked.connect(lambda: self.load_schema())
+        schema_layout.addWidget(save_schema_button)
+        schema_layout.addWidget(load_schema_button)
+        control_layout.addLayout(schema_layout)
+
         # Generate button
-        generate_button = QPushButton("Generate Data")
-        generate_button.clicked.connect(self.generate_data)
-        control_layout.addWidget(generate_button)
+        self.generate_button = QPushButton("Generate Data")
+        self.generate_button.clicked.connect(self.generate_data)
+        control_layout.addWidget(self.generate_button)
+
+        # Progress of a running generation
+        self.progress_bar = QProgressBar()
+        self.progress_bar.setValue(0)
+        control_layout.addWidget(self.progress_bar)
+
+        self.rate_label = QLabel("")
+        self.rate_label.setAlignment(Qt.AlignCenter)
+        control_layout.addWidget(self.rate_label)
+
+        self.cancel_button = QPushButton("Cancel")
+        self.cancel_button.setEnabled(False)
+        self.cancel_button.clicked.connect(self.cancel_generation)
+        control_layout.addWidget(self.cancel_button)
+
+        # Optional per-column timings, shown after the run
+        self.profile_check = QCheckBox("Profile columns")
+        self.profile_check.setToolTip("Time every column and writer flush; the summary is also logged")
+        control_layout.addWidget(self.profile_check)
+
+        self.slowest_list = QListWidget()
+        self.slowest_list.setMaximumHeight(140)
+        self.slowest_list.setVisible(False)
+        control_layout.addWidget(self.slowest_list)
 
         main_layout.addLayout(control_layout)
+
+        # Live preview of the attributes, generated on demand while scrolling
+        self.preview_model = PreviewModel(parent=self)
+        self.preview_table = QTableView()
+        self.preview_table.setModel(self.preview_model)
+        self.preview_table.verticalHeader().setDefaultSectionSize(24)
+        self.preview_table.setMinimumHeight(200)
+        outer_layout.addWidget(self.preview_table, 2)
+        self.preview_status = QLabel("")
+        outer_layout.addWidget(self.preview_status)
+
+        # Edits restart the timer, so the preview is rebuilt once typing pauses
+        self.preview_timer = QTimer(self)
+        self.preview_timer.setSingleShot(True)
+        self.preview_timer.setInterval(PREVIEW_DELAY_MS)
+        self.preview_timer.timeout.connect(self.refresh_preview)
+        self.attribute_group.changed.connect(self.preview_timer.start)
+        self.locale_combo.currentTextChanged.connect(lambda _: self.preview_timer.start())
+        self.refresh_preview()
+
         self.setCentralWidget(main_widget)
 
     def create_input_group(self, label_text: str, input_name: str, regex_pattern: str = None) -> QHBoxLayout:
@@ -331,46 +583,173 @@ class MainWindow(QMainWindow):
         """)
 
     def generate_data(self):
-        """Generate and save the fake data"""
+        """Validate the inputs and start generating the fake data in the background"""
         try:
             # Validate inputs
             file_name = self.findChild(QLineEdit, "file_input").text()
             number_str = self.findChild(QLineEdit, "number_input").text()
             
-            if not all([file_name, number_str, any([self.csv_radio.isChecked(), self.json_radio.isChecked()])]):
+            file_format = self.selected_format()
+            if not all([file_name, number_str, file_format]):
                 raise ValueError("Please fill in all fields")
 
             number = int(number_str)
             if number <= 0:
                 raise ValueError("Number of records must be greater than 0")
 
-            # Get selected attributes
-            attributes = self.attribute_group.get_selected_attributes()
-            if not attributes:
+            # Get selected attributes, checked up front by the schema model
+            if not self.attribute_group.get_selected_attributes():
                 raise ValueError("Please add at least one attribute")
-
-            # Generate fake data
-            fake_data = []
-            for _ in range(number):
-                record = {}
-                for attr in attributes:
-                    faker_func = next(f["func"] for f in self.faker_data.formatted_functionality 
-                                   if f["type"] == attr["type"])
-                    record[attr["name"]] = faker_func()
-                fake_data.append(record)
-
-            # Save data
-            if self.csv_radio.isChecked():
-                self.file_handler.write_csv(file_name, [attr["name"] for attr in attributes], fake_data)
+            attributes = self.current_schema().validate().attributes
+
+            # Generate fake data on a worker thread, streamed straight into the output file
+            plan = self.faker_data.compile_plan(attributes)
+            profile = GenerationProfile() if self.profile_check.isChecked() else None
+            compression = self.compression_combo.currentData()
+            FileHandler.check_compression(file_format, compression)
+            if self.resumable_check.isChecked():
+                job = GenerationJob.open(file_name, attributes, number, file_format, compression=compression)
+                self.start_worker(JobWorker(job, plan, profile))
+                self.progress_bar.setValue(job.rows_done)
             else:
-                self.file_handler.write_json(file_name, fake_data)
-
-            QMessageBox.information(self, "Success", f"Generated {number} records successfully!")
+                self.start_worker(GenerationWorker(plan, number, file_name, file_format, profile, compression))
 
         except Exception as e:
             logging.error(f"Error in generate_data: {str(e)}")
             QMessageBox.critical(self, "Error", str(e))
 
+    def refresh_preview(self):
+        """Show the current attributes in the preview, or why they cannot be generated"""
+        try:
+            if not self.attribute_group.get_selected_attributes():
+                self.preview_model.set_attributes([])
+                self.preview_status.setText("Name an attribute to preview its data")
+                return
+            self.preview_model.set_attributes(self.current_schema().validate().attributes)
+            self.preview_status.setText(f"Preview: {self.preview_model.rowCount():,} rows with seed "
+                                        f"{self.preview_model.seed}, generated as you scroll")
+        except Exception as e:
+            # Half-typed attributes are expected while editing, so this is not logged as an error
+            self.preview_status.setText(f"Preview unavailable: {str(e)}")
+
+    def current_schema(self) -> Schema:
+        """Schema of the attribute rows and the selected locale"""
+        return Schema.from_dict({"locale": self.locale_combo.currentText().strip() or None,
+                                 "columns": self.attribute_group.get_selected_attributes()})
+
+    def save_schema(self, path: Optional[str] = None):
+        """Validate the attributes and save them as a schema file (asks for the path if not given)"""
+        try:
+            schema = self.current_schema().validate()
+            if path is None:
+                path, _ = QFileDialog.getSaveFileName(self, "Save Schema", "schema.json", "Schema files (*.json)")
+                if not path:
+                    return
+            schema.save(path)
+            logging.info(f"Saved schema: {path}")
+        except Exception as e:
+            logging.error(f"Error saving schema: {str(e)}")
+            QMessageBox.critical(self, "Error", str(e))
+
+    def load_schema(self, path: Optional[str] = None):
+        """Fill the attribute rows and the locale from a schema file (asks for the path if not given)"""
+        try:
+            if path is None:
+                path, _ = QFileDialog.getOpenFileName(self, "Load Schema", "",
+                                                      "Schema files (*.json *.yaml *.yml)")
+                if not path:
+                    return
+            schema = Schema.load(path)
+            self.attribute_group.set_columns([column.to_dict() for column in schema.columns])
+            locale = schema.locale or DEFAULT_LOCALE
+            if isinstance(locale, dict):
+                locale = ",".join(f"{name}:{weight:g}" for name, weight in locale.items())
+            self.locale_combo.setEditText(locale if isinstance(locale, str) else ",".join(locale))
+            logging.info(f"Loaded schema: {path}")
+        except Exception as e:
+            logging.error(f"Error loading schema: {str(e)}")
+            QMessageBox.critical(self, "Error", str(e))
+
+    def selected_format(self) -> Optional[str]:
+        """File format of the checked radio button, if any"""
+        return next((file_format for file_format, radio in self.format_radios.items() if radio.isChecked()), None)
+
+    def start_worker(self, worker: GenerationWorker):
+        """Run a generation worker on its own thread and wire it to the progress controls"""
+        if self.worker_thread is not None:
+            # The previous thread may still be winding down after its final signal
+            self.worker_thread.wait()
+        self.worker = worker
+        self.worker_thread = QThread()
+        worker.moveToThread(self.worker_thread)
+
+        self.worker_thread.started.connect(worker.run)
+        worker.progress.connect(self.progress_bar.setValue)
+        worker.rate.connect(self.show_rate)
+        worker.finished.connect(self.on_generation_finished)
+        worker.failed.connect(self.on_generation_failed)
+        worker.cancelled.connect(self.on_generation_cancelled)
+        for signal in (worker.finished, worker.failed, worker.cancelled):
+            signal.connect(self.worker_thread.quit)
+
+        self.progress_bar.setRange(0, worker.number_of_items)
+        self.progress_bar.setValue(0)
+        self.rate_label.setText("")
+        self.slowest_list.clear()
+        self.slowest_list.setVisible(False)
+        self.set_running(True)
+        self.worker_thread.start()
+
+    def cancel_generation(self):
+        """Request cancellation of the running generation"""
+        if self.worker is not None:
+            self.cancel_button.setEnabled(False)
+            self.worker.cancel()
+
+    def show_rate(self, rows_per_sec: float):
+        self.rate_label.setText(f"{rows_per_sec:,.0f} rows/sec")
+
+    def set_running(self, running: bool):
+        """Toggle the controls between idle and generating states"""
+        self.generate_button.setEnabled(not running)
+        self.cancel_button.setEnabled(running)
+
+    def on_generation_finished(self, output_path: str):
+        self.set_running(False)
+        if self.worker.profile is not None:
+            self.show_slowest_columns(self.worker.profile)
+        QMessageBox.information(self, "Success", f"Generated {self.worker.number_of_items} records successfully!")
+
+    def show_slowest_columns(self, profile: GenerationProfile, count: int = 5):
+        """List the columns that took longest to generate in the last run"""
+        self.slowest_list.clear()
+        self.slowest_list.addItem(f"Slowest columns ({profile.summary()['rows_per_sec'] or 0:,.0f} rows/sec):")
+        for stats in profile.slowest_columns(count):
+            self.slowest_list.addItem(
+                f"{stats['name']} ({stats['type']}): {stats['seconds']:.2f}s, {stats['share']:.0%}"
+            )
+        self.slowest_list.setVisible(True)
+
+    def on_generation_failed(self, message: str):
+        self.set_running(False)
+        QMessageBox.critical(self, "Error", message)
+
+    def on_generation_cancelled(self):
+        self.set_running(False)
+        if isinstance(self.worker, JobWorker):
+            self.rate_label.setText("Job stopped; generate again to resume")
+            return
+        self.progress_bar.setValue(0)
+        self.rate_label.setText("Generation cancelled")
+
+    def closeEvent(self, event):
+        """Stop a running worker before the window goes away"""
+        if self.worker_thread is not None and self.worker_thread.isRunning():
+            self.worker.cancel()
+            self.worker_thread.quit()
+            self.worker_thread.wait()
+        super().closeEvent(event)
+
 
     def center_on_screen(self):
         """Center the window on the screen"""
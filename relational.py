@@ -0,0 +1,277 @@
+"""Related multi-table generation, e.g. users -> orders -> line_items.
+
+Every table gets a sequential integer primary key starting at 1, so the keys of a
+generated table are fully described by its row count. Child tables are generated by
+walking the parent key range and drawing a fan-out count for each parent, and other
+references pick a key uniformly from the referenced table's range; no parent rows are
+kept in memory.
+
+A schema is a dict with a list of tables:
+
+    {"tables": [
+        {"name": "users", "rows": 1000, "columns": {"full_name": "name", "mail": "email"}},
+        {"name": "products", "rows": 50, "columns": {"label": {"type": "word", "unique": true}}},
+        {"name": "orders", "parent": "users", "fan_out": {"distribution": "poisson", "mean": 3},
+         "columns": {"placed": "date"}},
+        {"name": "line_items", "parent": "orders", "fan_out": {"distribution": "uniform", "min": 1, "max": 5},
+         "references": {"product_id": "products"}, "columns": {"sku": "isbn13"}}
+    ]}
+
+Columns take the same forms as the command line schema: a name -> type mapping (values may
+be option objects) or a list of {"name", "type"} objects.
+"""
+import math
+import random
+from pathlib import Path
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
+import logging
+
+from faker_data import FakerData, KEY_TYPE
+from file_handler import FileHandler, iter_chunks
+from db_sinks import quote_identifier, sql_literal, create_table_sql, open_sink, DEFAULT_BATCH_SIZE
+
+FAN_OUT_DISTRIBUTIONS = ("fixed", "uniform", "poisson")
+
+# Rows per INSERT statement in SQL dumps
+DEFAULT_INSERT_BATCH = 500
+
+def column_attributes(columns: Any) -> List[Dict[str, Any]]:
+    """Normalize a name -> type mapping or a list of {name, type} objects to attribute dicts"""
+    if isinstance(columns, dict):
+        attributes = [
+            {"name": str(name), **options} if isinstance(options, dict) else {"name": str(name), "type": str(options)}
+            for name, options in columns.items()
+        ]
+        if all("type" in attr for attr in attributes):
+            return attributes
+    elif isinstance(columns, list) and all(isinstance(attr, dict) and {"name", "type"} <= attr.keys() for attr in columns):
+        return columns
+    raise ValueError("Columns must be a name -> type mapping or a list of {name, type} objects")
+
+def fan_out_sampler(spec: Any, rng: random.Random) -> Callable[[], int]:
+    """Function drawing the number of children of one parent.
+
+    spec is a fixed count or {"distribution": "fixed", "count": n},
+    {"distribution": "uniform", "min": a, "max": b} or {"distribution": "poisson", "mean": m}.
+    """
+    if isinstance(spec, int):
+        spec = {"distribution": "fixed", "count": spec}
+    distribution = spec.get("distribution", "fixed")
+    if distribution not in FAN_OUT_DISTRIBUTIONS:
+        raise ValueError(f"Unknown fan-out distribution: {distribution}")
+
+    if distribution == "fixed":
+        count = int(spec.get("count", 1))
+        if count < 0:
+            raise ValueError("Fan-out count must not be negative")
+        return lambda: count
+
+    if distribution == "uniform":
+        low, high = int(spec.get("min", 0)), int(spec["max"])
+        if not 0 <= low <= high:
+            raise ValueError("Uniform fan-out needs 0 <= min <= max")
+        return lambda: rng.randint(low, high)
+
+    mean = float(spec["mean"])
+    if mean < 0:
+        raise ValueError("Poisson fan-out mean must not be negative")
+    if mean > 30:
+        # Normal approximation; exp(-mean) gets too small for the product method
+        deviation = math.sqrt(mean)
+        return lambda: max(0, round(rng.gauss(mean, deviation)))
+    limit = math.exp(-mean)
+
+    def poisson() -> int:
+        count, product = 0, rng.random()
+        while product > limit:
+            count += 1
+            product *= rng.random()
+        return count
+    return poisson
+
+class Table:
+    """One table of a relational schema"""
+    def __init__(self, spec: Dict[str, Any]):
+        if not spec.get("name"):
+            raise ValueError("Every table needs a name")
+        self.name = str(spec["name"])
+        self.primary_key = spec.get("primary_key", "id")
+        self.columns = column_attributes(spec.get("columns", {}))
+        self.parent = spec.get("parent")
+        self.foreign_key = spec.get("foreign_key", f"{self.parent}_id" if self.parent else None)
+        self.fan_out = spec.get("fan_out", 1)
+        self.references = dict(spec.get("references", {}))
+        self.rows = spec.get("rows")
+
+        if self.parent is None and self.rows is None:
+            raise ValueError(f"Table '{self.name}' needs either rows or a parent")
+        if self.parent is not None and self.rows is not None:
+            raise ValueError(f"Table '{self.name}' has a parent, so its rows come from the fan-out")
+        if self.rows is not None and int(self.rows) < 0:
+            raise ValueError(f"Table '{self.name}' cannot have a negative number of rows")
+        names = [self.primary_key] + ([self.foreign_key] if self.parent else []) + list(self.references) + \
+            [attr["name"] for attr in self.columns]
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Table '{self.name}' has duplicate column(s): {', '.join(duplicates)}")
+
+    @property
+    def depends_on(self) -> List[str]:
+        """Tables that must be generated before this one"""
+        return ([self.parent] if self.parent else []) + [table for table in self.references.values()]
+
+    @property
+    def key_columns(self) -> List[Tuple[str, Optional[str]]]:
+        """(column, referenced table) pairs of the key columns, primary key first"""
+        keys = [(self.primary_key, None)]
+        if self.parent:
+            keys.append((self.foreign_key, self.parent))
+        keys.extend(self.references.items())
+        return keys
+
+    @property
+    def attributes(self) -> List[Dict[str, Any]]:
+        """All columns of the table as attributes, key columns first"""
+        return [{"name": name, "type": KEY_TYPE} for name, _ in self.key_columns] + self.columns
+
+class RelationalGenerator:
+    """Generate the tables of a relational schema in dependency order.
+
+    Only the row count of each finished table is kept: keys are sequential, so a count is
+    the whole key index of a table.
+    """
+    def __init__(self, schema: Dict[str, Any], seed: Optional[int] = None, pool_cache_dir: Optional[Path] = None,
+                 locale: Any = None):
+        if not isinstance(schema, dict) or not isinstance(schema.get("tables"), list) or not schema["tables"]:
+            raise ValueError("A relational schema needs a non-empty list of tables")
+        tables = [Table(spec) for spec in schema["tables"]]
+        self.tables = {table.name: table for table in tables}
+        if len(self.tables) != len(tables):
+            raise ValueError("Table names must be unique")
+        self.order = self._dependency_order(tables)
+        self.faker_data = FakerData(seed=seed, pool_cache_dir=pool_cache_dir, locale=locale)
+        self.random = random.Random(seed)
+        # Table -> number of rows generated, filled in as tables finish
+        self.row_counts = {}
+
+        # Check column types and fan-outs up front, so invalid schemas fail before any file is written
+        for table in tables:
+            if table.columns:
+                self.faker_data.compile_plan(table.columns)
+            if table.parent:
+                fan_out_sampler(table.fan_out, self.random)
+
+    def _dependency_order(self, tables: List[Table]) -> List[Table]:
+        ordered, done, visiting = [], set(), set()
+
+        def visit(table: Table) -> None:
+            if table.name in done:
+                return
+            if table.name in visiting:
+                raise ValueError(f"Tables reference each other in a cycle through '{table.name}'")
+            visiting.add(table.name)
+            for name in table.depends_on:
+                if name not in self.tables:
+                    raise ValueError(f"Table '{table.name}' references unknown table '{name}'")
+                visit(self.tables[name])
+            visiting.discard(table.name)
+            done.add(table.name)
+            ordered.append(table)
+
+        for table in tables:
+            visit(table)
+        return ordered
+
+    def iter_rows(self, table_name: str) -> Iterator[Dict[str, Any]]:
+        """Lazily generate the rows of one table; the tables it depends on must be generated first"""
+        table = self.tables[table_name]
+        missing = [name for name in table.depends_on if name not in self.row_counts]
+        if missing:
+            raise ValueError(f"Generate {', '.join(missing)} before '{table_name}'")
+
+        # Checked here rather than in the generator, so impossible tables fail immediately
+        plan = self.faker_data.compile_plan(table.columns) if table.columns else None
+        if plan is not None and table.rows is not None:
+            plan.check_capacity(int(table.rows))
+        references = [(name, self.row_counts[target]) for name, target in table.references.items()]
+        for name, count in references:
+            if count == 0:
+                raise ValueError(f"Table '{table_name}' references the empty table '{table.references[name]}'")
+        columns = list(zip(plan.names, plan.generators)) if plan else []
+        return self._iter_rows(table, columns, references)
+
+    def _iter_rows(self, table: Table, columns: List[Tuple[str, Callable[[], Any]]],
+                   references: List[Tuple[str, int]]) -> Iterator[Dict[str, Any]]:
+        randint = self.random.randint
+        if table.parent:
+            fan_out = fan_out_sampler(table.fan_out, self.random)
+            parent_keys = (
+                parent_key for parent_key in range(1, self.row_counts[table.parent] + 1)
+                for _ in range(fan_out())
+            )
+        else:
+            parent_keys = (None for _ in range(int(table.rows)))
+
+        key = 0
+        for parent_key in parent_keys:
+            key += 1
+            record = {table.primary_key: key}
+            if table.parent:
+                record[table.foreign_key] = parent_key
+            for name, count in references:
+                record[name] = randint(1, count)
+            for name, func in columns:
+                record[name] = func()
+            yield record
+        self.row_counts[table.name] = key
+        logging.info(f"Generated {key} rows for table {table.name}")
+
+    def iter_tables(self) -> Iterator[Tuple[Table, Iterator[Dict[str, Any]]]]:
+        """(table, rows) pairs in dependency order; each table's rows must be consumed before the next"""
+        for table in self.order:
+            yield table, self.iter_rows(table.name)
+
+    def write_files(self, output_dir: str, file_format: str = "csv") -> List[Path]:
+        """Write one file per table into output_dir, named after the tables"""
+        FileHandler.check_format(file_format)
+        output_dir = Path(output_dir)
+        output_dir.mkdir(parents=True, exist_ok=True)
+        return [
+            FileHandler.write_stream(file_format, str(output_dir / table.name), table.attributes, rows)
+            for table, rows in self.iter_tables()
+        ]
+
+    def write_database(self, url: str, batch_size: int = DEFAULT_BATCH_SIZE) -> List[str]:
+        """Load every table into a database through the sink for its URL, replacing existing tables"""
+        loaded = []
+        for table, rows in self.iter_tables():
+            with open_sink(url, table.name, table.attributes, batch_size) as sink:
+                sink.write(rows)
+            loaded.append(f"{url} {table.name}")
+        return loaded
+
+    def write_sql(self, file_name: str, batch_size: int = DEFAULT_INSERT_BATCH) -> Path:
+        """Write every table to one SQL dump: CREATE TABLE statements and batched INSERTs in a transaction"""
+        try:
+            output_path = Path(file_name).with_suffix('.sql')
+            with open(output_path, 'w', encoding='utf-8') as f:
+                f.write("BEGIN;\n")
+                for table, rows in self.iter_tables():
+                    foreign_keys = [
+                        (name, target, self.tables[target].primary_key) for name, target in table.key_columns[1:]
+                    ]
+                    f.write(create_table_sql(table.name, table.attributes, table.primary_key, foreign_keys) + "\n")
+                    names = [attr["name"] for attr in table.attributes]
+                    insert = f"INSERT INTO {quote_identifier(table.name)} " \
+                             f"({', '.join(quote_identifier(name) for name in names)}) VALUES\n"
+                    for chunk in iter_chunks(rows, batch_size):
+                        values = ",\n".join(
+                            "(" + ", ".join(sql_literal(record[name]) for name in names) + ")" for record in chunk
+                        )
+                        f.write(insert + values + ";\n")
+                f.write("COMMIT;\n")
+            logging.info(f"Successfully wrote SQL dump: {output_path}")
+            return output_path
+        except Exception as e:
+            logging.error(f"Error writing SQL dump: {str(e)}")
+            raise
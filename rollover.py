@@ -0,0 +1,211 @@
+"""Rollover output: one stream of records split into numbered part files and a manifest.
+
+A RollingWriter starts a new part (users-00001.csv, users-00002.csv, ...) after max_rows
+records, or once a part holds about max_bytes of uncompressed output, so downstream
+loaders can ingest the parts concurrently. Every part is a complete file with its own
+header. It is written under a hidden temporary name and renamed into place once finished,
+so a part that exists under its final name is never truncated. The manifest
+(users.manifest.json) lists the parts with their row counts, sizes and SHA-256 checksums:
+
+    writer = RollingWriter("csv", "users", attributes, max_rows=1000000)
+    parts = writer.write(records)
+
+Byte limits are checked between chunks, using the average row size seen so far to decide
+how many rows still fit, so a part can run slightly over max_bytes when row sizes vary.
+"""
+import hashlib
+import json
+import logging
+import os
+from itertools import chain, islice
+from pathlib import Path
+from typing import List, Dict, Any, Iterable, Iterator, Optional, Tuple
+
+from faker_data import shard_part_name
+from file_handler import FileHandler, FILE_FORMATS, ARROW_FORMATS, DEFAULT_CHUNK_SIZE, open_output, text_encoder
+from compression import split_compression_suffix
+
+MANIFEST_SUFFIX = ".manifest.json"
+# Rows written first when rolling over by size, before the average row size is known
+SIZE_PROBE_ROWS = 100
+# Size units accepted by parse_size
+SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+
+def parse_size(size: str) -> int:
+    """Byte count from a size such as 500000, 64K, 256M or 2G (binary units)"""
+    text = str(size).strip().upper().rstrip("B")
+    multiplier = SIZE_UNITS.get(text[-1:], 1)
+    if text[-1:] in SIZE_UNITS:
+        text = text[:-1]
+    try:
+        value = int(float(text) * multiplier)
+    except ValueError:
+        raise ValueError(f"Invalid size: {size}")
+    if value <= 0:
+        raise ValueError("Size must be greater than 0")
+    return value
+
+def file_sha256(path: Path, block_size: int = 1 << 20) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+def manifest_path(file_name: str) -> Path:
+    """Manifest of the parts written for a file name, e.g. users -> users.manifest.json"""
+    return Path(file_name + MANIFEST_SUFFIX)
+
+def write_json_atomic(path: Path, data: Any) -> Path:
+    """Write a JSON file through a hidden temporary file, so readers never see it half written"""
+    temp_path = path.with_name("." + path.name)
+    temp_path.write_text(json.dumps(data, indent=2), encoding='utf-8')
+    os.replace(temp_path, path)
+    return path
+
+def write_manifest(path: Path, file_format: str, compression: Optional[str], names: List[str],
+                   parts: List[Dict[str, Any]], **settings: Any) -> Path:
+    """Write a manifest listing parts ({"path", "rows", "bytes", "sha256"}) and the settings they were written with"""
+    return write_json_atomic(path, {
+        "format": file_format,
+        "compression": compression,
+        "columns": names,
+        "rows": sum(part["rows"] for part in parts),
+        **settings,
+        "parts": parts,
+    })
+
+def part_entry(path: Path, rows: int, checksum: Optional[str] = None) -> Dict[str, Any]:
+    """Manifest entry of a finished part"""
+    return {"path": path.name, "rows": rows, "bytes": path.stat().st_size,
+            "sha256": checksum or file_sha256(path)}
+
+def read_manifest(path: str) -> Dict[str, Any]:
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+class RollingWriter:
+    """Write records to numbered part files, rolling over by row count, byte size or both"""
+    def __init__(self, file_format: str, file_name: str, attributes: List[Dict[str, str]],
+                 max_rows: Optional[int] = None, max_bytes: Optional[int] = None,
+                 compression: Optional[str] = None, chunk_size: int = DEFAULT_CHUNK_SIZE):
+        FileHandler.check_format(file_format)
+        file_name, suffix_compression = split_compression_suffix(file_name)
+        compression = compression or suffix_compression
+        FileHandler.check_compression(file_format, compression)
+        if max_rows is None and max_bytes is None:
+            raise ValueError("Set a maximum number of rows or bytes per part")
+        if max_rows is not None and max_rows <= 0:
+            raise ValueError("Rows per part must be greater than 0")
+        if max_bytes is not None and max_bytes <= 0:
+            raise ValueError("Bytes per part must be greater than 0")
+        if max_bytes is not None and file_format in ARROW_FORMATS:
+            raise ValueError(f"{FILE_FORMATS[file_format]} parts can only roll over by row count")
+        if chunk_size <= 0:
+            raise ValueError("Chunk size must be greater than 0")
+
+        # "users.csv" names the same parts as "users"
+        if Path(file_name).suffix == f".{file_format}":
+            file_name = str(Path(file_name).with_suffix(''))
+        self.file_format = file_format
+        self.file_name = file_name
+        self.attributes = attributes
+        self.names = [attr["name"] for attr in attributes]
+        self.max_rows = max_rows
+        self.max_bytes = max_bytes
+        self.compression = compression
+        self.chunk_size = chunk_size
+        self.manifest_path = manifest_path(file_name)
+        # Manifest entries of the finished parts
+        self.parts = []
+        # Average uncompressed bytes per row of the last chunk, for size limits
+        self._row_size = None
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> List[Path]:
+        """Write all records, then the manifest; returns the part paths in order"""
+        try:
+            rows = iter(rows)
+            paths = []
+            while True:
+                chunk = list(islice(rows, max(self._room(0, 0), 1)))
+                if not chunk:
+                    break
+                paths.append(self._write_part(len(self.parts), chunk, rows))
+            self._write_manifest()
+            logging.info(f"Wrote {sum(part['rows'] for part in self.parts)} records in {len(paths)} part(s), "
+                         f"manifest {self.manifest_path}")
+            return paths
+        except Exception as e:
+            logging.error(f"Error writing part files: {str(e)}")
+            raise
+
+    def _room(self, rows: int, size: int) -> int:
+        """Number of records to add to a part holding rows records and size bytes"""
+        room = self.chunk_size
+        if self.max_rows is not None:
+            room = min(room, self.max_rows - rows)
+        if self.max_bytes is not None:
+            if self._row_size is None:
+                room = min(room, SIZE_PROBE_ROWS)
+            else:
+                room = min(room, int((self.max_bytes - size) / self._row_size))
+        return max(room, 0)
+
+    def _write_part(self, index: int, chunk: List[Dict[str, Any]], rows: Iterator[Dict[str, Any]]) -> Path:
+        path = FileHandler.output_path(self.file_format, shard_part_name(self.file_name, index), self.compression)
+        # Hidden until complete, then renamed into place
+        temp_path = path.with_name("." + path.name)
+        try:
+            if self.file_format in ARROW_FORMATS:
+                count, checksum = self._write_arrow_part(temp_path, chunk, rows)
+            else:
+                count, checksum = self._write_text_part(temp_path, chunk, rows)
+            os.replace(temp_path, path)
+        except BaseException:
+            temp_path.unlink(missing_ok=True)
+            raise
+        self.parts.append(part_entry(path, count, checksum))
+        return path
+
+    def _write_text_part(self, temp_path: Path, chunk: List[Dict[str, Any]],
+                         rows: Iterator[Dict[str, Any]]) -> Tuple[int, str]:
+        encoder = text_encoder(self.file_format, self.names)
+        # Uncompressed parts are hashed as they are written; compressed ones are read back
+        digest = hashlib.sha256() if self.compression is None else None
+        count = size = 0
+        pending = encoder.start()
+        with open_output(temp_path, 'wb', self.compression) as f:
+            while chunk:
+                encoded = encoder.encode(chunk).encode('utf-8')
+                self._row_size = len(encoded) / len(chunk)
+                data = pending.encode('utf-8') + encoded
+                pending = ""
+                f.write(data)
+                if digest is not None:
+                    digest.update(data)
+                count += len(chunk)
+                size += len(data)
+                room = self._room(count, size)
+                chunk = list(islice(rows, room)) if room else []
+            data = encoder.finish().encode('utf-8')
+            if data:
+                f.write(data)
+                if digest is not None:
+                    digest.update(data)
+        return count, digest.hexdigest() if digest is not None else file_sha256(temp_path)
+
+    def _write_arrow_part(self, temp_path: Path, chunk: List[Dict[str, Any]],
+                          rows: Iterator[Dict[str, Any]]) -> Tuple[int, str]:
+        counted = [0]
+
+        def records() -> Iterator[Dict[str, Any]]:
+            for record in chain(chunk, islice(rows, self.max_rows - len(chunk))):
+                counted[0] += 1
+                yield record
+
+        FileHandler.write_stream(self.file_format, str(temp_path), self.attributes, records())
+        return counted[0], file_sha256(temp_path)
+
+    def _write_manifest(self) -> Path:
+        return write_manifest(self.manifest_path, self.file_format, self.compression, self.names, self.parts,
+                              max_rows=self.max_rows, max_bytes=self.max_bytes)
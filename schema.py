@@ -0,0 +1,140 @@
+"""Typed schema model: columns with parameters, null ratios and templates, checked before generation.
+
+A Schema is the list of columns the GUI edits and the command line reads, with an optional
+dataset locale. Each Column has a name, a data type and its options (see
+FakerData.compile_plan), and schemas are saved as JSON:
+
+    {"locale": "de_DE:60,fr_FR:40", "columns": [
+        {"name": "full_name", "type": "name"},
+        {"name": "email", "type": "template", "template": "{full_name:first|slug}@example.com"},
+        {"name": "age", "type": "random_int", "params": {"min": 18, "max": 90}, "null_ratio": 0.1},
+        {"name": "joined", "type": "date_between", "params": {"start_date": "2020-01-01", "end_date": "today"}}
+    ]}
+
+    schema = Schema.load("users.schema.json").validate()
+    plan = FakerData(seed=42).compile_plan(schema.attributes)
+
+validate() checks names, types and options, then compiles the schema and generates one
+record with a throwaway FakerData, so bad parameters fail before a long run starts.
+"""
+import json
+from pathlib import Path
+from typing import List, Dict, Any, Optional
+
+from faker_data import FakerData, DATA_TYPES, TEMPLATE_TYPE, locale_weights, with_locale
+from relational import column_attributes
+
+# Options a column may carry besides its name and type
+COLUMN_OPTIONS = ("params", "null_ratio", "template", "unique", "max_retries", "pool", "pool_seed",
+                  "distribution", "zipf_exponent", "locale")
+
+COLUMN_TYPES = {data_type["type"] for data_type in DATA_TYPES} | {TEMPLATE_TYPE}
+
+def read_schema(schema_path: str) -> Any:
+    """Parse a JSON or YAML (by extension) schema file"""
+    path = Path(schema_path)
+    with open(path, 'r', encoding='utf-8') as f:
+        if path.suffix.lower() in ('.yaml', '.yml'):
+            try:
+                import yaml
+            except ImportError:
+                raise ImportError("PyYAML is required to read YAML schema files")
+            return yaml.safe_load(f)
+        return json.load(f)
+
+class Column:
+    """One column of a schema: name, data type and generation options"""
+    def __init__(self, name: str, type: str, params: Optional[Dict[str, Any]] = None, null_ratio: float = 0.0,
+                 template: Optional[str] = None, **options: Any):
+        self.name = str(name).strip()
+        self.type = type
+        self.params = dict(params or {})
+        self.null_ratio = float(null_ratio or 0)
+        self.template = template
+        # unique, pool, distribution, locale, ...
+        self.options = options
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "Column":
+        if not isinstance(data, dict) or "name" not in data or "type" not in data:
+            raise ValueError("Every column needs a name and a type")
+        unknown = [key for key in data if key not in ("name", "type") + COLUMN_OPTIONS]
+        if unknown:
+            raise ValueError(f"Column '{data['name']}' has unknown option(s): {', '.join(unknown)}")
+        return cls(**data)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Attribute dict for FakerData.compile_plan; options left at their defaults are omitted"""
+        data = {"name": self.name, "type": self.type}
+        if self.params:
+            data["params"] = self.params
+        if self.null_ratio:
+            data["null_ratio"] = self.null_ratio
+        if self.template is not None:
+            data["template"] = self.template
+        data.update((key, value) for key, value in self.options.items() if value not in (None, False))
+        return data
+
+class Schema:
+    """Ordered columns and an optional dataset locale"""
+    def __init__(self, columns: List[Column], locale: Any = None):
+        self.columns = columns
+        self.locale = locale
+
+    @classmethod
+    def from_dict(cls, data: Any) -> "Schema":
+        """Schema from its saved form, or from the command line forms.
+
+        Those are a name -> type mapping, where a value may also be an object with the type
+        and column options (e.g. {"type": "email", "unique": true}), or a column list.
+        """
+        if isinstance(data, dict) and isinstance(data.get("columns"), (list, dict)) and "type" not in data["columns"]:
+            return cls([Column.from_dict(attr) for attr in column_attributes(data["columns"])], data.get("locale"))
+        return cls([Column.from_dict(attr) for attr in column_attributes(data)])
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {"columns": [column.to_dict() for column in self.columns]}
+        if self.locale:
+            data = {"locale": self.locale, **data}
+        return data
+
+    @classmethod
+    def load(cls, path: str) -> "Schema":
+        """Load a JSON or YAML (by extension) schema file"""
+        return cls.from_dict(read_schema(path))
+
+    def save(self, path: str) -> Path:
+        output_path = Path(path)
+        output_path.write_text(json.dumps(self.to_dict(), indent=2), encoding='utf-8')
+        return output_path
+
+    @property
+    def attributes(self) -> List[Dict[str, Any]]:
+        """Attribute dicts of the columns, with the dataset locale applied"""
+        return with_locale([column.to_dict() for column in self.columns], self.locale)
+
+    def validate(self) -> "Schema":
+        """Raise ValueError describing the first problem found; returns the schema"""
+        if not self.columns:
+            raise ValueError("A schema needs at least one column")
+        names = [column.name for column in self.columns]
+        if not all(names):
+            raise ValueError("Every column needs a name")
+        duplicates = sorted({name for name in names if names.count(name) > 1})
+        if duplicates:
+            raise ValueError(f"Duplicate column name(s): {', '.join(duplicates)}")
+        unknown = [column.type for column in self.columns if column.type not in COLUMN_TYPES]
+        if unknown:
+            raise ValueError(f"Invalid data type(s): {', '.join(dict.fromkeys(unknown))}")
+        if self.locale:
+            locale_weights(self.locale)
+        # Parameter values are only checked by Faker itself, so one record is generated up front,
+        # with one-value pools to keep it quick
+        attributes = [{**attr, "pool": 1} if attr.get("pool") else attr for attr in self.attributes]
+        plan = FakerData().compile_plan(attributes)
+        for name, func in zip(plan.names, plan.generators):
+            try:
+                func()
+            except Exception as e:
+                raise ValueError(f"Column '{name}': {str(e)}")
+        return self
@@ -0,0 +1,30 @@
+from benchmarks.suite import compare, run_case, case_attributes
+
+BASELINE = {
+    "types": {"name": 1000.0, "email": 500.0},
+    "runs": [{"format": "csv", "mode": "stream", "rows": 100, "columns": 5, "rows_per_sec": 2000.0,
+              "peak_rss_mb": 40.0}],
+}
+
+def test_compare_flags_slowdowns_and_memory_growth():
+    """Test the regression check against a stored baseline"""
+    results = {
+        "types": {"name": 700.0, "email": 480.0, "new_type": 1.0},
+        "runs": [{"format": "csv", "mode": "stream", "rows": 100, "columns": 5, "rows_per_sec": 1900.0,
+                  "peak_rss_mb": 60.0},
+                 {"format": "json", "mode": "stream", "rows": 100, "columns": 5, "rows_per_sec": 1.0,
+                  "peak_rss_mb": 1.0}],
+    }
+    regressions = compare(results, BASELINE, tolerance=0.2)
+
+    assert len(regressions) == 2
+    assert regressions[0].startswith("type name")
+    assert "peak RSS" in regressions[1]
+    assert compare(BASELINE, BASELINE) == []
+
+def test_run_case_reports_throughput():
+    """Test one end-to-end case in-process"""
+    run = run_case({"format": "jsonl", "mode": "stream", "rows": 50, "columns": 3})
+
+    assert run["rows_per_sec"] > 0 and run["bytes"] > 0
+    assert [attr["type"] for attr in case_attributes(3)] == ["name", "last_name", "email"]
@@ -0,0 +1,73 @@
+import pytest
+import gzip
+import json
+from faker_data import FakerData
+from file_handler import FileHandler
+from compression import ParallelGzipWriter, ZSTD_AVAILABLE, split_compression_suffix
+from profiling import GenerationProfile
+
+ATTRIBUTES = [{"name": "full_name", "type": "name"}, {"name": "mail", "type": "email"}]
+
+@pytest.fixture(scope="module")
+def records():
+    return FakerData(seed=4).compile_plan(ATTRIBUTES).generate(2000)
+
+def test_parallel_gzip_is_independent_of_threads(tmp_path):
+    """Test that block-parallel gzip output is valid and identical for any thread count"""
+    data = b"".join(b"line %d of some fairly repetitive text\n" % i for i in range(50000))
+    outputs = []
+    for threads in (1, 4):
+        path = tmp_path / f"t{threads}.gz"
+        with ParallelGzipWriter(path, threads=threads, block_size=64 * 1024) as writer:
+            for start in range(0, len(data), 10000):
+                writer.write(data[start:start + 10000])
+        assert gzip.decompress(path.read_bytes()) == data
+        stats = writer.stats()
+        assert stats["bytes_in"] == len(data) and stats["ratio"] > 2
+        outputs.append(path.read_bytes())
+    assert outputs[0] == outputs[1]
+
+def test_empty_gzip_output_is_valid(tmp_path):
+    """Test that an empty stream still makes a readable gzip file"""
+    path = tmp_path / "empty.gz"
+    ParallelGzipWriter(path, threads=2).close()
+    assert gzip.decompress(path.read_bytes()) == b""
+
+def test_write_stream_compression_by_suffix(records, tmp_path):
+    """Test selecting gzip through the file name and reading the records back"""
+    output = FileHandler.write_stream("jsonl", str(tmp_path / "people.jsonl.gz"), ATTRIBUTES, records)
+
+    assert output == tmp_path / "people.jsonl.gz"
+    with gzip.open(output, 'rt', encoding='utf-8') as f:
+        assert [json.loads(line) for line in f] == records
+    assert split_compression_suffix("people.csv.zst") == ("people.csv", "zstd")
+    assert FileHandler.output_path("csv", "people", "gzip").name == "people.csv.gz"
+
+def test_compressed_csv_matches_plain(records, tmp_path):
+    """Test that compression does not change the CSV content, and reports its stats to a profile"""
+    plain = FileHandler.write_stream("csv", str(tmp_path / "plain"), ATTRIBUTES, records)
+    profile = GenerationProfile()
+    with profile.activate():
+        compressed = FileHandler.write_stream("csv", str(tmp_path / "packed"), ATTRIBUTES, records, "gzip")
+
+    assert gzip.decompress(compressed.read_bytes()) == plain.read_bytes()
+    [stats] = profile.summary()["compression"]
+    assert stats["bytes_in"] == plain.stat().st_size
+    assert stats["bytes_out"] == compressed.stat().st_size
+
+@pytest.mark.skipif(not ZSTD_AVAILABLE, reason="zstandard is not installed")
+def test_zstd_output(records, tmp_path):
+    """Test zstd output round trip"""
+    import zstandard
+    output = FileHandler.write_stream("csv", str(tmp_path / "people"), ATTRIBUTES, records, "zstd")
+    plain = FileHandler.write_stream("csv", str(tmp_path / "plain"), ATTRIBUTES, records)
+
+    assert output.name == "people.csv.zst"
+    assert zstandard.ZstdDecompressor().decompressobj().decompress(output.read_bytes()) == plain.read_bytes()
+
+def test_compression_rejected_for_arrow_and_unknown(records, tmp_path):
+    """Test invalid compression choices"""
+    with pytest.raises(ValueError, match="Unsupported compression"):
+        FileHandler.write_stream("csv", str(tmp_path / "x"), ATTRIBUTES, records, "bzip2")
+    with pytest.raises(ValueError, match="text formats"):
+        FileHandler.check_compression("parquet", "gzip")
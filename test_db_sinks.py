@@ -0,0 +1,111 @@
+import pytest
+import csv
+import io
+import sqlite3
+from decimal import Decimal
+from faker_data import FakerData
+from db_sinks import SQLiteSink, PostgresCopySink, open_sink, create_table_sql
+
+ATTRIBUTES = [
+    {"name": "full_name", "type": "name"},
+    {"name": "digit", "type": "random_digit"},
+    {"name": "lat", "type": "latitude"},
+    {"name": "flag", "type": "boolean"},
+]
+
+class StubCursor:
+    def __init__(self, connection):
+        self.connection = connection
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+    def execute(self, sql):
+        self.connection.statements.append(sql)
+
+    def copy_expert(self, sql, file):
+        self.connection.copies.append((sql, file.read()))
+
+class StubConnection:
+    """Records what a psycopg2 connection would have been sent"""
+    def __init__(self):
+        self.statements = []
+        self.copies = []
+        self.commits = 0
+        self.closed = False
+
+    def cursor(self):
+        return StubCursor(self)
+
+    def commit(self):
+        self.commits += 1
+
+    def rollback(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+def test_sqlite_sink_loads_typed_table(tmp_path):
+    """Test loading generated records into SQLite in batches"""
+    database = str(tmp_path / "test.db")
+    records = list(FakerData(seed=1).compile_plan(ATTRIBUTES).generate(250))
+    with SQLiteSink(database, "people", ATTRIBUTES, batch_size=100) as sink:
+        assert sink.write(iter(records)) == 250
+
+    connection = sqlite3.connect(database)
+    columns = {row[1]: row[2] for row in connection.execute('PRAGMA table_info("people")')}
+    assert columns == {"full_name": "TEXT", "digit": "INTEGER", "lat": "REAL", "flag": "BOOLEAN"}
+    rows = connection.execute("SELECT full_name, digit, lat, flag FROM people ORDER BY rowid").fetchall()
+    assert rows == [(r["full_name"], r["digit"], float(r["lat"]), int(r["flag"])) for r in records]
+
+def test_sqlite_sink_append_and_replace(tmp_path):
+    """Test the if_exists modes"""
+    url = f"sqlite:///{tmp_path / 'test.db'}"
+    records = [{"digit": 1}, {"digit": 2}]
+    attributes = [{"name": "digit", "type": "random_digit"}]
+    for if_exists, expected in (("replace", 2), ("append", 4), ("replace", 2)):
+        with open_sink(url, "digits", attributes, if_exists=if_exists) as sink:
+            sink.write(records)
+        assert sqlite3.connect(str(tmp_path / "test.db")).execute("SELECT COUNT(*) FROM digits").fetchone()[0] == expected
+    with pytest.raises(sqlite3.OperationalError):
+        with open_sink(url, "digits", attributes, if_exists="fail") as sink:
+            sink.write(records)
+    with pytest.raises(ValueError, match="Unsupported database URL"):
+        open_sink("mysql://localhost/db", "digits", attributes)
+
+def test_postgres_copy_sink_with_stub():
+    """Test the COPY statements and CSV payloads sent to PostgreSQL"""
+    connection = StubConnection()
+    attributes = ATTRIBUTES + [{"name": "price", "type": "text"}]
+    records = [
+        {"full_name": "Ann O'Neil", "digit": 3, "lat": Decimal("1.5"), "flag": True, "price": "a,b"},
+        {"full_name": "", "digit": 4, "lat": Decimal("-2.25"), "flag": False, "price": None},
+        {"full_name": "Cy", "digit": 5, "lat": Decimal("0"), "flag": True, "price": "x"},
+        {"full_name": "Dee", "digit": 6, "lat": Decimal("1"), "flag": False, "price": "\\N"},
+    ]
+    with PostgresCopySink(lambda: connection, "people", attributes, batch_size=2) as sink:
+        sink.write(records)
+
+    assert connection.statements[0] == 'DROP TABLE IF EXISTS "people"'
+    assert '"lat" DOUBLE PRECISION' in connection.statements[1]
+    assert [sql for sql, _ in connection.copies] == [
+        'COPY "people" ("full_name", "digit", "lat", "flag", "price") FROM STDIN WITH (FORMAT csv, NULL \'\\N\')'
+    ] * 2
+    rows = [row for _, data in connection.copies for row in csv.reader(io.StringIO(data))]
+    assert rows == [["Ann O'Neil", "3", "1.5", "True", "a,b"], ["", "4", "-2.25", "False", "\\N"],
+                    ["Cy", "5", "0.0", "True", "x"], ["Dee", "6", "1.0", "False", "\\N"]]
+    # COPY only reads the unquoted marker as NULL: empty strings stay empty, a "\N" string is quoted
+    assert connection.copies[0][1].splitlines()[1] == ",4,-2.25,False,\\N"
+    assert connection.copies[1][1].splitlines()[1] == 'Dee,6,1.0,False,"\\N"'
+    assert connection.commits == 3 and connection.closed
+
+def test_create_table_sql():
+    """Test DDL with keys"""
+    sql = create_table_sql("orders", [{"name": "id", "type": "key"}, {"name": "user_id", "type": "key"}],
+                           "id", [("user_id", "users", "id")], if_not_exists=True)
+    assert sql == ('CREATE TABLE IF NOT EXISTS "orders" (\n    "id" INTEGER PRIMARY KEY,\n    "user_id" INTEGER,\n'
+                   '    FOREIGN KEY ("user_id") REFERENCES "users" ("id")\n);')
@@ -0,0 +1,176 @@
+import pytest
+import csv
+import json
+import subprocess
+import sys
+from pathlib import Path
+from faker_cli import main
+from schema import Schema
+
+@pytest.fixture
+def schema_file(tmp_path):
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"full_name": "name", "mail": "email", "digit": "random_digit"}), encoding='utf-8')
+    return path
+
+def test_cli_writes_csv(schema_file, tmp_path, capsys):
+    """Test a basic CLI run from a JSON schema"""
+    output = tmp_path / "people"
+    assert main([str(schema_file), "--rows", "40", "--output", str(output), "--seed", "1"]) == 0
+
+    assert capsys.readouterr().out.strip() == str(output.with_suffix('.csv'))
+    with open(output.with_suffix('.csv'), 'r', newline='', encoding='utf-8') as f:
+        records = list(csv.DictReader(f))
+    assert len(records) == 40
+    assert list(records[0]) == ["full_name", "mail", "digit"]
+
+def test_cli_seed_is_reproducible_across_workers(schema_file, tmp_path):
+    """Test that the same seed gives identical files for any worker count"""
+    for workers in ("1", "2"):
+        assert main([str(schema_file), "-n", "50", "-f", "jsonl", "-o", str(tmp_path / f"w{workers}"),
+                     "-s", "9", "-w", workers, "--shard-size", "20", "-q"]) == 0
+    assert (tmp_path / "w1.jsonl").read_bytes() == (tmp_path / "w2.jsonl").read_bytes()
+
+def test_cli_part_files(schema_file, tmp_path, capsys):
+    """Test writing one part file per shard"""
+    output = tmp_path / "parts"
+    assert main([str(schema_file), "-n", "45", "-f", "json", "-o", str(output), "-s", "2",
+                 "--shard-size", "20", "--parts", "-q"]) == 0
+    assert capsys.readouterr().out.split() == [str(tmp_path / f"parts-0000{i}.json") for i in (1, 2, 3)]
+
+def test_load_yaml_schema(tmp_path):
+    """Test YAML schema files in the list form"""
+    pytest.importorskip("yaml")
+    path = tmp_path / "schema.yaml"
+    path.write_text("- name: who\n  type: name\n- name: when\n  type: date\n", encoding='utf-8')
+    assert Schema.load(str(path)).attributes == [{"name": "who", "type": "name"}, {"name": "when", "type": "date"}]
+
+def test_cli_invalid_type(tmp_path):
+    """Test that schema errors are reported through the exit code"""
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"x": "invalid_type"}), encoding='utf-8')
+    assert main([str(path), "-n", "5", "-o", str(tmp_path / "out"), "-q"]) == 1
+    assert not (tmp_path / "out.csv").exists()
+
+def test_cli_does_not_import_qt():
+    """Test that the CLI stays usable on machines without a display or PyQt5"""
+    code = "import sys, faker_cli; sys.exit('PyQt5' in sys.modules)"
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent)
+    assert result.returncode == 0
+
+def test_cli_unique_column_options(tmp_path):
+    """Test column options in the mapping form of the schema"""
+    path = tmp_path / "schema.json"
+    path.write_text(json.dumps({"word": {"type": "word", "unique": True}, "digit": "random_digit"}), encoding='utf-8')
+    assert Schema.load(str(path)).attributes == [
+        {"name": "word", "type": "word", "unique": True},
+        {"name": "digit", "type": "random_digit"},
+    ]
+
+    assert main([str(path), "-n", "300", "-f", "jsonl", "-o", str(tmp_path / "words"), "-s", "1",
+                 "-w", "2", "--shard-size", "100", "-q"]) == 0
+    lines = (tmp_path / "words.jsonl").read_text(encoding='utf-8').splitlines()
+    assert len({json.loads(line)["word"] for line in lines}) == 300
+
+    assert main([str(path), "-n", "2000", "-o", str(tmp_path / "too_many"), "-q"]) == 1
+
+def test_cli_relational_schema(tmp_path, capsys):
+    """Test generating related tables from a schema with a tables list"""
+    path = tmp_path / "shop.json"
+    path.write_text(json.dumps({"tables": [
+        {"name": "users", "rows": 5, "columns": {"mail": "email"}},
+        {"name": "orders", "parent": "users", "fan_out": 2, "columns": {"placed": "date"}},
+    ]}), encoding='utf-8')
+
+    assert main([str(path), "-f", "jsonl", "-o", str(tmp_path / "shop"), "-s", "1", "-q"]) == 0
+    assert capsys.readouterr().out.split() == [str(tmp_path / "shop" / "users.jsonl"),
+                                               str(tmp_path / "shop" / "orders.jsonl")]
+    orders = [json.loads(line) for line in (tmp_path / "shop" / "orders.jsonl").read_text(encoding='utf-8').splitlines()]
+    assert [order["users_id"] for order in orders] == [1, 1, 2, 2, 3, 3, 4, 4, 5, 5]
+
+    assert main([str(path), "-f", "sql", "-o", str(tmp_path / "dump"), "-s", "1", "-q"]) == 0
+    assert "CREATE TABLE \"orders\"" in (tmp_path / "dump.sql").read_text(encoding='utf-8')
+    assert main([str(path), "-n", "10", "-o", str(tmp_path / "bad"), "-q"]) == 1
+
+def test_cli_loads_into_sqlite(schema_file, tmp_path):
+    """Test loading straight into a SQLite database"""
+    import sqlite3
+    database = tmp_path / "people.db"
+    assert main([str(schema_file), "-n", "120", "--database", f"sqlite:///{database}", "--table", "people",
+                 "-s", "3", "-w", "2", "--shard-size", "50", "--batch-size", "40", "-q"]) == 0
+    assert sqlite3.connect(str(database)).execute("SELECT COUNT(DISTINCT mail) FROM people").fetchone()[0] > 100
+    assert main([str(schema_file), "-n", "10", "--database", f"sqlite:///{database}", "-q"]) == 1
+
+def test_cli_profile(schema_file, tmp_path):
+    """Test the profile and cProfile exports"""
+    assert main([str(schema_file), "-n", "60", "-o", str(tmp_path / "out"), "-s", "1", "-q",
+                 "--profile", str(tmp_path / "profile.json"), "--cprofile", str(tmp_path / "run.prof")]) == 0
+    profile = json.loads((tmp_path / "profile.json").read_text(encoding='utf-8'))
+    assert profile["rows"] == 60
+    assert {column["name"] for column in profile["columns"]} == {"full_name", "mail", "digit"}
+    assert (tmp_path / "run.prof").stat().st_size > 0
+
+def test_cli_compressed_parts(schema_file, tmp_path, capsys):
+    """Test gzip part files selected by the output suffix"""
+    import gzip
+    assert main([str(schema_file), "-n", "30", "-o", str(tmp_path / "parts.gz"), "-s", "2",
+                 "--shard-size", "20", "--parts", "-q"]) == 0
+    outputs = capsys.readouterr().out.split()
+    assert outputs == [str(tmp_path / f"parts-0000{i}.csv.gz") for i in (1, 2)]
+    assert sum(len(gzip.open(path, 'rt').read().splitlines()) - 1 for path in outputs) == 30
+
+def test_cli_rolling_parts(schema_file, tmp_path, capsys):
+    """Test rolling over to numbered parts with a manifest"""
+    assert main([str(schema_file), "-n", "45", "-o", str(tmp_path / "users"), "-s", "3",
+                 "--part-rows", "20", "-q"]) == 0
+    outputs = capsys.readouterr().out.split()
+    assert outputs == [str(tmp_path / f"users-0000{i}.csv") for i in (1, 2, 3)] + \
+        [str(tmp_path / "users.manifest.json")]
+    manifest = json.loads(Path(outputs[-1]).read_text(encoding='utf-8'))
+    assert [part["rows"] for part in manifest["parts"]] == [20, 20, 5]
+
+    assert main([str(schema_file), "-n", "45", "-o", str(tmp_path / "x"), "--part-rows", "20", "--parts", "-q"]) == 1
+
+def test_cli_resume(schema_file, tmp_path, capsys):
+    """Test that rerunning an interrupted --resume job finishes it with the original seed"""
+    from jobs import GenerationJob, JobStopped
+    attributes = Schema.load(str(schema_file)).attributes
+    with pytest.raises(JobStopped):
+        GenerationJob(str(tmp_path / "users"), attributes, 45, seed=8, shard_size=20).run(should_stop=lambda: True)
+
+    assert main([str(schema_file), "-n", "45", "-o", str(tmp_path / "users"), "--shard-size", "20",
+                 "--resume", "-q"]) == 0
+    assert main([str(schema_file), "-n", "45", "-o", str(tmp_path / "reference"), "--shard-size", "20",
+                 "-s", "8", "--parts", "-q"]) == 0
+    outputs = capsys.readouterr().out.split()
+    assert outputs[3] == str(tmp_path / "users.manifest.json")
+    for index in (1, 2, 3):
+        assert (tmp_path / f"users-0000{index}.csv").read_bytes() == \
+            (tmp_path / f"reference-0000{index}.csv").read_bytes()
+
+def test_cli_locale(tmp_path):
+    """Test the dataset locale option and its validation"""
+    schema = tmp_path / "schema.json"
+    schema.write_text(json.dumps({"surname": "last_name", "us_surname": {"type": "last_name", "locale": "en_US"}}))
+    assert main([str(schema), "-n", "50", "-o", str(tmp_path / "people"), "-l", "ja_JP", "-s", "1", "-q"]) == 0
+    with open(tmp_path / "people.csv", newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert all(not row["surname"].isascii() and row["us_surname"].isascii() for row in rows)
+
+    assert main([str(schema), "-n", "5", "-o", str(tmp_path / "bad"), "--locale", "xx_XX", "-q"]) == 1
+
+def test_cli_reads_saved_schema(tmp_path):
+    """Test that schema files saved by the GUI run from the command line"""
+    from schema import Schema
+    schema = Schema.from_dict({"locale": "fr_FR", "columns": [
+        {"name": "who", "type": "name"}, {"name": "tag", "type": "template", "template": "{who:slug}"},
+        {"name": "score", "type": "pyfloat", "params": {"min_value": 0, "max_value": 1}, "null_ratio": 0.5}]})
+    path = schema.save(str(tmp_path / "schema.json"))
+    assert main([str(path), "-n", "40", "-o", str(tmp_path / "out"), "-s", "1", "-q"]) == 0
+    with open(tmp_path / "out.csv", newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 40 and all(row["tag"] and row["tag"].isascii() for row in rows)
+    assert any(row["score"] == "" for row in rows) and any(row["score"] for row in rows)
+
+    path.write_text(json.dumps({"columns": [{"name": "x", "type": "random_int", "params": {"min": 5, "max": 1}}]}))
+    assert main([str(path), "-n", "5", "-o", str(tmp_path / "bad"), "-q"]) == 1
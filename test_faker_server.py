@@ -0,0 +1,97 @@
+import asyncio
+import csv
+import io
+import json
+from faker_data import FakerData
+from faker_server import FakerServer
+
+COLUMNS = {"full_name": "name", "mail": "email", "digit": "random_digit"}
+
+async def request(port, method, path, payload=None):
+    """Minimal HTTP client: returns the status, headers and the de-chunked body"""
+    reader, writer = await asyncio.open_connection("127.0.0.1", port)
+    body = json.dumps(payload).encode('utf-8') if payload is not None else b""
+    writer.write(f"{method} {path} HTTP/1.1\r\nHost: test\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+    head = (await reader.readuntil(b"\r\n\r\n")).decode('latin-1').split("\r\n")
+    status = int(head[0].split()[1])
+    headers = {name.lower(): value.strip() for name, _, value in (line.partition(":") for line in head[1:] if line)}
+    if headers.get("transfer-encoding") == "chunked":
+        data = b""
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            chunk = await reader.readexactly(size + 2)
+            if size == 0:
+                break
+            data += chunk[:-2]
+    else:
+        data = await reader.read()
+    writer.close()
+    return status, headers, data
+
+def serve(test, **kwargs):
+    async def run():
+        server = FakerServer(port=0, workers=1, chunk_size=50, **kwargs)
+        _, port = await server.start()
+        try:
+            return await test(server, port)
+        finally:
+            await server.close()
+    return asyncio.run(run())
+
+def test_streams_ndjson_like_sharded_generation():
+    """Test a chunked NDJSON response matching shard generation with the same seed"""
+    async def test(server, port):
+        return await request(port, "POST", "/generate", {"columns": COLUMNS, "rows": 120, "seed": 5})
+    status, headers, body = serve(test)
+
+    assert status == 200
+    assert headers["content-type"] == "application/x-ndjson" and headers["x-faker-seed"] == "5"
+    attributes = [{"name": name, "type": type_name} for name, type_name in COLUMNS.items()]
+    expected = list(FakerData().iter_fake_data_parallel(attributes, 120, seed=5, workers=1, shard_size=50))
+    assert [json.loads(line) for line in body.decode('utf-8').splitlines()] == expected
+
+def test_streams_csv_and_rejects_bad_requests():
+    """Test CSV output selected by query parameters, and the error responses"""
+    async def test(server, port):
+        csv_response = await request(port, "POST", "/generate?format=csv&rows=75", {"columns": COLUMNS})
+        errors = [
+            (await request(port, "POST", "/generate", {"columns": COLUMNS, "rows": 0}))[0],
+            (await request(port, "POST", "/generate", {"columns": {"x": "no_such_type"}, "rows": 5}))[0],
+            (await request(port, "POST", "/generate", {"columns": COLUMNS, "rows": 5, "format": "xml"}))[0],
+            (await request(port, "GET", "/generate"))[0],
+            (await request(port, "GET", "/nowhere"))[0],
+        ]
+        health = await request(port, "GET", "/health")
+        return csv_response, errors, health
+    (status, headers, body), errors, health = serve(test)
+
+    assert status == 200 and headers["content-type"].startswith("text/csv")
+    records = list(csv.DictReader(io.StringIO(body.decode('utf-8'))))
+    assert len(records) == 75 and list(records[0]) == list(COLUMNS)
+    assert errors == [400, 400, 400, 405, 404]
+    assert json.loads(health[2])["served"] == 1
+
+def test_concurrency_limit_and_backpressure():
+    """Test that a client that stops reading holds its slot without finishing, and extra requests get 503"""
+    async def test(server, port):
+        reader, writer = await asyncio.open_connection("127.0.0.1", port)
+        body = json.dumps({"columns": {"bio": "text"}, "rows": 1000000}).encode()
+        writer.write(f"POST /generate HTTP/1.1\r\nContent-Length: {len(body)}\r\n\r\n".encode() + body)
+        for _ in range(100):
+            if server.active:
+                break
+            await asyncio.sleep(0.05)
+        rejected = await request(port, "POST", "/generate", {"columns": COLUMNS, "rows": 5})
+        await asyncio.sleep(0.5)
+        still_active = server.active
+        writer.close()
+        for _ in range(100):
+            if not server.active:
+                break
+            await asyncio.sleep(0.05)
+        return rejected, still_active, server.active, server.served
+    (status, headers, _), still_active, active_after, served = serve(test, max_concurrent=1)
+
+    assert status == 503 and headers["retry-after"] == "1"
+    assert still_active == 1
+    assert active_after == 0 and served == 0
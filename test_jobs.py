@@ -0,0 +1,71 @@
+import pytest
+import json
+from jobs import GenerationJob, JobStopped
+from faker_data import shard_seed
+
+ATTRIBUTES = [{"name": "full_name", "type": "name"}, {"name": "mail", "type": "email"},
+              {"name": "digit", "type": "random_digit"}]
+
+def run_uninterrupted(directory, **kwargs):
+    directory.mkdir()
+    return GenerationJob(str(directory / "users"), ATTRIBUTES, 95, seed=11, shard_size=20, **kwargs).run()
+
+def test_resumed_job_matches_uninterrupted_run(tmp_path):
+    """Test stopping a job after two shards and resuming it from the checkpoint"""
+    expected = run_uninterrupted(tmp_path / "reference")
+
+    file_name = str(tmp_path / "users")
+    job = GenerationJob.open(file_name, ATTRIBUTES, 95, seed=11, shard_size=20)
+    progress = []
+    with pytest.raises(JobStopped):
+        job.run(progress=lambda done, total: progress.append((done, total)), should_stop=lambda: len(progress) == 2)
+    assert progress == [(20, 95), (40, 95)]
+    checkpoint = json.loads((tmp_path / "users.checkpoint.json").read_text(encoding='utf-8'))
+    assert checkpoint["rows_done"] == 40
+    assert [(shard["index"], shard["seed"]) for shard in checkpoint["shards"]] == \
+        [(0, shard_seed(11, 0)), (1, shard_seed(11, 1))]
+    assert sorted(path.name for path in tmp_path.iterdir() if path.is_file()) == \
+        ["users-00001.csv", "users-00002.csv", "users.checkpoint.json"]
+
+    # Without a seed the checkpoint's is used
+    resumed = GenerationJob.open(file_name, ATTRIBUTES, 95, shard_size=20)
+    assert resumed.rows_done == 40
+    parts = resumed.run()
+    assert [part.read_bytes() for part in parts] == [part.read_bytes() for part in expected]
+    assert not (tmp_path / "users.checkpoint.json").exists()
+    manifest = json.loads((tmp_path / "users.manifest.json").read_text(encoding='utf-8'))
+    assert manifest["rows"] == 95 and len(manifest["parts"]) == 5
+
+def test_damaged_parts_are_generated_again(tmp_path):
+    """Test that a checkpointed part that was removed, truncated or changed is regenerated on resume"""
+    expected = run_uninterrupted(tmp_path / "reference", compression="gzip")
+
+    file_name = str(tmp_path / "users")
+    with pytest.raises(JobStopped):
+        GenerationJob(file_name, ATTRIBUTES, 95, seed=11, shard_size=20, compression="gzip").run(
+            should_stop=lambda: True)
+    (tmp_path / "users-00001.csv.gz").write_bytes(b"")
+
+    resumed = GenerationJob.resume(file_name)
+    assert resumed.completed == {}
+    parts = resumed.run(workers=2)
+    assert [part.read_bytes() for part in parts] == [part.read_bytes() for part in expected]
+
+    # A part changed in place keeps its size, but not its checksum
+    with pytest.raises(JobStopped):
+        GenerationJob(str(tmp_path / "same"), ATTRIBUTES, 95, seed=11, shard_size=20).run(should_stop=lambda: True)
+    part = tmp_path / "same-00001.csv"
+    part.write_bytes(part.read_bytes().replace(b"\n", b"\r", 1))
+    assert GenerationJob.resume(str(tmp_path / "same")).completed == {}
+
+def test_checkpoint_of_another_job(tmp_path):
+    """Test that a checkpoint is only resumed by a job with the same settings"""
+    file_name = str(tmp_path / "users")
+    with pytest.raises(JobStopped):
+        GenerationJob(file_name, ATTRIBUTES, 95, seed=11, shard_size=20).run(should_stop=lambda: True)
+    with pytest.raises(ValueError):
+        GenerationJob.open(file_name, ATTRIBUTES, 100, seed=11, shard_size=20)
+    with pytest.raises(ValueError):
+        GenerationJob.open(file_name, ATTRIBUTES, 95, seed=12, shard_size=20)
+    with pytest.raises(ValueError):
+        GenerationJob(file_name, [{"name": "mail", "type": "email", "unique": True}], 10)
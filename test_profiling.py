@@ -0,0 +1,53 @@
+import json
+import pstats
+from faker_data import FakerData
+from file_handler import FileHandler
+from profiling import GenerationProfile, ACTIVE_PROFILE, cprofile_to
+
+ATTRIBUTES = [{"name": "addr", "type": "address"}, {"name": "digit", "type": "random_digit"}]
+
+def test_profile_times_columns_and_writes(tmp_path):
+    """Test per-column, per-stage and per-flush timings of a streamed write"""
+    profile = GenerationProfile()
+    plan = profile.instrument(FakerData(seed=1).compile_plan(ATTRIBUTES))
+    with profile.activate():
+        output = FileHandler.write_csv_stream(str(tmp_path / "out"), plan.names,
+                                              profile.track_rows(plan.iter_records(500)), chunk_size=100)
+    assert ACTIVE_PROFILE.get() is None
+
+    summary = profile.summary()
+    assert summary["rows"] == 500
+    assert summary["writes"] == {"flushes": 5, "bytes": output.stat().st_size}
+    assert sorted(stats["name"] for stats in summary["columns"]) == ["addr", "digit"]
+    assert summary["columns"][0]["seconds"] >= summary["columns"][1]["seconds"]
+    assert all(stats["calls"] == 500 for stats in summary["columns"])
+    assert sum(summary["stages"].values()) <= summary["wall_seconds"] + 1e-6
+
+    exported = json.loads(profile.export_json(str(tmp_path / "profile.json")).read_text(encoding='utf-8'))
+    assert exported["rows"] == 500
+
+def test_profile_counts_job_and_part_rows(tmp_path):
+    """Test that rows written as shard parts, by jobs or part runs, count in the profile"""
+    from jobs import GenerationJob
+    profile = GenerationProfile()
+    with profile.activate():
+        GenerationJob(str(tmp_path / "job"), ATTRIBUTES, 45, seed=3, shard_size=20).run()
+        FakerData().write_parallel_parts(str(tmp_path / "parts"), ATTRIBUTES, 30, seed=3, workers=1, shard_size=20)
+
+    summary = profile.summary()
+    assert summary["rows"] == 75 and summary["rows_per_sec"] > 0
+    assert all(stats["calls"] == 75 for stats in summary["columns"])
+
+def test_instrumented_plan_keeps_unique_columns():
+    """Test that timing wrappers do not hide unique columns from capacity checks"""
+    profile = GenerationProfile()
+    plan = profile.instrument(FakerData().compile_plan([{"name": "flag", "type": "boolean", "unique": True}]))
+    assert len(plan.unique_columns) == 1
+    assert len(plan.generate(2)) == 2
+
+def test_cprofile_dump(tmp_path):
+    """Test the cProfile export"""
+    path = tmp_path / "run.prof"
+    with cprofile_to(str(path)):
+        FakerData(seed=2).compile_plan(ATTRIBUTES).generate(50)
+    assert pstats.Stats(str(path)).total_calls > 0
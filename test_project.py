@@ -1,6 +1,9 @@
 import pytest
 import os
-from project import FakerData, FileHandler
+import subprocess
+import sys
+from project import FakerData, FileHandler, GenerationWorker
+from faker_data import split_shards, records_from_columns, FingerprintSet, UniquenessError, fingerprint
 import tempfile
 import shutil
 import json
@@ -183,4 +186,632 @@ def test_error_handling_invalid_path(file_handler):
         file_handler.write_csv("/invalid/path/test", header, test_data)
     
     with pytest.raises(Exception):
-        file_handler.write_json("/invalid/path/test", test_data)
\ No newline at end of file
+        file_handler.write_json("/invalid/path/test", test_data)
+
+def test_compile_plan_binds_generators_in_column_order(faker_data):
+    """Test that a compiled plan keeps column names and resolves each type once"""
+    attributes = [
+        {"name": "full_name", "type": "name"},
+        {"name": "digit", "type": "random_digit"},
+    ]
+    plan = faker_data.compile_plan(attributes)
+
+    assert plan.names == ["full_name", "digit"]
+    assert plan.generators == [faker_data.functions_by_type["name"], faker_data.functions_by_type["random_digit"]]
+
+    records = plan.generate(20)
+    assert len(records) == 20
+    assert all(list(record) == ["full_name", "digit"] for record in records)
+    assert all(0 <= record["digit"] <= 9 for record in records)
+
+def test_compile_plan_invalid_type(faker_data):
+    """Test that unknown types are rejected when the plan is compiled"""
+    with pytest.raises(ValueError, match="invalid_type"):
+        faker_data.compile_plan([{"name": "x", "type": "invalid_type"}])
+
+def test_iter_fake_data_is_lazy(faker_data):
+    """Test that streaming generation validates eagerly and yields records on demand"""
+    with pytest.raises(ValueError):
+        faker_data.iter_fake_data(["invalid_type"], 5)
+
+    records = faker_data.iter_fake_data(["name", "email"], 3)
+    assert not isinstance(records, list)
+    assert [list(record) for record in records] == [["name", "email"]] * 3
+
+def test_csv_stream_file_creation(faker_data, file_handler, temp_dir):
+    """Test streaming CSV output from a generator across several chunks"""
+    file_name = Path(temp_dir) / "stream_output"
+    records = faker_data.iter_fake_data(["name", "random_digit"], 25)
+
+    output_path = file_handler.write_csv_stream(str(file_name), ["name", "random_digit"], records, chunk_size=10)
+
+    assert output_path == file_name.with_suffix('.csv')
+    with open(output_path, 'r', newline='', encoding='utf-8') as f:
+        saved_data = list(csv.DictReader(f))
+    assert len(saved_data) == 25
+    assert all(record["random_digit"].isdigit() for record in saved_data)
+
+@pytest.mark.parametrize("test_data", [
+    [],
+    [{"name": "John Doe", "email": "john@example.com"}],
+    [{"name": "João Señor", "tags": ["a", "b"]}, {"name": "Jane Doe", "tags": []}],
+])
+def test_json_stream_matches_write_json(file_handler, temp_dir, test_data):
+    """Test that streamed JSON is byte-identical to the in-memory writer"""
+    file_handler.write_json(str(Path(temp_dir) / "full"), test_data)
+    file_handler.write_json_stream(str(Path(temp_dir) / "streamed"), iter(test_data), chunk_size=1)
+
+    expected = (Path(temp_dir) / "full.json").read_text(encoding='utf-8')
+    assert (Path(temp_dir) / "streamed.json").read_text(encoding='utf-8') == expected
+
+def test_json_stream_encodes_decimal_and_dates(faker_data, file_handler, temp_dir):
+    """Test that provider values such as Decimal and date are written as JSON"""
+    records = faker_data.iter_fake_data(["latitude", "date_of_birth"], 5)
+    output_path = file_handler.write_json_stream(str(Path(temp_dir) / "typed"), records)
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        saved_data = json.load(f)
+    assert len(saved_data) == 5
+    assert all(isinstance(record["latitude"], float) for record in saved_data)
+    assert all(isinstance(record["date_of_birth"], str) for record in saved_data)
+
+def test_split_shards():
+    """Test that shards cover every record exactly once"""
+    assert split_shards(25, 10) == [(0, 10), (1, 10), (2, 5)]
+    assert split_shards(0, 10) == []
+    with pytest.raises(ValueError):
+        split_shards(10, 0)
+
+def test_parallel_generation_is_reproducible(faker_data, file_handler, temp_dir):
+    """Test that the same seed gives byte-identical output whatever the worker count"""
+    attributes = [{"name": "name", "type": "name"}, {"name": "email", "type": "email"}]
+    outputs = []
+    for run, workers in enumerate([1, 2, 2]):
+        records = faker_data.iter_fake_data_parallel(attributes, 50, seed=42, workers=workers, shard_size=20)
+        output_path = file_handler.write_csv_stream(str(Path(temp_dir) / f"run_{run}"), ["name", "email"], records)
+        outputs.append(output_path.read_bytes())
+
+    assert outputs[0] == outputs[1] == outputs[2]
+    assert outputs[0].count(b"\n") == 51
+
+    # Adjacent seeds share no shards, not even shifted by one
+    other_seed = list(faker_data.iter_fake_data_parallel(attributes, 60, seed=43, workers=1, shard_size=20))
+    same_seed = list(faker_data.iter_fake_data_parallel(attributes, 60, seed=42, workers=1, shard_size=20))
+    assert not any(record in same_seed for record in other_seed)
+
+def test_parallel_part_files(faker_data, temp_dir):
+    """Test that each shard is written to its own numbered part file"""
+    attributes = [{"name": "word", "type": "word"}]
+    file_name = str(Path(temp_dir) / "parts")
+
+    parts = faker_data.write_parallel_parts(file_name, attributes, 45, seed=7, workers=2, shard_size=20)
+
+    assert [part.name for part in parts] == ["parts-00001.csv", "parts-00002.csv", "parts-00003.csv"]
+    row_counts = []
+    for part in parts:
+        with open(part, 'r', newline='', encoding='utf-8') as f:
+            row_counts.append(len(list(csv.DictReader(f))))
+    assert row_counts == [20, 20, 5]
+
+def test_generation_worker_reports_progress(faker_data, temp_dir):
+    """Test that the GUI worker writes the file and reports progress up to the total"""
+    plan = faker_data.compile_plan([{"name": "word", "type": "word"}])
+    worker = GenerationWorker(plan, 250, str(Path(temp_dir) / "worker"), "json")
+    progress, finished = [], []
+    worker.progress.connect(progress.append)
+    worker.finished.connect(finished.append)
+
+    worker.run()
+
+    assert progress[-1] == 250
+    assert finished == [str(Path(temp_dir) / "worker.json")]
+    with open(finished[0], 'r', encoding='utf-8') as f:
+        assert len(json.load(f)) == 250
+
+def test_generation_worker_cancel_removes_partial_file(faker_data, temp_dir, caplog):
+    """Test that cancelling mid-run stops cleanly and deletes the partial output"""
+    plan = faker_data.compile_plan([{"name": "word", "type": "word"}])
+    worker = GenerationWorker(plan, 100000, str(Path(temp_dir) / "cancelled"), "csv")
+    cancelled, finished = [], []
+    worker.progress.connect(lambda count: worker.cancel())
+    worker.cancelled.connect(lambda: cancelled.append(True))
+    worker.finished.connect(finished.append)
+
+    worker.run()
+
+    assert cancelled == [True]
+    assert finished == []
+    assert not (Path(temp_dir) / "cancelled.csv").exists()
+    assert not [record for record in caplog.records if record.levelname == "ERROR"]
+
+def test_generation_worker_failure_removes_partial_file(faker_data, temp_dir):
+    """Test that a run failing mid-write reports the error and deletes the partial output"""
+    from faker_data import RecordPlan
+    calls = iter(range(10000))
+
+    def word():
+        if next(calls) == 5000:
+            raise RuntimeError("provider failed")
+        return "word"
+
+    plan = RecordPlan(["word"], [word], ["word"])
+    worker = GenerationWorker(plan, 10000, str(Path(temp_dir) / "failed"), "csv")
+    failed, finished = [], []
+    worker.failed.connect(failed.append)
+    worker.finished.connect(finished.append)
+
+    worker.run()
+
+    assert failed == ["provider failed"] and finished == []
+    assert not (Path(temp_dir) / "failed.csv").exists()
+
+def test_generate_columns_fallback(faker_data):
+    """Test column generation through per-call Faker"""
+    attributes = [{"name": "who", "type": "name"}, {"name": "digit", "type": "random_digit"}]
+    columns = faker_data.generate_columns(attributes, 15, vectorized=False)
+
+    assert list(columns) == ["who", "digit"]
+    assert all(len(column) == 15 for column in columns.values())
+    records = list(records_from_columns(columns))
+    assert len(records) == 15
+    assert all(isinstance(record["who"], str) and 0 <= record["digit"] <= 9 for record in records)
+
+def test_generate_columns_vectorized():
+    """Test that the NumPy fast paths produce values in the providers' ranges and formats"""
+    pytest.importorskip("numpy")
+    attributes = [{"name": t, "type": t} for t in
+                  ["random_digit", "boolean", "latitude", "longitude", "hex_color", "mac_address", "ipv4", "date"]]
+    columns = FakerData(seed=1).generate_columns(attributes, 500)
+
+    assert all(0 <= digit <= 9 for digit in columns["random_digit"].tolist())
+    assert set(columns["boolean"].tolist()) == {True, False}
+    assert all(-90 <= lat <= 90 for lat in columns["latitude"].tolist())
+    assert all(-180 <= lng <= 180 for lng in columns["longitude"].tolist())
+    assert all(len(color) == 7 and color.startswith("#") for color in columns["hex_color"])
+    assert all(int(mac[:2], 16) % 2 == 0 and len(mac.split(":")) == 6 for mac in columns["mac_address"])
+    assert all(not ip.startswith(("0.", "127.")) and len(ip.split(".")) == 4 for ip in columns["ipv4"])
+    assert all(len(day) == 10 and day >= "1970-01-01" for day in columns["date"])
+
+    again = FakerData(seed=1).generate_columns(attributes, 500)
+    assert columns["ipv4"] == again["ipv4"]
+    assert columns["latitude"].tolist() == again["latitude"].tolist()
+
+def test_vectorized_columns_write_as_json(file_handler, temp_dir):
+    """Test that NumPy values from column batches can be written by the streaming writers"""
+    pytest.importorskip("numpy")
+    attributes = [{"name": "digit", "type": "random_digit"}, {"name": "flag", "type": "boolean"}]
+    columns = FakerData(seed=2).generate_columns(attributes, 10)
+    output_path = file_handler.write_json_stream(str(Path(temp_dir) / "columns"), records_from_columns(columns))
+
+    with open(output_path, 'r', encoding='utf-8') as f:
+        saved_data = json.load(f)
+    assert [record["digit"] for record in saved_data] == columns["digit"].tolist()
+
+def test_parquet_stream_typed_row_groups(file_handler, temp_dir):
+    """Test Parquet output with typed columns and one row group per batch"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    attributes = [{"name": t, "type": t} for t in ["name", "boolean", "random_digit", "latitude", "date", "date_of_birth"]]
+    records = FakerData(seed=3).compile_plan(attributes).iter_records(25)
+
+    output_path = file_handler.write_parquet_stream(str(Path(temp_dir) / "typed"), attributes, records, row_group_size=10)
+
+    parquet_file = pq.ParquetFile(output_path)
+    assert parquet_file.metadata.num_row_groups == 3
+    schema = parquet_file.schema_arrow
+    assert [str(schema.field(t).type) for t in ["name", "boolean", "random_digit", "latitude", "date", "date_of_birth"]] == \
+        ["string", "bool", "int64", "double", "date32[day]", "date32[day]"]
+    assert parquet_file.read().num_rows == 25
+
+def test_parquet_patterned_date_is_string(file_handler, temp_dir):
+    """Test that a date column with a pattern param is written as the formatted strings"""
+    pq = pytest.importorskip("pyarrow.parquet")
+    attributes = [{"name": "d", "type": "date", "params": {"pattern": "%d/%m/%Y"}}, {"name": "iso", "type": "date"}]
+    records = FakerData(seed=3).compile_plan(attributes).generate(5)
+
+    output_path = file_handler.write_stream("parquet", str(Path(temp_dir) / "dates"), attributes, iter(records))
+
+    table = pq.read_table(output_path)
+    assert [str(field.type) for field in table.schema] == ["string", "date32[day]"]
+    assert table.column("d").to_pylist() == [record["d"] for record in records]
+
+def test_feather_stream_roundtrip(file_handler, temp_dir):
+    """Test Arrow IPC (Feather) output through the format dispatcher"""
+    feather = pytest.importorskip("pyarrow.feather")
+    attributes = [{"name": "who", "type": "name"}, {"name": "lng", "type": "longitude"}]
+    records = list(FakerData(seed=4).compile_plan(attributes).iter_records(12))
+
+    output_path = file_handler.write_stream("feather", str(Path(temp_dir) / "arrow"), attributes, iter(records))
+
+    assert output_path.suffix == ".feather"
+    table = feather.read_table(output_path)
+    assert table.column("who").to_pylist() == [record["who"] for record in records]
+    assert table.column("lng").to_pylist() == [float(record["lng"]) for record in records]
+
+def test_write_stream_unsupported_format(file_handler, temp_dir):
+    """Test that unknown output formats are rejected"""
+    with pytest.raises(ValueError):
+        file_handler.write_stream("xml", str(Path(temp_dir) / "bad"), [{"name": "n", "type": "name"}], iter([]))
+
+def test_jsonl_stream_one_record_per_line(faker_data, file_handler, temp_dir):
+    """Test JSON Lines output: one compact, independently parseable record per line"""
+    records = list(faker_data.iter_fake_data(["name", "latitude"], 30))
+    output_path = file_handler.write_stream("jsonl", str(Path(temp_dir) / "lines"),
+                                            [{"name": "name", "type": "name"}, {"name": "latitude", "type": "latitude"}],
+                                            iter(records))
+
+    assert output_path.suffix == ".jsonl"
+    lines = output_path.read_text(encoding='utf-8').splitlines()
+    assert len(lines) == 30
+    assert all(": " not in line for line in lines)
+    assert [json.loads(line)["name"] for line in lines] == [record["name"] for record in records]
+
+@pytest.mark.parametrize("backend", ["json", "orjson"])
+def test_json_stream_compact(file_handler, temp_dir, backend):
+    """Test the compact JSON array layout with each encoder backend"""
+    if backend == "orjson":
+        pytest.importorskip("orjson")
+    test_data = [{"name": "João Señor", "n": 1}, {"name": "Jane Doe", "n": 2}]
+
+    output_path = file_handler.write_json_stream(str(Path(temp_dir) / "compact"), iter(test_data),
+                                                 chunk_size=1, compact=True, backend=backend)
+
+    expected = json.dumps(test_data, separators=(',', ':'), ensure_ascii=False)
+    assert output_path.read_text(encoding='utf-8') == expected
+
+def test_json_stream_unknown_backend(file_handler, temp_dir):
+    """Test that an unknown encoder backend is rejected"""
+    with pytest.raises(ValueError):
+        file_handler.write_json_stream(str(Path(temp_dir) / "bad"), iter([]), compact=True, backend="yaml")
+
+def test_core_import_is_lazy():
+    """Test that importing the core and listing types loads neither Qt, Faker nor optional libraries"""
+    code = (
+        "import sys, faker_data, file_handler\n"
+        "faker_data.FakerData().formatted_functionality\n"
+        "heavy = {'PyQt5', 'faker', 'numpy', 'pyarrow'} & set(sys.modules)\n"
+        "print(sorted(heavy))\n"
+        "sys.exit(1 if heavy else 0)"
+    )
+    result = subprocess.run([sys.executable, "-c", code], cwd=Path(__file__).parent, capture_output=True, text=True)
+    assert result.returncode == 0, result.stdout + result.stderr
+
+def test_providers_load_on_first_use():
+    """Test that a plan only loads the Faker providers its columns need"""
+    faker_data = FakerData(seed=5)
+    faker_data.compile_plan([{"name": "who", "type": "name"}])
+    assert {provider.__provider__ for provider in faker_data.fake.get_providers()} == {"faker.providers.person"}
+
+    faker_data.compile_plan([{"name": "mail", "type": "email"}])
+    assert {provider.__provider__ for provider in faker_data.fake.get_providers()} == \
+        {"faker.providers.person", "faker.providers.internet"}
+
+def test_providers_of_other_locales():
+    """Test types whose formats use providers outside the en_US lists in other locales"""
+    cases = {"ru_RU": ["email", "user_name"], "bg_BG": ["email"], "az_AZ": ["user_name"], "it_IT": ["ssn"],
+             "el_GR": ["ssn"], "nl_BE": ["ssn"], "en_PH": ["address", "street_address"]}
+    for locale, types in cases.items():
+        plan = FakerData(seed=0, locale=locale).compile_plan([{"name": t, "type": t} for t in types])
+        assert len(plan.generate(300)) == 300
+
+def test_unique_column_never_repeats(faker_data):
+    """Test that unique columns produce distinct values and report their retries"""
+    plan = faker_data.compile_plan([
+        {"name": "word", "type": "word", "unique": True},
+        {"name": "digit", "type": "random_digit"},
+    ])
+    records = plan.generate(500)
+
+    assert len({record["word"] for record in records}) == 500
+    stats = plan.unique_stats()
+    assert [(s["column"], s["values"]) for s in stats] == [("word", 500)]
+    assert stats[0]["retries"] > 0
+
+def test_unique_column_value_space_too_small(faker_data):
+    """Test that impossible unique columns fail before generating anything"""
+    plan = faker_data.compile_plan([{"name": "flag", "type": "boolean", "unique": True}])
+    with pytest.raises(UniquenessError, match="at most 2"):
+        plan.iter_records(3)
+
+    assert len(plan.generate(2)) == 2
+    with pytest.raises(UniquenessError):
+        plan.generate(1)
+
+    zipcodes = faker_data.compile_plan([{"name": "zip", "type": "zipcode", "unique": True}])
+    with pytest.raises(UniquenessError, match="at most 99450"):
+        zipcodes.check_capacity(99451)
+    # The en_US bounds do not apply to other locales; locale independent ones do
+    countries = [{"name": "country", "type": "country", "unique": True}]
+    with pytest.raises(UniquenessError, match="at most 243"):
+        faker_data.compile_plan(countries).check_capacity(244)
+    FakerData(locale="de_DE").compile_plan(countries).check_capacity(244)
+    with pytest.raises(UniquenessError, match="at most 2"):
+        FakerData(locale="de_DE").compile_plan([{"name": "flag", "type": "boolean", "unique": True}]).check_capacity(3)
+
+def test_unique_column_gives_up_after_max_retries(faker_data):
+    """Test the retry limit for types whose value space is not known up front"""
+    plan = faker_data.compile_plan([{"name": "color", "type": "hex_color", "unique": True, "max_retries": 0}])
+    plan.generators[0].func = lambda: "#000000"
+    plan.generate(1)
+    with pytest.raises(UniquenessError, match="0 draws"):
+        plan.generate(1)
+
+def test_fingerprint_set():
+    """Test the compact seen-set across several resizes"""
+    seen = FingerprintSet(capacity=4)
+    assert all(seen.add(fingerprint(i)) for i in range(5000))
+    assert not any(seen.add(fingerprint(i)) for i in range(5000))
+    assert len(seen) == 5000
+    assert seen.nbytes <= 5000 * 8 * 4
+
+def test_unique_columns_across_parallel_shards(faker_data):
+    """Test that values repeated in different shards are replaced during the merge"""
+    attributes = [{"name": "zip", "type": "zipcode", "unique": True}]
+    records = list(faker_data.iter_fake_data_parallel(attributes, 3000, seed=3, workers=2, shard_size=1000))
+    again = list(faker_data.iter_fake_data_parallel(attributes, 3000, seed=3, workers=1, shard_size=1000))
+
+    assert len({record["zip"] for record in records}) == 3000
+    assert records == again
+    with pytest.raises(ValueError):
+        faker_data.write_parallel_parts("unused", attributes, 10)
+
+def test_pool_column_samples_from_cached_pool(temp_dir):
+    """Test that pooled columns draw from K pre-generated values cached on disk"""
+    attributes = [{"name": "bio", "type": "text", "pool": 50}, {"name": "digit", "type": "random_digit"}]
+    faker_data = FakerData(seed=9, pool_cache_dir=temp_dir)
+    records = faker_data.compile_plan(attributes).generate(2000)
+
+    pool = faker_data.get_pool("text", 50, 9)
+    assert len(pool) == len(set(pool)) == 50
+    assert {record["bio"] for record in records} <= set(pool)
+    assert len(list(Path(temp_dir).glob("text-en_US-9-50-*.json"))) == 1
+
+    # A fresh instance loads the pool from disk instead of calling Faker
+    cached = FakerData(seed=9, pool_cache_dir=temp_dir)
+    cached.get_generator = None
+    assert cached.get_pool("text", 50, 9) == pool
+    assert FakerData(seed=9, pool_cache_dir=temp_dir).compile_plan(attributes).generate(2000) == records
+
+    # Decimals and dates come back from the JSON cache with their types
+    for type_name in ("latitude", "date_of_birth"):
+        values = faker_data.get_pool(type_name, 20, 9)
+        assert FakerData(pool_cache_dir=temp_dir).get_pool(type_name, 20, 9) == values
+    assert type(cached.get_pool("latitude", 20, 9)[0]).__name__ == "Decimal"
+
+def test_pool_column_zipf_distribution(temp_dir):
+    """Test that the zipf distribution favours the first pool values"""
+    faker_data = FakerData(seed=1, pool_cache_dir=temp_dir)
+    plan = faker_data.compile_plan([{"name": "co", "type": "company", "pool": 100, "distribution": "zipf"}])
+    pool = faker_data.get_pool("company", 100, 1)
+    values = [record["co"] for record in plan.generate(20000)]
+
+    assert values.count(pool[0]) > values.count(pool[9]) > values.count(pool[99])
+
+def test_pool_column_options_are_validated(faker_data, temp_dir):
+    """Test invalid pool options"""
+    faker_data.pool_cache_dir = Path(temp_dir)
+    with pytest.raises(ValueError, match="pooled and unique"):
+        faker_data.compile_plan([{"name": "w", "type": "word", "pool": 10, "unique": True}])
+    with pytest.raises(ValueError, match="distribution"):
+        faker_data.compile_plan([{"name": "w", "type": "word", "pool": 10, "distribution": "normal"}])
+    with pytest.raises(ValueError, match="greater than 0"):
+        faker_data.compile_plan([{"name": "w", "type": "word", "pool": -1}])
+
+    # Small value spaces cap the pool size
+    assert sorted(faker_data.get_pool("boolean", 10)) == [False, True]
+
+def test_pool_columns_across_parallel_shards(temp_dir):
+    """Test that every shard samples the same pool and output does not depend on workers"""
+    faker_data = FakerData(pool_cache_dir=temp_dir)
+    attributes = [{"name": "addr", "type": "address", "pool": 20}]
+    records = list(faker_data.iter_fake_data_parallel(attributes, 900, seed=4, workers=2, shard_size=300))
+    again = list(faker_data.iter_fake_data_parallel(attributes, 900, seed=4, workers=1, shard_size=300))
+
+    assert records == again
+    assert {record["addr"] for record in records} <= set(faker_data.get_pool("address", 20, 4))
+
+def test_generation_worker_profile(faker_data, temp_dir):
+    """Test that a profiled worker reports its slowest columns"""
+    from profiling import GenerationProfile
+    plan = faker_data.compile_plan([{"name": "bio", "type": "text"}, {"name": "digit", "type": "random_digit"}])
+    worker = GenerationWorker(plan, 200, str(Path(temp_dir) / "profiled"), "jsonl", GenerationProfile())
+    worker.run()
+
+    assert worker.profile.rows == 200
+    assert worker.profile.slowest_columns(1)[0]["name"] == "bio"
+
+def test_job_worker_resumes_after_cancel(faker_data, temp_dir):
+    """Test that a cancelled GUI job keeps its checkpoint and the next run finishes it"""
+    from project import JobWorker
+    from jobs import GenerationJob
+    attributes = [{"name": "word", "type": "word"}]
+    plan = faker_data.compile_plan(attributes)
+    file_name = str(Path(temp_dir) / "job")
+
+    worker = JobWorker(GenerationJob.open(file_name, attributes, 100, "jsonl", shard_size=30), plan)
+    cancelled = []
+    worker.progress.connect(lambda count: worker.cancel())
+    worker.cancelled.connect(lambda: cancelled.append(True))
+    worker.run()
+    assert cancelled == [True]
+    assert (Path(temp_dir) / "job.checkpoint.json").exists()
+
+    worker = JobWorker(GenerationJob.open(file_name, attributes, 100, "jsonl", shard_size=30), plan)
+    progress, finished = [], []
+    worker.progress.connect(progress.append)
+    worker.finished.connect(finished.append)
+    worker.run()
+    assert progress == [60, 90, 100]
+    assert finished == [str(Path(temp_dir) / "job.manifest.json")]
+
+def test_locale_mix_weights_and_row_alignment():
+    """Test that a locale mix follows its weights and that columns with the same weights agree per row"""
+    from faker_data import LocaleMix
+    first = LocaleMix([lambda: "a", lambda: "b"], [3, 1], seed="s")
+    second = LocaleMix([lambda: "a", lambda: "b"], [3, 1], seed="s")
+    values = [first() for _ in range(8000)]
+
+    assert 0.7 < values.count("a") / len(values) < 0.8
+    assert values == [second() for _ in range(8000)]
+
+def test_locale_columns(temp_dir):
+    """Test dataset and per-column locales, weighted mixes and their validation"""
+    def is_japanese(value):
+        return any(ord(char) > 0x3000 for char in value)
+
+    faker_data = FakerData(seed=3, pool_cache_dir=temp_dir, locale="ja_JP")
+    attributes = [{"name": "ja", "type": "last_name"}, {"name": "us", "type": "last_name", "locale": "en_US"},
+                  {"name": "mix", "type": "last_name", "locale": {"ja_JP": 1, "en_US": 1}},
+                  {"name": "pool", "type": "last_name", "locale": "ja_JP:1,en_US:1", "pool": 30}]
+    records = faker_data.compile_plan(attributes).generate(400)
+
+    assert all(is_japanese(record["ja"]) and not is_japanese(record["us"]) for record in records)
+    assert 100 < sum(is_japanese(record["mix"]) for record in records) < 300
+    assert [is_japanese(record["mix"]) for record in records] == [is_japanese(record["pool"]) for record in records]
+    assert FakerData(seed=3, pool_cache_dir=temp_dir, locale="ja_JP").compile_plan(attributes).generate(400) == records
+    # Unique columns redraw in the row's locale, so retries do not shift the mix
+    plan = FakerData(seed=2, locale="ja_JP:1,en_US:1").compile_plan(
+        [{"name": "ja", "type": "last_name", "unique": True}, {"name": "other", "type": "name"}])
+    assert all(is_japanese(record["ja"]) == is_japanese(record["other"]) for record in plan.generate(60))
+    assert plan.unique_stats()[0]["retries"] > 0
+    # Unseeded plans keep the columns of one mix on the same locale per row
+    unseeded = FakerData(locale="ja_JP:1,en_US:1").compile_plan(attributes[:1] + [{"name": "other", "type": "name"}])
+    assert all(is_japanese(record["ja"]) == is_japanese(record["other"]) for record in unseeded.generate(200))
+
+    with pytest.raises(ValueError, match="Unknown locale"):
+        FakerData(locale="xx_XX")
+    with pytest.raises(ValueError, match="greater than 0"):
+        faker_data.compile_plan([{"name": "w", "type": "word", "locale": "de_DE:0"}])
+    with pytest.raises(ValueError, match="not available for locale de_DE"):
+        faker_data.compile_plan([{"name": "z", "type": "zipcode", "locale": "de_DE"}])
+
+def test_locale_mix_across_parallel_shards(temp_dir):
+    """Test that a dataset locale mix reaches worker processes and does not depend on the worker count"""
+    from faker_data import with_locale
+    faker_data = FakerData(pool_cache_dir=temp_dir)
+    attributes = with_locale([{"name": "name", "type": "name"}], "de_DE:1,fr_FR:1")
+    records = list(faker_data.iter_fake_data_parallel(attributes, 600, seed=5, workers=2, shard_size=200))
+
+    assert records == list(faker_data.iter_fake_data_parallel(attributes, 600, seed=5, workers=1, shard_size=200))
+    assert attributes[0]["locale"] == {"de_DE": 1.0, "fr_FR": 1.0}
+
+def test_parallel_paths_use_instance_locale(temp_dir):
+    """Test that the parallel paths generate in the instance's locale, as compile_plan does"""
+    def is_japanese(value):
+        return any(ord(char) > 0x3000 for char in value)
+
+    faker_data = FakerData(seed=1, pool_cache_dir=temp_dir, locale="ja_JP")
+    attributes = [{"name": "n", "type": "last_name"}]
+    records = list(faker_data.iter_fake_data_parallel(attributes, 30, seed=2, workers=1, shard_size=10))
+    assert all(is_japanese(record["n"]) for record in records)
+
+    parts = faker_data.write_parallel_parts(os.path.join(temp_dir, "names"), attributes, 20, seed=2, workers=1,
+                                            shard_size=10)
+    with open(parts[0], encoding="utf-8") as f:
+        rows = list(csv.DictReader(f))
+    assert len(rows) == 10 and all(is_japanese(row["n"]) for row in rows)
+
+def test_parameterized_columns(temp_dir):
+    """Test Faker method parameters, including ISO date ranges and pooled parameterized columns"""
+    from datetime import date
+    faker_data = FakerData(seed=2, pool_cache_dir=temp_dir)
+    records = faker_data.compile_plan([
+        {"name": "die", "type": "random_int", "params": {"min": 1, "max": 6}},
+        {"name": "joined", "type": "date_between", "params": {"start_date": "2020-01-01", "end_date": "2020-01-31"}},
+        {"name": "bio", "type": "text", "params": {"max_nb_chars": 30}},
+        {"name": "short", "type": "text", "params": {"max_nb_chars": 20}, "pool": 10},
+    ]).generate(300)
+
+    assert {record["die"] for record in records} == {1, 2, 3, 4, 5, 6}
+    assert all(date(2020, 1, 1) <= record["joined"] <= date(2020, 1, 31) for record in records)
+    assert all(len(record["bio"]) <= 30 and len(record["short"]) <= 20 for record in records)
+    assert faker_data.get_pool("text", 10, 2, {"max_nb_chars": 20}) != faker_data.get_pool("text", 10, 2)
+
+    with pytest.raises(ValueError, match="Column 'die': Invalid params for random_int"):
+        faker_data.compile_plan([{"name": "die", "type": "random_int", "params": {"low": 1}}])
+
+def test_template_and_nullable_columns(faker_data):
+    """Test columns built from earlier columns of the row, and null ratios"""
+    attributes = [
+        {"name": "full_name", "type": "name"},
+        {"name": "email", "type": "template", "template": "{full_name:last|slug}@example.com"},
+        {"name": "age", "type": "random_int", "params": {"min": 18, "max": 99}, "null_ratio": 0.3},
+        {"name": "label", "type": "template", "template": "{email:upper} ({age:>3})"},
+    ]
+    records = FakerData(seed=6).compile_plan(attributes).generate(1000)
+
+    for record in records:
+        assert record["email"].split("@")[0] in record["full_name"].lower().replace(" ", ".") + "."
+        assert record["label"].startswith(record["email"].upper())
+    assert 200 < sum(record["age"] is None for record in records) < 400
+    # Templates read the generated value even where the column itself is null
+    assert all(not record["label"].endswith("(None)") for record in records)
+    assert list(records_from_columns(FakerData(seed=6).generate_columns(attributes, 1000))) == records
+
+    with pytest.raises(ValueError, match="only use columns before it"):
+        faker_data.compile_plan([{"name": "x", "type": "template", "template": "{y}"}, {"name": "y", "type": "word"}])
+    with pytest.raises(ValueError, match="cannot use unique"):
+        faker_data.compile_plan([{"name": "y", "type": "word", "unique": True},
+                                 {"name": "x", "type": "template", "template": "{y}"}])
+    with pytest.raises(ValueError, match="between 0 and 1"):
+        faker_data.compile_plan([{"name": "w", "type": "word", "null_ratio": 1.5}])
+
+def test_preview_model_generates_rows_on_demand(temp_dir):
+    """Test that the preview serves a million virtual rows from a few deterministic blocks"""
+    from PyQt5.QtCore import Qt
+    from project import PreviewModel, PREVIEW_POOL_SIZE
+    attributes = [{"name": "who", "type": "name"}, {"name": "die", "type": "random_int", "params": {"min": 1, "max": 6}}]
+    model = PreviewModel(rows=1000000, block_size=20, cache_blocks=3, seed=4)
+    model.faker_data.pool_cache_dir = Path(temp_dir)
+    model.set_attributes(attributes)
+
+    assert (model.rowCount(), model.columnCount()) == (1000000, 2)
+    assert model.headerData(0, Qt.Horizontal) == "who" and model.headerData(41, Qt.Vertical) == "42"
+    last = model.data(model.index(999999, 0))
+    first = [model.data(model.index(row, 0)) for row in range(100)]
+    assert model.blocks_generated == 6 and len(model._blocks) == 3
+    # Blocks dropped from the cache come back the same, and match parallel generation
+    assert model.data(model.index(999999, 0)) == last
+    expected = FakerData().iter_fake_data_parallel(attributes, 100, seed=4, workers=1, shard_size=20)
+    assert first == [record["who"] for record in expected]
+
+    with pytest.raises(ValueError):
+        model.set_attributes([{"name": "x", "type": "template", "template": "{y}"}])
+    assert model.columnCount() == 2
+    model.set_attributes([])
+    assert model.rowCount() == 0
+
+    # Large pools are capped, so edits never wait for them
+    model.set_attributes([{"name": "bio", "type": "text", "pool": 100000}])
+    assert model.attributes[0]["pool"] == PREVIEW_POOL_SIZE
+    assert len({model.data(model.index(row, 0)) for row in range(200)}) <= PREVIEW_POOL_SIZE
+    assert not list(Path(temp_dir).iterdir())  # preview pools stay in memory
+
+def test_compact_record_table(temp_dir):
+    """Test that RecordTable rows read like dicts and take less memory than dicts"""
+    import tracemalloc
+    from faker_data import RecordTable
+    selected_types = ["name", "email", "random_digit"]
+    records = FakerData(seed=8).generate_fake_data(selected_types, 200)
+    table = FakerData(seed=8).generate_fake_data(selected_types, 200, compact=True)
+
+    assert isinstance(table, RecordTable) and len(table) == 200 and table == records
+    assert table[0]["email"] == records[0]["email"] and table[-1].get("missing", 1) == 1
+    assert list(table[5].keys()) == selected_types and dict(table[5]) == records[5]
+    assert table[10:20] == records[10:20] and table.column("name") == [r["name"] for r in records]
+    assert list(records_from_columns(table.columns())) == records
+
+    # Writers take compact records as they are
+    FileHandler.write_json(os.path.join(temp_dir, "table"), table)
+    with open(os.path.join(temp_dir, "table.json"), encoding="utf-8") as f:
+        assert json.load(f) == records
+
+    plan = FakerData(seed=8, pool_cache_dir=Path(temp_dir)).compile_plan(
+        [{"name": t, "type": t, "pool": 10} for t in selected_types])
+    sizes = []
+    for generate in (plan.generate, plan.generate_table):
+        tracemalloc.start()
+        rows = generate(5000)
+        sizes.append(tracemalloc.get_traced_memory()[0])
+        tracemalloc.stop()
+        del rows
+    assert sizes[1] < sizes[0] * 0.7
@@ -0,0 +1,91 @@
+import pytest
+import csv
+import sqlite3
+from relational import RelationalGenerator, fan_out_sampler, sql_literal
+
+SCHEMA = {
+    "tables": [
+        {"name": "users", "rows": 30, "columns": {"full_name": "name", "mail": "email"}},
+        {"name": "products", "rows": 8, "columns": {"label": {"type": "word", "unique": True}}},
+        {"name": "orders", "parent": "users", "fan_out": {"distribution": "poisson", "mean": 2},
+         "columns": {"placed": "date"}},
+        {"name": "line_items", "parent": "orders", "fan_out": {"distribution": "uniform", "min": 1, "max": 4},
+         "references": {"product_id": "products"}, "columns": {"quantity": "random_digit"}},
+    ]
+}
+
+def generate_all(generator):
+    return {table.name: list(rows) for table, rows in generator.iter_tables()}
+
+def test_child_rows_reference_existing_parents():
+    """Test sequential keys, fan-out and references"""
+    tables = generate_all(RelationalGenerator(SCHEMA, seed=1))
+
+    assert [row["id"] for row in tables["users"]] == list(range(1, 31))
+    assert [row["id"] for row in tables["orders"]] == list(range(1, len(tables["orders"]) + 1))
+    assert all(1 <= row["users_id"] <= 30 for row in tables["orders"])
+    assert [row["users_id"] for row in tables["orders"]] == sorted(row["users_id"] for row in tables["orders"])
+
+    per_order = {}
+    for row in tables["line_items"]:
+        per_order[row["orders_id"]] = per_order.get(row["orders_id"], 0) + 1
+        assert 1 <= row["product_id"] <= 8
+    assert set(per_order) == {row["id"] for row in tables["orders"]}
+    assert all(1 <= count <= 4 for count in per_order.values())
+    assert len({row["label"] for row in tables["products"]}) == 8
+
+def test_relational_generation_is_reproducible():
+    """Test that a seed fixes every table"""
+    assert generate_all(RelationalGenerator(SCHEMA, seed=7)) == generate_all(RelationalGenerator(SCHEMA, seed=7))
+
+def test_fan_out_distributions():
+    """Test the fan-out samplers"""
+    import random
+    rng = random.Random(0)
+    assert {fan_out_sampler(3, rng)() for _ in range(10)} == {3}
+    assert {fan_out_sampler({"distribution": "uniform", "min": 2, "max": 3}, rng)() for _ in range(100)} == {2, 3}
+    poisson = fan_out_sampler({"distribution": "poisson", "mean": 4}, rng)
+    assert 3.5 < sum(poisson() for _ in range(5000)) / 5000 < 4.5
+    with pytest.raises(ValueError):
+        fan_out_sampler({"distribution": "pareto"}, rng)
+
+def test_invalid_relational_schemas():
+    """Test schema validation"""
+    with pytest.raises(ValueError, match="cycle"):
+        RelationalGenerator({"tables": [
+            {"name": "a", "parent": "b"}, {"name": "b", "parent": "a"},
+        ]})
+    with pytest.raises(ValueError, match="unknown table"):
+        RelationalGenerator({"tables": [{"name": "a", "rows": 1, "references": {"b_id": "b"}}]})
+    with pytest.raises(ValueError, match="rows or a parent"):
+        RelationalGenerator({"tables": [{"name": "a"}]})
+    with pytest.raises(ValueError, match="Invalid data type"):
+        RelationalGenerator({"tables": [{"name": "a", "rows": 1, "columns": {"x": "nope"}}]})
+
+    generator = RelationalGenerator(SCHEMA, seed=1)
+    with pytest.raises(ValueError, match="before 'orders'"):
+        generator.iter_rows("orders")
+
+def test_write_files_one_per_table(tmp_path):
+    """Test writing one CSV file per table"""
+    generator = RelationalGenerator(SCHEMA, seed=2)
+    outputs = generator.write_files(str(tmp_path / "shop"), "csv")
+
+    assert [path.name for path in outputs] == ["users.csv", "products.csv", "orders.csv", "line_items.csv"]
+    with open(tmp_path / "shop" / "orders.csv", 'r', newline='', encoding='utf-8') as f:
+        rows = list(csv.DictReader(f))
+    assert list(rows[0]) == ["id", "users_id", "placed"]
+    assert len(rows) == generator.row_counts["orders"]
+
+def test_sql_dump_loads_with_foreign_keys(tmp_path):
+    """Test that the SQL dump loads into SQLite and passes the foreign key check"""
+    generator = RelationalGenerator(SCHEMA, seed=3)
+    output = generator.write_sql(str(tmp_path / "shop"), batch_size=7)
+
+    connection = sqlite3.connect(":memory:")
+    connection.execute("PRAGMA foreign_keys = ON")
+    connection.executescript(output.read_text(encoding='utf-8'))
+    for table, count in generator.row_counts.items():
+        assert connection.execute(f'SELECT COUNT(*) FROM "{table}"').fetchone()[0] == count
+    assert connection.execute("PRAGMA foreign_key_check").fetchall() == []
+    assert sql_literal("O'Brien") == "'O''Brien'"
@@ -0,0 +1,82 @@
+import pytest
+import csv
+import gzip
+import hashlib
+import json
+from faker_data import FakerData
+from file_handler import PYARROW_AVAILABLE
+from rollover import RollingWriter, parse_size, read_manifest
+
+ATTRIBUTES = [{"name": "full_name", "type": "name"}, {"name": "mail", "type": "email"}]
+
+@pytest.fixture(scope="module")
+def records():
+    return FakerData(seed=6).compile_plan(ATTRIBUTES).generate(1050)
+
+def test_roll_over_by_rows(records, tmp_path):
+    """Test numbered CSV parts with their own headers and a manifest with counts and checksums"""
+    writer = RollingWriter("csv", str(tmp_path / "users.csv"), ATTRIBUTES, max_rows=500, chunk_size=128)
+    parts = writer.write(records)
+
+    assert [part.name for part in parts] == ["users-00001.csv", "users-00002.csv", "users-00003.csv"]
+    read_back = []
+    for part in parts:
+        with open(part, 'r', newline='', encoding='utf-8') as f:
+            read_back.extend(csv.DictReader(f))
+    assert read_back == [{name: str(value) for name, value in record.items()} for record in records]
+
+    manifest = read_manifest(str(tmp_path / "users.manifest.json"))
+    assert manifest["rows"] == 1050
+    assert [part["rows"] for part in manifest["parts"]] == [500, 500, 50]
+    for entry, part in zip(manifest["parts"], parts):
+        assert entry["path"] == part.name
+        assert entry["bytes"] == part.stat().st_size
+        assert entry["sha256"] == hashlib.sha256(part.read_bytes()).hexdigest()
+    assert sorted(path.name for path in tmp_path.iterdir()) == [part.name for part in parts] + ["users.manifest.json"]
+
+def test_roll_over_by_size(records, tmp_path):
+    """Test that size limits give parts of about max_bytes of uncompressed output"""
+    writer = RollingWriter("jsonl", str(tmp_path / "users.jsonl.gz"), ATTRIBUTES, max_bytes=8192)
+    parts = writer.write(records)
+
+    sizes = [len(gzip.decompress(part.read_bytes())) for part in parts]
+    assert len(parts) > 3 and all(part.name.endswith(".jsonl.gz") for part in parts)
+    assert all(6000 < size < 9000 for size in sizes[:-1])
+    lines = [json.loads(line) for part in parts for line in gzip.decompress(part.read_bytes()).splitlines()]
+    assert lines == records
+    manifest = json.loads(writer.manifest_path.read_text(encoding='utf-8'))
+    assert manifest["compression"] == "gzip"
+    assert manifest["parts"][0]["sha256"] == hashlib.sha256(parts[0].read_bytes()).hexdigest()
+
+def test_failed_part_is_not_left_behind(records, tmp_path):
+    """Test that a part interrupted mid-write never appears under its final name"""
+    def failing():
+        yield from records[:150]
+        raise RuntimeError("generator failed")
+
+    with pytest.raises(RuntimeError):
+        RollingWriter("json", str(tmp_path / "users"), ATTRIBUTES, max_rows=100, chunk_size=25).write(failing())
+    assert [path.name for path in tmp_path.iterdir()] == ["users-00001.json"]
+    assert len(json.loads((tmp_path / "users-00001.json").read_text(encoding='utf-8'))) == 100
+
+@pytest.mark.skipif(not PYARROW_AVAILABLE, reason="pyarrow is not installed")
+def test_arrow_parts_roll_over_by_rows(records, tmp_path):
+    """Test Parquet parts, which only roll over by row count"""
+    import pyarrow.parquet as pq
+    parts = RollingWriter("parquet", str(tmp_path / "users"), ATTRIBUTES, max_rows=400).write(records)
+    assert [pq.read_table(part).num_rows for part in parts] == [400, 400, 250]
+    with pytest.raises(ValueError):
+        RollingWriter("parquet", str(tmp_path / "users"), ATTRIBUTES, max_bytes=1000)
+
+def test_rollover_validation():
+    """Test the limits and sizes the writer accepts"""
+    with pytest.raises(ValueError):
+        RollingWriter("csv", "users", ATTRIBUTES)
+    with pytest.raises(ValueError):
+        RollingWriter("csv", "users", ATTRIBUTES, max_rows=0)
+    assert parse_size("64K") == 65536
+    assert parse_size("1.5M") == 3 << 19
+    assert parse_size("2gb") == 2 << 30
+    assert parse_size("1000") == 1000
+    with pytest.raises(ValueError):
+        parse_size("lots")
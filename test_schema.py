@@ -0,0 +1,50 @@
+import json
+import pytest
+from faker_data import FakerData
+from schema import Schema, Column
+
+SAVED = {
+    "locale": "de_DE",
+    "columns": [
+        {"name": "full_name", "type": "name"},
+        {"name": "email", "type": "template", "template": "{full_name:first|slug}@example.com"},
+        {"name": "age", "type": "random_int", "params": {"min": 18, "max": 90}, "null_ratio": 0.1},
+        {"name": "login", "type": "user_name", "unique": True},
+    ],
+}
+
+def test_schema_save_and_load(tmp_path):
+    """Test that a saved schema loads back with its options and dataset locale"""
+    schema = Schema.from_dict(SAVED).validate()
+    path = schema.save(str(tmp_path / "users.schema.json"))
+    loaded = Schema.load(str(path))
+
+    assert json.loads(path.read_text(encoding='utf-8')) == SAVED
+    assert loaded.to_dict() == SAVED
+    assert [column.type for column in loaded.columns] == ["name", "template", "random_int", "user_name"]
+    assert all(attr["locale"] == {"de_DE": 1.0} for attr in loaded.attributes)
+    records = FakerData(seed=1).compile_plan(loaded.attributes).generate(20)
+    assert all(record["email"].endswith("@example.com") for record in records)
+
+    # The command line forms are schemas too
+    assert Schema.from_dict({"who": "name", "n": {"type": "random_int", "null_ratio": 0.5}}).to_dict() == \
+        {"columns": [{"name": "who", "type": "name"}, {"name": "n", "type": "random_int", "null_ratio": 0.5}]}
+
+def test_schema_validation():
+    """Test that schema problems are reported before generation"""
+    def columns(*specs):
+        return Schema([Column(**spec) for spec in specs])
+
+    with pytest.raises(ValueError, match="unknown option"):
+        Schema.from_dict([{"name": "a", "type": "word", "nul_ratio": 0.1}])
+    with pytest.raises(ValueError, match="Duplicate"):
+        columns({"name": "a", "type": "word"}, {"name": "a", "type": "name"}).validate()
+    with pytest.raises(ValueError, match="Invalid data type"):
+        columns({"name": "a", "type": "wrd"}).validate()
+    with pytest.raises(ValueError, match="Unknown locale"):
+        Schema(columns({"name": "a", "type": "word"}).columns, locale="xx_XX").validate()
+    # Values Faker rejects are found by generating one record
+    with pytest.raises(ValueError, match="Column 'a'"):
+        columns({"name": "a", "type": "random_int", "params": {"min": 9, "max": 1}}).validate()
+    with pytest.raises(ValueError, match="needs a non-empty"):
+        columns({"name": "a", "type": "template"}).validate()